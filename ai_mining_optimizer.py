@@ -30,6 +30,8 @@ from sklearn.metrics import mean_squared_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
+from mining_engine import detect_resource_limits
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -747,7 +749,9 @@ class AdvancedAIMiningOptimizer:
     
     def _optimize_memory_allocation(self, algorithm: str) -> int:
         """Optimize memory allocation in MB"""
-        available_memory = self.hardware_profile.memory_total // (1024 * 1024)
+        # Budget is the container's memory.max when running under cgroup v2
+        limits = detect_resource_limits()
+        available_memory = min(self.hardware_profile.memory_total, limits.memory_bytes) // (1024 * 1024)
         
         if algorithm == "RandomX":
             # RandomX needs ~2GB + additional for threads
@@ -166,6 +166,10 @@ SUCCESS_MESSAGES = {
 VALIDATION_LIMITS = {
     'INTENSITY_MIN': 1,
     'INTENSITY_MAX': 100,
+    'CPU_PRIORITY_MIN': -1,
+    'CPU_PRIORITY_MAX': 5,
+    'METRICS_INTERVAL_MIN': 0.1,
+    'METRICS_INTERVAL_MAX': 60,
     'THREADS_MIN': 1,
     'THREADS_MAX': MAX_ENTERPRISE_THREADS,
     'WEB_PORT_MIN': 1024,
@@ -186,6 +190,10 @@ class CryptoMinerConfig:
         'INTENSITY': DEFAULT_INTENSITY,
         'WEB_PORT': DEFAULT_WEB_PORT,
         'THREADS': 'auto',
+        'WORKER_MODE': 'auto',
+        'CPU_PRIORITY': 'auto',
+        'PSI_GOVERNOR': False,
+        'METRICS_INTERVAL': 1.0,
         'WEB_ENABLED': True,
         'AI_ENABLED': True,
         'AI_LEARNING_RATE': 0.1,
@@ -220,6 +228,10 @@ class CryptoMinerConfig:
             'password': os.getenv('PASSWORD'),
             'intensity': self._get_int_env('INTENSITY', self.DEFAULT_VALUES['INTENSITY']),
             'threads': self._get_threads_env(),
+            'worker_mode': os.getenv('WORKER_MODE', self.DEFAULT_VALUES['WORKER_MODE']).lower(),
+            'cpu_priority': self._get_cpu_priority_env(),
+            'psi_governor': self._get_bool_env('PSI_GOVERNOR', self.DEFAULT_VALUES['PSI_GOVERNOR']),
+            'metrics_interval': self._get_float_env('METRICS_INTERVAL', self.DEFAULT_VALUES['METRICS_INTERVAL']),
             'web_port': self._get_int_env('WEB_PORT', self.DEFAULT_VALUES['WEB_PORT']),
             'web_enabled': self._get_bool_env('WEB_ENABLED', self.DEFAULT_VALUES['WEB_ENABLED']),
             'ai_enabled': self._get_bool_env('AI_ENABLED', self.DEFAULT_VALUES['AI_ENABLED']),
@@ -261,6 +273,16 @@ class CryptoMinerConfig:
                 return None
         return None
     
+    def _get_cpu_priority_env(self) -> Optional[int]:
+        """Get CPU priority, or None for 'auto' (normal scheduling, tunable by the AI optimizer)"""
+        priority = os.getenv('CPU_PRIORITY', self.DEFAULT_VALUES['CPU_PRIORITY'])
+        if priority and priority.lower() != 'auto':
+            try:
+                return int(priority)
+            except ValueError:
+                return None
+        return None
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
         return self.config.get(key, default)
@@ -318,6 +340,16 @@ class CryptoMinerConfig:
         if not (VALIDATION_LIMITS['INTENSITY_MIN'] <= intensity <= VALIDATION_LIMITS['INTENSITY_MAX']):
             errors['intensity'] = f"Intensity must be between {VALIDATION_LIMITS['INTENSITY_MIN']} and {VALIDATION_LIMITS['INTENSITY_MAX']}"
         
+        # Validate CPU priority
+        cpu_priority = self.config.get('cpu_priority')
+        if cpu_priority is not None and not (VALIDATION_LIMITS['CPU_PRIORITY_MIN'] <= cpu_priority <= VALIDATION_LIMITS['CPU_PRIORITY_MAX']):
+            errors['cpu_priority'] = f"CPU priority must be between {VALIDATION_LIMITS['CPU_PRIORITY_MIN']} and {VALIDATION_LIMITS['CPU_PRIORITY_MAX']}"
+        
+        # Validate system metrics sampling interval
+        metrics_interval = self.config.get('metrics_interval', 1.0)
+        if not (VALIDATION_LIMITS['METRICS_INTERVAL_MIN'] <= metrics_interval <= VALIDATION_LIMITS['METRICS_INTERVAL_MAX']):
+            errors['metrics_interval'] = f"Metrics interval must be between {VALIDATION_LIMITS['METRICS_INTERVAL_MIN']} and {VALIDATION_LIMITS['METRICS_INTERVAL_MAX']} seconds"
+        
         # Validate threads
         threads = self.config.get('threads')
         if threads and not (VALIDATION_LIMITS['THREADS_MIN'] <= threads <= VALIDATION_LIMITS['THREADS_MAX']):
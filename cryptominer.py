@@ -18,11 +18,12 @@ import threading
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 # Import consolidated modules
 from config import config, BANNER, APP_NAME, APP_VERSION, format_uptime, SUPPORTED_COINS
-from mining_engine import UnifiedMiningEngine
-from ai_mining_optimizer import AdvancedAIMiningOptimizer
+from mining_engine import KERNEL_REGISTRY, UnifiedMiningEngine
+from ai_mining_optimizer import AdvancedAIMiningOptimizer, MiningEnvironment
 
 # Configure logging
 config.setup_logging()
@@ -34,6 +35,7 @@ class CryptoMinerV21:
     def __init__(self):
         self.mining_engine = UnifiedMiningEngine()
         self.ai_optimizer = None
+        self.ai_cpu_priority = False  # Whether the AI optimizer may change CPU priority
         self.web_monitor = None
         self.is_running = False
         self.start_time = None
@@ -49,7 +51,9 @@ class CryptoMinerV21:
     
     async def start_mining(self, coin: str, wallet: str, pool: str, password: str = "x",
                           intensity: int = 80, threads: int = 0, web_enabled: bool = True,
-                          ai_enabled: bool = True):
+                          ai_enabled: bool = True, worker_mode: str = "auto",
+                          cpu_priority: Optional[int] = None,
+                          psi_governor: bool = False, metrics_interval: float = 1.0):
         """Start the mining operation with specified parameters"""
         
         try:
@@ -67,12 +71,17 @@ class CryptoMinerV21:
             print(f"  Pool: {pool}")
             print(f"  Intensity: {intensity}%")
             print(f"  Threads: {threads if threads and threads > 0 else 'auto-detect'}")
+            print(f"  Worker mode: {worker_mode}")
+            print(f"  CPU priority: {cpu_priority if cpu_priority is not None else 'auto'}")
+            print(f"  PSI governor: {'enabled' if psi_governor else 'disabled'}")
             print()
             
             # Initialize AI optimizer if enabled
             if ai_enabled:
                 logger.info("🤖 Initializing AI optimizer...")
                 self.ai_optimizer = AdvancedAIMiningOptimizer()
+                # An explicit priority (e.g. -1 to give way on shared hosts) is never overridden
+                self.ai_cpu_priority = cpu_priority is None
                 logger.info("✅ AI optimizer initialized")
             
             # Start mining with algorithm detection
@@ -84,6 +93,10 @@ class CryptoMinerV21:
             elif algorithm == 'Scrypt':
                 logger.info("🚀 Initializing Scrypt CPU mining for Litecoin-based coin")
             
+            # The first start on a host benchmarks every kernel for seconds; run it
+            # off the event loop so the engine's own selection hits the cache
+            await asyncio.get_running_loop().run_in_executor(None, KERNEL_REGISTRY.select, algorithm)
+            
             # Start the mining engine
             success = self.mining_engine.start_mining(
                 coin=coin,
@@ -91,7 +104,11 @@ class CryptoMinerV21:
                 pool=pool,
                 password=password,
                 intensity=intensity,
-                threads=threads
+                threads=threads,
+                worker_mode=worker_mode,
+                cpu_priority=cpu_priority if cpu_priority is not None else 0,
+                psi_governor=psi_governor,
+                metrics_interval=metrics_interval
             )
             
             if not success:
@@ -167,24 +184,32 @@ class CryptoMinerV21:
                 stats = self.mining_engine.get_stats()
                 
                 if stats.get('is_running') and stats.get('hashrate', 0) > 0:
-                    # Update AI with current mining data
-                    mining_data = {
-                        'hashrate': stats.get('hashrate', 0),
-                        'threads': stats.get('threads', 0),
-                        'cpu_usage': stats.get('cpu_usage', 0),
-                        'shares_good': stats.get('shares_good', 0),
-                        'uptime': time.time() - self.start_time if self.start_time else 0
-                    }
-                    
-                    # Get AI recommendations
+                    # Get AI recommendations for the current mining environment
                     try:
-                        recommendation = self.ai_optimizer.get_optimization_recommendation(mining_data)
+                        algorithm = stats.get('algorithm') or 'RandomX'
+                        coin = stats.get('coin') or ''
+                        environment = MiningEnvironment(
+                            algorithm=algorithm,
+                            coin=coin,
+                            pool_url=stats.get('pool_url', ''),
+                            difficulty=int(stats.get('difficulty') or 1),
+                            network_hashrate=0.0,
+                            block_time=0.0,
+                            temperature=stats.get('temperature', 0.0),
+                            power_consumption=0.0,
+                            ambient_temp=0.0,
+                            fan_speed=0
+                        )
+                        result = self.ai_optimizer.optimize_mining_parameters(algorithm, coin, environment)
                         
-                        if recommendation and recommendation.get('confidence', 0) > 0.7:
+                        if result and result.confidence_score > 0.7:
                             logger.info(
-                                f"🧠 AI Recommendation: {recommendation.get('action', 'optimize')} "
-                                f"(Confidence: {recommendation.get('confidence', 0)*100:.1f}%)"
+                                f"🧠 AI Recommendation: {result.optimal_threads} threads at "
+                                f"{result.optimal_intensity}% intensity, CPU priority {result.cpu_priority} "
+                                f"(Confidence: {result.confidence_score*100:.1f}%)"
                             )
+                            if self.ai_cpu_priority and result.cpu_priority != stats.get('cpu_priority'):
+                                self.mining_engine.set_cpu_priority(result.cpu_priority)
                     except Exception as e:
                         logger.debug(f"AI recommendation error: {e}")
                 
@@ -226,6 +251,9 @@ class CryptoMinerV21:
             # Prepare stats data with enhanced proxy statistics
             update_data = {
                 'hashrate': stats.get('hashrate', 0),
+                'hashrate_10s': stats.get('hashrate_10s', 0),
+                'hashrate_60s': stats.get('hashrate_60s', 0),
+                'hashrate_15m': stats.get('hashrate_15m', 0),
                 'algorithm': stats.get('algorithm', ''),
                 'coin': stats.get('coin', ''),
                 'threads': stats.get('threads', 0),
@@ -346,6 +374,12 @@ Examples:
     parser.add_argument('--password', type=str, default='x', help='Pool password/worker name')
     parser.add_argument('--intensity', type=int, default=80, help='Mining intensity 1-100 (default: 80)')
     parser.add_argument('--threads', type=parse_threads, default=0, help='Number of threads (0 or auto = auto-detect)')
+    parser.add_argument('--worker-mode', choices=['auto', 'thread', 'process'], default=None,
+                        help='Run RandomX workers as threads or as separate processes (default: auto = benchmark winner)')
+    parser.add_argument('--cpu-priority', type=int, choices=range(-1, 6), default=None, metavar='{-1..5}',
+                        help='Worker scheduling priority: -1 = idle CPU time only, 0 = normal, 1-5 = above normal (default: auto, tuned by the AI optimizer)')
+    parser.add_argument('--psi-governor', action='store_true',
+                        help='Yield CPU to other services when Linux CPU pressure (PSI) rises')
     parser.add_argument('--web-port', type=int, default=8001, help='Web monitoring port (default: 8001)')
     parser.add_argument('--no-web', action='store_true', help='Disable web monitoring')
     parser.add_argument('--no-ai', action='store_true', help='Disable AI optimization')
@@ -383,6 +417,10 @@ def main():
                 'password': config.get('password', 'x'),
                 'intensity': config.get('intensity', 80),
                 'threads': config.get('threads') or 0,  # Convert None to 0
+                'worker_mode': config.get('worker_mode', 'auto'),
+                'cpu_priority': config.get('cpu_priority'),
+                'psi_governor': config.get('psi_governor', False),
+                'metrics_interval': config.get('metrics_interval', 1.0),
                 'web_enabled': config.get('web_enabled', True) and not args.no_web,
                 'ai_enabled': config.get('ai_enabled', True) and not args.no_ai
             }
@@ -395,6 +433,10 @@ def main():
                 'password': args.password or config.get('password', 'x'),
                 'intensity': args.intensity or config.get('intensity', 80),
                 'threads': args.threads or config.get('threads') or 0,  # Convert None to 0
+                'worker_mode': args.worker_mode or config.get('worker_mode', 'auto'),
+                'cpu_priority': args.cpu_priority if args.cpu_priority is not None else config.get('cpu_priority'),
+                'psi_governor': args.psi_governor or config.get('psi_governor', False),
+                'metrics_interval': config.get('metrics_interval', 1.0),
                 'web_enabled': not args.no_web and config.get('web_enabled', True),
                 'ai_enabled': not args.no_ai and config.get('ai_enabled', True)
             }
@@ -427,7 +469,11 @@ def main():
             intensity=mining_config['intensity'],
             threads=mining_config['threads'],
             web_enabled=mining_config['web_enabled'],
-            ai_enabled=mining_config['ai_enabled']
+            ai_enabled=mining_config['ai_enabled'],
+            worker_mode=mining_config['worker_mode'],
+            cpu_priority=mining_config['cpu_priority'],
+            psi_governor=mining_config['psi_governor'],
+            metrics_interval=mining_config['metrics_interval']
         ))
         
     except KeyboardInterrupt:
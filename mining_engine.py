@@ -14,13 +14,28 @@ import psutil
 import logging
 import socket
 import asyncio
-import random
 import queue
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, Future
+import multiprocessing
+import platform
+import mmap
+import tempfile
+import uuid
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Any
+from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
 from queue import Queue, Empty
 
+try:
+    import numpy as np
+except ImportError:  # Counter reductions fall back to pure Python
+    np = None
+
+try:
+    import resource
+except ImportError:  # Not on Windows, which has no nice values either
+    resource = None
+
 # Configure logging with detailed protocol logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -52,6 +67,18 @@ class RandomXConfig:
     jit_compiler: bool = True
     hardware_aes: bool = True
     randomx_flags: int = 0
+    worker_mode: str = "thread"  # "thread" or "process" (one OS process per worker)
+    kernel: str = "python"  # Name in KERNEL_REGISTRY
+    seed_cache_size: int = 16777216  # Per-seed cache size in bytes (capped by memory_pool)
+    cpu_affinity: bool = True  # Pin workers using the cache-topology plan
+    nonce_range_size: int = 65536  # Nonces reserved by a worker per allocation
+    intensity: int = 80  # Per-worker CPU duty cycle, 1-100%
+    psi_governor: bool = False  # Yield to co-tenants under Linux CPU pressure
+    metrics_interval: float = 1.0  # Seconds between system metrics samples
+    thread_stats: str = "auto"  # "full", "summary", or "auto" (summary above THREAD_STATS_DETAIL_LIMIT)
+
+# Worker count above which "auto" reports a thread summary instead of one row per worker
+THREAD_STATS_DETAIL_LIMIT = 64
 
 @dataclass
 class ScryptConfig:
@@ -64,6 +91,10 @@ class ScryptConfig:
     intensity: int = 80
     worksize: int = 256
     lookup_gap: int = 2
+    cpu_priority: int = 0  # -1 to 5, higher = more priority
+    psi_governor: bool = False  # Yield to co-tenants under Linux CPU pressure
+    metrics_interval: float = 1.0  # Seconds between system metrics samples
+    kernel: str = "openssl-midstate"  # Name in KERNEL_REGISTRY
 
 @dataclass
 class MiningStats:
@@ -88,6 +119,51 @@ class MiningStats:
 # SINGLE CONNECTION PROXY MANAGER
 # ============================================================================
 
+class MiningJob:
+    """Immutable pool job tagged with a monotonically increasing generation
+
+    The proxy publishes each job by swapping a single reference, so workers can
+    compare generations once per batch without taking job_lock or copying.
+    work_generation is the generation at which this job's work (job_id and
+    blob) was first published; a republish of the same work, e.g. after a
+    difficulty change, keeps it so nonce ranges carry on instead of restarting.
+    """
+
+    __slots__ = ('generation', 'work_generation', 'job_id', 'received_at', '_fields')
+
+    def __init__(self, fields: Dict, generation: int, work_generation: Optional[int] = None):
+        object.__setattr__(self, '_fields', MappingProxyType(dict(fields)))
+        object.__setattr__(self, 'generation', generation)
+        object.__setattr__(self, 'work_generation', generation if work_generation is None else work_generation)
+        object.__setattr__(self, 'job_id', str(fields.get('job_id') or ''))
+        object.__setattr__(self, 'received_at', fields.get('received_at') or time.time())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MiningJob is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("MiningJob is immutable")
+
+    def __getitem__(self, key):
+        return self._fields[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._fields
+
+    def get(self, key, default=None):
+        return self._fields.get(key, default)
+
+    def same_work(self, fields) -> bool:
+        """Whether fields describe the same work (job_id and blob) as this job"""
+        return self.job_id == str(fields.get('job_id') or '') and self.get('blob') == fields.get('blob')
+
+    def to_dict(self) -> Dict:
+        """Mutable copy of the job fields, including the generations"""
+        fields = dict(self._fields)
+        fields['generation'] = self.generation
+        fields['work_generation'] = self.work_generation
+        return fields
+
 class PoolConnectionProxy:
     """Single connection proxy that all mining threads use to communicate with pool"""
     
@@ -107,6 +183,9 @@ class PoolConnectionProxy:
         self.last_activity = time.time()
         self.current_job = None
         self.job_lock = threading.Lock()
+        self.difficulty = None  # Latest mining.set_difficulty value, if any
+        self.job: Optional[MiningJob] = None  # Latest published job, read lock-free
+        self.job_generation = 0
         
         # Share submission queue and thread
         self.share_queue = queue.Queue()
@@ -128,6 +207,32 @@ class PoolConnectionProxy:
     def _reset_reconnect_state(self):
         self._reconnect_attempts = 0
         self._fatal_reconnect_error = False
+
+    def _publish_current_job(self):
+        """Publish current_job as the next MiningJob generation (job_lock held)"""
+        generation = self.job_generation + 1
+        previous = self.job
+        work_generation = previous.work_generation if previous and previous.same_work(self.current_job) \
+            else generation
+        self.job = MiningJob(self.current_job, generation, work_generation)
+        self.job_generation = generation
+    
+    def _apply_difficulty(self, job: Dict):
+        """Attach the Stratum difficulty to a job that carries no explicit target"""
+        if self.difficulty and not job.get('target'):
+            job['difficulty'] = self.difficulty
+    
+    def _set_difficulty(self, difficulty):
+        """Handle mining.set_difficulty, republishing the job only if its share threshold moved"""
+        with self.job_lock:
+            self.difficulty = difficulty
+            if not self.current_job:
+                return
+            job = self.current_job
+            threshold = target_to_threshold(job.get('target'), job.get('difficulty'))
+            self._apply_difficulty(job)
+            if target_to_threshold(job.get('target'), job.get('difficulty')) != threshold:
+                self._publish_current_job()
         
     def _parse_pool_url(self):
         """Parse pool URL to extract host and port"""
@@ -259,6 +364,9 @@ class PoolConnectionProxy:
                         # Store job if provided with enhanced ID extraction
                         with self.job_lock:
                             self.current_job = result.copy()
+                            if isinstance(result.get('job'), dict):
+                                # Flatten the nested login job so blob/target/seed_hash are top level
+                                self.current_job.update(result['job'])
                             
                             # Try to extract job ID from various possible field names and nested structures
                             job_id = None
@@ -283,6 +391,7 @@ class PoolConnectionProxy:
                                 self.current_job['job_id'] = f"login_{int(time.time())}"
                             
                             self.current_job['received_at'] = time.time()
+                            self._publish_current_job()
                             final_job_id = self.current_job.get('job_id', 'NO_JOB_ID')
                             protocol_logger.info(f"   ✅ Stored job from login with ID: {final_job_id}")
                         
@@ -592,17 +701,20 @@ class PoolConnectionProxy:
                                                     'height': params[3] if len(params) > 3 else 0
                                                 }
                                             
+                                            self._apply_difficulty(self.current_job)
                                             self.current_job['received_at'] = time.time()
+                                            self._publish_current_job()
                                             final_job_id = self.current_job.get('job_id', 'NO_ID')
                                             protocol_logger.info(f"✅ Updated job with ID: {final_job_id}")
-                                
-                                # Handle other methods like difficulty changes
-                                elif method == 'mining.set_difficulty':
-                                    difficulty = params[0] if isinstance(params, list) and len(params) > 0 else params
-                                    protocol_logger.info(f"🎯 DIFFICULTY UPDATE: {difficulty}")
-                                
-                                else:
-                                    protocol_logger.debug(f"🔍 Other method received: {method}")
+                                    
+                                    # Handle other methods like difficulty changes
+                                    elif method == 'mining.set_difficulty':
+                                        difficulty = params[0] if isinstance(params, list) and len(params) > 0 else params
+                                        protocol_logger.info(f"🎯 DIFFICULTY UPDATE: {difficulty}")
+                                        self._set_difficulty(difficulty)
+                                    
+                                    else:
+                                        protocol_logger.debug(f"🔍 Other method received: {method}")
                             
                             except json.JSONDecodeError as e:
                                 protocol_logger.debug(f"JSON decode error in job listener: {e}")
@@ -650,6 +762,14 @@ class PoolConnectionProxy:
         protocol_logger.debug("🔄 No valid job available - requesting fresh work")
         return None
     
+    def get_job(self) -> Optional[MiningJob]:
+        """Latest published job without locking or copying; None once expired"""
+        job = self.job
+        if job is None:
+            return None
+        max_age = 60 if job.job_id.startswith('local_') else 300
+        return job if time.time() - job.received_at < max_age else None
+    
     def get_stats(self) -> Dict:
         """Get connection and submission stats"""
         return {
@@ -1172,200 +1292,1852 @@ class StratumConnection:
         self.authorized = False
 
 # ============================================================================
-# RANDOMX MINING ENGINE
+# CPU TOPOLOGY AND AFFINITY
 # ============================================================================
 
-class RandomXMinerThread:
-    """Individual RandomX mining thread using shared connection proxy"""
-    
-    def __init__(self, thread_id: int, config: RandomXConfig, connection_proxy: PoolConnectionProxy):
-        self.thread_id = thread_id
-        self.config = config
-        self.connection_proxy = connection_proxy
+SYSFS_CPU_DIR = '/sys/devices/system/cpu'
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Parse a sysfs CPU list such as '0-3,8-11'"""
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+def _parse_cache_size(text: str) -> int:
+    """Parse a sysfs cache size such as '32768K'"""
+    text = text.strip().upper()
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text) if text else 0
+
+class AffinityPlanner:
+    """Plans worker-to-CPU pinning from the sysfs cache and core topology
+
+    Workers are spread across L3 slices and physical cores first, reaching SMT
+    siblings only after every core has a worker. Each L3 slice takes at most
+    l3_size // scratchpad_l3 workers, so every worker's scratchpad fits in cache;
+    workers beyond that go to the CPUs still free (flagged over_l3_capacity),
+    and once every allowed CPU has a worker the rest are left unpinned.
+    """
+
+    def __init__(self, scratchpad_l3: int = 2097152, sysfs_dir: str = SYSFS_CPU_DIR):
+        self.scratchpad_l3 = max(1, scratchpad_l3)
+        self.sysfs_dir = sysfs_dir
+
+    def _read(self, *parts) -> Optional[str]:
+        try:
+            with open(os.path.join(self.sysfs_dir, *parts)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _cpu_info(self, cpu: int) -> Dict[str, Any]:
+        """Physical core and L3 slice of one CPU"""
+        package = self._read(f'cpu{cpu}', 'topology', 'physical_package_id') or '0'
+        core = self._read(f'cpu{cpu}', 'topology', 'core_id') or str(cpu)
+        info = {'cpu': cpu, 'core': (int(package), int(core)), 'l3': None, 'l3_size': 0}
+
+        cache_dir = os.path.join(self.sysfs_dir, f'cpu{cpu}', 'cache')
+        try:
+            indexes = sorted(d for d in os.listdir(cache_dir) if d.startswith('index'))
+        except OSError:
+            indexes = []
+        for index in indexes:
+            if self._read(f'cpu{cpu}', 'cache', index, 'level') == '3':
+                shared = self._read(f'cpu{cpu}', 'cache', index, 'shared_cpu_list') or str(cpu)
+                info['l3'] = min(parse_cpu_list(shared))
+                info['l3_size'] = _parse_cache_size(self._read(f'cpu{cpu}', 'cache', index, 'size') or '0')
+        return info
+
+    def plan(self, workers: int) -> List[Dict[str, Any]]:
+        """Return one {'worker', 'cpu', 'core', 'l3'} entry per worker"""
+        try:
+            allowed = sorted(os.sched_getaffinity(0))
+        except AttributeError:
+            return []
+        if not allowed or workers <= 0:
+            return []
+
+        cpus = [self._cpu_info(cpu) for cpu in allowed]
+
+        # Slots per L3 slice: physical cores first, then SMT siblings
+        slices: Dict[Any, List[List[Dict]]] = {}
+        for info in cpus:
+            cores = slices.setdefault(info['l3'], [])
+            for siblings in cores:
+                if siblings[0]['core'] == info['core']:
+                    siblings.append(info)
+                    break
+            else:
+                cores.append([info])
+
+        within, beyond = [], []
+        for l3, cores in sorted(slices.items(), key=lambda item: (item[0] is None, item[0] or 0)):
+            l3_size = cores[0][0]['l3_size']
+            capacity = max(1, l3_size // self.scratchpad_l3) if l3_size else len(cpus)
+            slots = [core[depth] for depth in range(max(len(c) for c in cores))
+                     for core in cores if depth < len(core)]
+            within.append(slots[:capacity])
+            beyond.append(slots[capacity:])
+
+        # Round-robin across slices so load spreads over every L3 before doubling up;
+        # CPUs past a slice's cache capacity come only after every in-capacity slot
+        order = self._interleave(within)
+        spill = self._interleave(beyond)
+
+        plan = []
+        for worker in range(workers):
+            if worker < len(order) + len(spill):
+                info = order[worker] if worker < len(order) else spill[worker - len(order)]
+                cpu, core, l3 = info['cpu'], f"{info['core'][0]}:{info['core'][1]}", info['l3']
+            else:
+                cpu = core = l3 = None  # Every allowed CPU already runs a worker
+            plan.append({
+                'worker': worker,
+                'cpu': cpu,
+                'core': core,
+                'l3': l3,
+                'over_l3_capacity': worker >= len(order)
+            })
+        return plan
+
+    @staticmethod
+    def _interleave(slices: List[List[Dict]]) -> List[Dict]:
+        order = []
+        for depth in range(max((len(slots) for slots in slices), default=0)):
+            order.extend(slots[depth] for slots in slices if depth < len(slots))
+        return order
+
+def pin_current_thread(cpu: Optional[int]) -> bool:
+    """Pin the calling thread (Linux: the calling TID) to one CPU"""
+    if cpu is None or not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+        return True
+    except OSError as e:
+        logger.warning(f"⚠️ Could not pin thread to CPU {cpu}: {e}")
+        return False
+
+# ============================================================================
+# CPU SCHEDULING PRIORITY
+# ============================================================================
+
+# cpu_priority level -> (scheduling policy, nice value); higher = more priority.
+# 0 is normal scheduling. SCHED_IDLE workers only run on otherwise idle CPUs,
+# so -1 gives way to every other service while keeping an idle box busy.
+# Levels above 0 lower nice, which needs CAP_SYS_NICE or RLIMIT_NICE headroom.
+CPU_PRIORITY_LEVELS = {
+    -1: ('SCHED_IDLE', 19),
+    0: ('SCHED_OTHER', 0),
+    1: ('SCHED_OTHER', -2),
+    2: ('SCHED_OTHER', -5),
+    3: ('SCHED_OTHER', -10),
+    4: ('SCHED_OTHER', -15),
+    5: ('SCHED_OTHER', -20)
+}
+
+CAP_SYS_NICE = 23
+STARTUP_NICE = os.getpriority(os.PRIO_PROCESS, 0) if hasattr(os, 'getpriority') else 0
+
+def clamp_cpu_priority(level: int) -> int:
+    """Clamp a cpu_priority value to the supported -1..5 range"""
+    return max(-1, min(5, int(level)))
+
+def _has_cap_sys_nice() -> bool:
+    """Whether this process may lower nice values past RLIMIT_NICE"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('CapEff:'):
+                    return bool(int(line.split()[1], 16) >> CAP_SYS_NICE & 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    return hasattr(os, 'geteuid') and os.geteuid() == 0
+
+def lowest_settable_nice() -> int:
+    """Lowest nice value a thread of this process can lower itself back to"""
+    if resource is None or _has_cap_sys_nice():
+        return -20
+    soft = resource.getrlimit(resource.RLIMIT_NICE)[0]
+    if soft == resource.RLIM_INFINITY:
+        return -20
+    return 20 - min(soft, 40)
+
+def priority_nice(level: int) -> Optional[int]:
+    """Nice value to apply for a level, or None to leave nice alone
+
+    Raising nice is always allowed, but without CAP_SYS_NICE a thread cannot
+    go back below 20 - RLIMIT_NICE, so a worker sent to nice 19 could never be
+    raised again. Nice values are clamped to that floor; when even the startup
+    nice is below it, nice is left unchanged and only the policy is switched.
+    """
+    floor = lowest_settable_nice()
+    if floor > STARTUP_NICE:
+        return None
+    return max(CPU_PRIORITY_LEVELS[clamp_cpu_priority(level)][1], floor)
+
+def apply_thread_priority(level: int, tid: int = 0) -> Dict[str, Any]:
+    """Apply a cpu_priority level to one thread (0 = the calling thread)
+
+    On Linux the policy and nice value are per thread, so each worker is
+    adjusted through its native thread ID. Nice values stay within reach of
+    every other level (priority_nice). Returns what actually took effect.
+    """
+    level = clamp_cpu_priority(level)
+    policy_name = CPU_PRIORITY_LEVELS[level][0]
+    nice = priority_nice(level)
+    tid = tid or threading.get_native_id()
+    applied = {'level': level, 'policy': None, 'nice': None}
+
+    policy = getattr(os, policy_name, None)
+    if policy is not None and hasattr(os, 'sched_setscheduler'):
+        try:
+            os.sched_setscheduler(tid, policy, os.sched_param(0))
+            applied['policy'] = policy_name
+        except OSError as e:
+            logger.warning(f"⚠️ Could not set {policy_name} on thread {tid}: {e}")
+
+    if hasattr(os, 'setpriority'):
+        try:
+            if nice is not None:
+                os.setpriority(os.PRIO_PROCESS, tid, nice)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not set nice {nice} on thread {tid}: {e}")
+        try:
+            applied['nice'] = os.getpriority(os.PRIO_PROCESS, tid)
+        except OSError:
+            pass
+    return applied
+
+# ============================================================================
+# WORKER DUTY CYCLE
+# ============================================================================
+
+class DutyCycleController:
+    """Turns an intensity percentage into a measured busy/idle duty cycle
+
+    One controller per worker thread. Busy time is the thread's own CPU time
+    (time.thread_time) divided by cpu_share, the fraction of a CPU the worker
+    gets when every worker runs flat out (worker_cpu_share). Time a worker
+    spends waiting on its siblings - for the GIL, or for an oversubscribed
+    CPU - is therefore not mistaken for idle, and the miner as a whole holds
+    intensity percent of its CPU budget. After each batch the worker idles just
+    long enough for busy / elapsed over the recent window to match the target,
+    which also absorbs sleep overshoot. Older history is halved before a new
+    batch is added, so each batch's excess is idled off in full. `measured` is
+    the raw CPU use over its own window, independent of that bookkeeping. An
+    optional scale callable (e.g. a PressureGovernor) multiplies the target on
+    every batch.
+    """
+
+    WINDOW = 2.0  # Seconds of history the feedback loop corrects against
+    MEASURE_INTERVAL = 2.0  # Seconds between updates of `measured`
+    MAX_SLEEP_SLICE = 0.1  # Sleep granularity, so stop requests stay responsive
+    MIN_SLEEP = 1e-4  # Shorter idles are rounding leftovers, not worth a sleep
+
+    def __init__(self, intensity: int = 100, scale: Optional[Callable[[], float]] = None,
+                 cpu_share: float = 1.0):
+        self.intensity = max(1, min(100, int(intensity)))
+        self.scale = scale
+        self.cpu_share = cpu_share
+        self.measured = 0.0  # Observed CPU use in percent of the worker's CPU share
+        self.reset()
+
+    def reset(self):
+        """Restart the feedback window; call from the worker thread being measured"""
+        self.busy = 0.0
+        self.elapsed = 0.0
+        self.last_cpu = time.thread_time()
+        self.last_wall = time.monotonic()
+        self.measure_cpu, self.measure_wall = self.last_cpu, self.last_wall
+        self.restart = False
+
+    def set_intensity(self, intensity: int):
+        """Change the target duty cycle (1-100%); safe to call from any thread"""
+        self.intensity = max(1, min(100, int(intensity)))
+        self.restart = True
+
+    def target(self) -> float:
+        """Effective duty cycle target in percent, after any external scaling"""
+        if self.scale is None:
+            return float(self.intensity)
+        return max(1.0, min(100.0, self.intensity * self.scale()))
+
+    def _sample(self, decay: bool = False):
+        """Accumulate CPU and wall time since the previous sample
+
+        With decay, history older than WINDOW is halved first, so the new
+        interval always counts in full.
+        """
+        now_cpu = time.thread_time()
+        now_wall = time.monotonic()
+        if decay and self.elapsed > self.WINDOW:
+            # Exponential forgetting keeps the loop reactive to load changes
+            self.busy *= 0.5
+            self.elapsed *= 0.5
+        self.busy += (now_cpu - self.last_cpu) / self.cpu_share
+        self.elapsed += now_wall - self.last_wall
+        self.last_cpu, self.last_wall = now_cpu, now_wall
+
+    def _measure(self):
+        """Update `measured` from raw CPU and wall time once per MEASURE_INTERVAL"""
+        wall = self.last_wall - self.measure_wall
+        if wall >= self.MEASURE_INTERVAL:
+            self.measured = 100.0 * (self.last_cpu - self.measure_cpu) / self.cpu_share / wall
+            self.measure_cpu, self.measure_wall = self.last_cpu, self.last_wall
+
+    def throttle(self, running: Optional[Callable[[], bool]] = None) -> float:
+        """Idle after a batch to hold the target duty cycle; returns seconds slept"""
+        if self.restart:
+            self.reset()
+            return 0.0
+
+        self._sample(decay=True)
+
+        # Re-evaluate the target every slice so scale changes apply mid-sleep
+        slept = 0.0
+        while running is None or running():
+            target = self.target()
+            idle = self.busy * 100.0 / target - self.elapsed - slept if target < 100 else 0.0
+            if idle < self.MIN_SLEEP:
+                break
+            time.sleep(min(self.MAX_SLEEP_SLICE, idle))
+            slept = time.monotonic() - self.last_wall
+        if slept:
+            self._sample()
+
+        self._measure()
+        return slept
+
+def worker_cpu_share(workers: int, cpu_count: float) -> float:
+    """Fraction of one CPU each of `workers` busy workers gets from `cpu_count` CPUs"""
+    return max(0.01, min(1.0, cpu_count / max(1, workers)))
+
+# ============================================================================
+# CPU PRESSURE GOVERNOR
+# ============================================================================
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+PROC_PRESSURE_CPU = '/proc/pressure/cpu'
+
+def cgroup_v2_dir(cgroup_root: str = CGROUP_ROOT) -> Optional[str]:
+    """Directory of this process's cgroup v2 node, or None without a unified hierarchy"""
+    try:
+        with open('/proc/self/cgroup') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        if line.startswith('0::'):
+            relative = line[3:].lstrip('/')
+            # Pure v2 mounts the hierarchy at the root; hybrid setups under unified/
+            for base in (cgroup_root, os.path.join(cgroup_root, 'unified')):
+                path = os.path.join(base, relative)
+                if os.path.exists(os.path.join(base, 'cgroup.controllers')) and os.path.isdir(path):
+                    return path
+    return None
+
+def read_pressure_total(path: str) -> Optional[int]:
+    """Cumulative 'some' stall time in microseconds from a PSI file"""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith('some '):
+                    return int(line.rsplit('total=', 1)[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def read_run_delay(pids: Iterable[int], proc_dir: str = '/proc') -> int:
+    """Summed run-queue wait in microseconds of every thread of the given processes
+
+    Field 2 of /proc/<pid>/task/<tid>/schedstat is the nanoseconds a thread
+    spent runnable but waiting for a CPU. Threads that exit drop out of the sum.
+    """
+    total = 0
+    for pid in pids:
+        task_dir = os.path.join(proc_dir, str(pid), 'task')
+        try:
+            tids = os.listdir(task_dir)
+        except OSError:
+            continue
+        for tid in tids:
+            try:
+                with open(os.path.join(task_dir, tid, 'schedstat')) as f:
+                    total += int(f.read().split()[1])
+            except (OSError, ValueError, IndexError):
+                continue
+    return total // 1000
+
+class PressureGovernor:
+    """Backs mining off when Linux PSI reports CPU pressure from co-tenants
+
+    Samples /proc/pressure/cpu and the parent cgroup's cpu.pressure every
+    INTERVAL. The miner's own run-queue wait (read_run_delay over own_pids) is
+    subtracted from each stall delta, so workers waiting on each other are not
+    mistaken for a co-tenant; the miner's own cgroup is never a source, as its
+    pressure is only the miner competing with itself. The worst remaining stall
+    fraction becomes a scale factor for the duty cycle: halved on every
+    pressured sample, ramped back up additively once clear, so mining yields
+    within a few hundred milliseconds and recovers in seconds.
+    """
+
+    INTERVAL = 0.1  # Seconds between PSI samples
+    THRESHOLD = 0.10  # Stall fraction ('some' time / wall time) treated as pressure
+    MIN_SCALE = 0.05
+    RAMP_STEP = 0.05  # Scale regained per clear sample
+
+    def __init__(self, shared_scale=None, sources: Optional[Dict[str, str]] = None, proc_dir: str = '/proc'):
+        if sources is None:
+            sources = {'system': PROC_PRESSURE_CPU}
+            cgroup_dir = cgroup_v2_dir()
+            parent = os.path.dirname(cgroup_dir.rstrip('/')) if cgroup_dir else None
+            # The parent covers the miner's co-tenants; at the hierarchy root there is none
+            if parent and os.path.exists(os.path.join(parent, 'cgroup.controllers')):
+                sources['cgroup'] = os.path.join(parent, 'cpu.pressure')
+        self.sources = {name: path for name, path in sources.items() if read_pressure_total(path) is not None}
+        self.proc_dir = proc_dir
+        self.own_pids: Callable[[], Iterable[int]] = lambda: (os.getpid(),)  # Processes whose waits are ours
+
+        self.shared_scale = shared_scale  # multiprocessing.Value mirrored for worker processes
+        self.scale = 1.0
+        self.pressure = 0.0
+        self.throttled_time = 0.0
+        self.throttle_events = 0
         self.is_running = False
-        self.stats = MiningStats()
         self.thread = None
-        self.offline_mode = False
-        
-        # Mining state
-        self.current_job = None
-        self.nonce = thread_id * 1000000  # Starting nonce based on thread ID
-        self.hashes_done = 0
-        self.start_time = time.time()
-        
-    def start(self):
-        """Start mining thread"""
+
+    @property
+    def available(self) -> bool:
+        return bool(self.sources)
+
+    def start(self) -> bool:
+        """Start sampling; returns False when PSI is not available on this host"""
+        if not self.available:
+            logger.warning("⚠️ CPU pressure (PSI) not available, co-tenant yielding disabled")
+            return False
         if self.is_running:
-            return
-            
+            return True
         self.is_running = True
-        self.thread = threading.Thread(target=self._mining_loop, daemon=True)
+        self.thread = threading.Thread(target=self._run, daemon=True, name="psi-governor")
         self.thread.start()
-        protocol_logger.info(f"🚀 RandomX mining thread {self.thread_id} started with proxy connection")
-    
+        logger.info(f"🧭 PSI governor sampling {', '.join(self.sources)} CPU pressure")
+        return True
+
     def stop(self):
-        """Stop mining thread"""
         self.is_running = False
         if self.thread:
-            self.thread.join(timeout=5)
-        protocol_logger.info(f"🛑 RandomX mining thread {self.thread_id} stopped")
-    
-    def _mining_loop(self):
-        """Main mining loop using connection proxy for share submission"""
-        logger.info(f"⚡ Mining loop started for thread {self.thread_id}")
-        
-        # Mining timing control
-        hashes_per_batch = 1000
-        batch_delay = 0.01  # Small delay between batches to control CPU usage
-        
+            self.thread.join(timeout=1)
+            self.thread = None
+        self._set_scale(1.0)
+
+    def _set_scale(self, scale: float):
+        self.scale = scale
+        if self.shared_scale is not None:
+            self.shared_scale.value = scale
+
+    def _prime(self):
+        """Take the baseline readings the first sample is measured against"""
+        self._last = {name: read_pressure_total(path) for name, path in self.sources.items()}
+        self._last_own = read_run_delay(self.own_pids(), self.proc_dir)
+
+    def _run(self):
+        self._prime()
+        last_time = time.monotonic()
+
         while self.is_running:
-            try:
-                # Get work from connection proxy
-                if not self.current_job or time.time() - self.current_job.get('received_at', 0) > 10:
-                    if self.connection_proxy:
-                        fresh_work = self.connection_proxy.get_current_job()
-                        if fresh_work:
-                            self.current_job = fresh_work
-                            protocol_logger.debug(f"Thread {self.thread_id} got fresh work: {fresh_work.get('job_id', 'N/A')}")
-                    
-                    if not self.current_job:
-                        # Create local work template if no work available
-                        self.current_job = self._create_local_work()
-                        protocol_logger.debug(f"Thread {self.thread_id} using local work")
-                
-                if not self.current_job:
-                    time.sleep(1)
-                    continue
-                
-                # Perform CPU-intensive mining calculations
-                for batch in range(hashes_per_batch):
-                    if not self.is_running:
-                        break
-                    
-                    # Create mining input with current nonce
-                    hash_input = self._create_hash_input()
-                    
-                    # Perform intensive hash calculation (this creates real CPU load)
-                    hash_result = self._calculate_intensive_hash(hash_input)
-                    
-                    # Check if hash meets difficulty (simulate finding shares)
-                    if self._check_target(hash_result):
-                        protocol_logger.info(f"🎯 Share found by thread {self.thread_id}!")
-                        
-                        # Submit share through connection proxy
-                        if self.connection_proxy and not self.offline_mode:
-                            success = self._submit_share_via_proxy(hash_result)
-                            if success:
-                                protocol_logger.info(f"✅ Share accepted from thread {self.thread_id}")
-                                self.stats.shares_good += 1
-                            else:
-                                protocol_logger.warning(f"⚠️ Share submission failed from thread {self.thread_id}")
-                                self.stats.shares_rejected += 1
-                        else:
-                            protocol_logger.info(f"📊 Share found (offline mode)")
-                            self.stats.shares_good += 1  # Count as good share in offline mode
-                    
-                    self.nonce += 1
-                    self.hashes_done += 1
-                    self.stats.hashes_total += 1
-                
-                # Small delay to control CPU usage
-                time.sleep(batch_delay)
-                
-                # Update hashrate more frequently during startup, then less frequently
-                elapsed_time = time.time() - self.start_time
-                update_frequency = 1000 if elapsed_time < 30 else 10000  # More frequent for first 30 seconds
-                if self.hashes_done % update_frequency == 0:
-                    self._update_hashrate()
-                
-            except Exception as e:
-                logger.error(f"Mining error in thread {self.thread_id}: {e}")
-                time.sleep(1)
-    
-    def _create_local_work(self) -> Dict:
-        """Create local work template when pool doesn't provide one"""
+            time.sleep(self.INTERVAL)
+            now = time.monotonic()
+            self._sample(now - last_time)
+            last_time = now
+
+    def _sample(self, elapsed: float):
+        """Read every source once and adjust the scale for `elapsed` seconds of history"""
+        own = read_run_delay(self.own_pids(), self.proc_dir)
+        own_stall, self._last_own = max(0, own - self._last_own), own
+
+        pressure = 0.0
+        for name, path in self.sources.items():
+            total = read_pressure_total(path)
+            last = self._last.get(name)
+            if total is not None and last is not None and elapsed > 0:
+                # Summed per-thread waits can exceed the 'some' time they overlap in; clamp at zero
+                stall = max(0, total - last - own_stall)
+                pressure = max(pressure, stall / (elapsed * 1e6))
+            self._last[name] = total
+        self.pressure = min(1.0, pressure)
+
+        if self.scale < 1.0:
+            self.throttled_time += elapsed
+
+        if self.pressure > self.THRESHOLD:
+            if self.scale >= 1.0:
+                self.throttle_events += 1
+            self._set_scale(max(self.MIN_SCALE, self.scale * 0.5))
+        elif self.scale < 1.0:
+            self._set_scale(min(1.0, self.scale + self.RAMP_STEP))
+
+    def get_stats(self) -> Dict[str, Any]:
         return {
-            'job_id': f"local_job_{int(time.time())}",
-            'difficulty': 65536,  # Standard XMR difficulty
-            'blob': '0' * 152,  # Placeholder blob
-            'target': f"{(2**256 // 65536):064x}",
-            'local_work': True
+            'enabled': self.is_running,
+            'sources': list(self.sources),
+            'pressure': self.pressure,
+            'scale': self.scale,
+            'throttled_time': self.throttled_time,
+            'throttle_events': self.throttle_events
         }
-    
-    def _create_hash_input(self) -> bytes:
-        """Create input for hash calculation"""
-        if not self.current_job:
-            return b'\x00' * 76
-        
-        # Create block template with nonce
-        blob = self.current_job.get('blob', '0' * 152)
+
+# ============================================================================
+# CONTAINER RESOURCE LIMITS
+# ============================================================================
+
+@dataclass
+class ResourceLimits:
+    """Effective CPU and memory budget of this process, container-aware"""
+    cpu_count: float  # May be fractional under a cpu.max quota
+    cpu_source: str
+    memory_bytes: int
+    memory_source: str
+
+    @property
+    def worker_cpus(self) -> int:
+        """Whole CPUs available to workers (a fractional quota rounds down)"""
+        return max(1, int(self.cpu_count))
+
+def _read_cgroup_file(directory: str, name: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, name)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def detect_resource_limits(cgroup_dir: Optional[str] = None) -> ResourceLimits:
+    """Derive the CPU count from cpu.max and the cpuset, and memory from memory.max
+
+    Limits are taken as the tightest along the cgroup v2 path up to the root of
+    the hierarchy, falling back to the CPU affinity mask and host RAM.
+    """
+    try:
+        cpus, cpu_source = float(len(os.sched_getaffinity(0))), 'affinity'
+    except AttributeError:
+        cpus, cpu_source = float(psutil.cpu_count() or 1), 'host'
+    memory, memory_source = psutil.virtual_memory().total, 'host'
+
+    directory = cgroup_dir or cgroup_v2_dir()
+    levels = []
+    while directory and os.path.exists(os.path.join(directory, 'cgroup.controllers')):
+        levels.append(directory)
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+
+    if levels:
+        cpuset = _read_cgroup_file(levels[0], 'cpuset.cpus.effective')
+        if cpuset and len(parse_cpu_list(cpuset)) < cpus:
+            cpus, cpu_source = float(len(parse_cpu_list(cpuset))), 'cgroup cpuset.cpus.effective'
+
+    for level in levels:
+        cpu_max = (_read_cgroup_file(level, 'cpu.max') or 'max').split()
+        if cpu_max[0] != 'max' and len(cpu_max) == 2 and int(cpu_max[1]) > 0:
+            quota = int(cpu_max[0]) / int(cpu_max[1])
+            if quota < cpus:
+                cpus, cpu_source = quota, 'cgroup cpu.max'
+
+        memory_max = _read_cgroup_file(level, 'memory.max') or 'max'
+        if memory_max != 'max' and int(memory_max) < memory:
+            memory, memory_source = int(memory_max), 'cgroup memory.max'
+
+    return ResourceLimits(cpus, cpu_source, memory, memory_source)
+
+# ============================================================================
+# SYSTEM METRICS SAMPLER
+# ============================================================================
+
+# Sensor chips whose readings are the CPU package / die temperature
+CPU_TEMPERATURE_SENSORS = ('coretemp', 'k10temp', 'zenpower', 'cpu_thermal', 'acpitz')
+
+class SystemMetricsSampler:
+    """Background thread that keeps a snapshot of host metrics
+
+    CPU utilisation is measured between consecutive samples with the
+    non-blocking psutil.cpu_percent(interval=None), so readers never wait on a
+    measurement interval. Each sample builds a new dict and replaces
+    `snapshot` in one assignment; readers get a consistent view without a lock.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = max(0.1, interval)
+        self.snapshot: Dict[str, Any] = {
+            'cpu_usage': 0.0, 'memory_usage': 0.0, 'memory_total': 0, 'memory_available': 0,
+            'load_average': (0.0, 0.0, 0.0), 'cpu_frequency': 0.0, 'temperature': 0.0,
+            'sampled_at': 0.0
+        }
+        self._stop = threading.Event()
+        self.thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.thread is not None
+
+    def start(self):
+        if self.thread:
+            return
+        self._stop.clear()
+        self._sample()  # Primes cpu_percent and fills memory/load before the first read
+        self.thread = threading.Thread(target=self._run, daemon=True, name="metrics-sampler")
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:
+                logger.debug(f"System metrics sample failed: {e}")
+
+    def _sample(self):
+        memory = psutil.virtual_memory()
         try:
-            # Convert hex blob to bytes and insert nonce
-            blob_bytes = bytearray.fromhex(blob)
-            # Insert nonce at position 39 (standard for Monero)
-            nonce_bytes = struct.pack('<I', self.nonce)
-            blob_bytes[39:43] = nonce_bytes
-            return bytes(blob_bytes)
-        except:
-            # Fallback - create simple input
-            return struct.pack('<I', self.nonce) + b'\x00' * 72
-    
-    def _calculate_intensive_hash(self, input_data: bytes) -> bytes:
-        """Calculate hash with real CPU-intensive work"""
-        # This performs actual CPU-intensive calculations to simulate real mining
-        hash_result = input_data[:]
-        
-        # Multiple rounds of intensive hashing (simulates RandomX VM execution)
-        for round in range(50):  # Multiple computation rounds
-            # Blake2b hashing (CPU intensive)
-            hash_result = hashlib.blake2b(hash_result, digest_size=32).digest()
-            
-            # SHA3 hashing (more CPU intensive)
-            hash_result = hashlib.sha3_256(hash_result + input_data).digest()
-            
-            # Memory-hard operations (simulates RandomX dataset access)
-            for i in range(20):
-                idx = hash_result[i % 32] % 256
-                # Simulate memory access patterns
-                memory_value = hashlib.blake2b(hash_result[idx:idx+1], digest_size=1).digest()[0]
-                hash_result = hash_result[:i] + bytes([memory_value ^ hash_result[i]]) + hash_result[i+1:]
-        
-        return hash_result
-    
-    def _check_target(self, hash_result: bytes) -> bool:
-        """Check if hash meets difficulty target (find shares more frequently)"""
+            load_average = os.getloadavg()
+        except OSError:
+            load_average = (0.0, 0.0, 0.0)
         try:
-            # Convert hash to integer (little endian)
-            hash_int = int.from_bytes(hash_result[:8], byteorder='little')
-            
-            # Find shares more frequently for testing (every 50000th hash)
-            # In real mining, this would be based on actual difficulty
-            return hash_int % 50000 == 0
-            
-        except Exception as e:
-            logger.error(f"Target check error: {e}")
-            return False
-    
-    def _submit_share_via_proxy(self, hash_result: bytes) -> bool:
-        """Submit share through connection proxy with real job prioritization"""
+            frequency = psutil.cpu_freq()
+        except Exception:
+            frequency = None
+        self.snapshot = {
+            'cpu_usage': psutil.cpu_percent(interval=None),
+            'memory_usage': memory.percent,
+            'memory_total': memory.total,
+            'memory_available': memory.available,
+            'load_average': load_average,
+            'cpu_frequency': frequency.current if frequency else 0.0,
+            'temperature': self._cpu_temperature(),
+            'sampled_at': time.time()
+        }
+
+    @staticmethod
+    def _cpu_temperature() -> float:
+        """Hottest CPU sensor reading in Celsius, 0.0 when none is exposed"""
         try:
-            # Get real pool job - prioritize over local fallback
-            job_id = None
-            is_real_job = False
-            
-            # First try to get job from current thread job
-            if self.current_job and self.current_job.get('job_id'):
-                job_id = self.current_job['job_id']
-                is_real_job = not job_id.startswith('local_')
-            
-            # If no real job, try to get fresh job from proxy
-            if not is_real_job and self.connection_proxy:
-                fresh_job = self.connection_proxy.get_current_job()
-                if fresh_job and fresh_job.get('job_id'):
-                    fresh_job_id = fresh_job['job_id']
-                    if not fresh_job_id.startswith('local_'):
-                        job_id = fresh_job_id
-                        is_real_job = True
+            sensors = psutil.sensors_temperatures()
+        except (AttributeError, OSError):
+            return 0.0
+        for chip in CPU_TEMPERATURE_SENSORS:
+            readings = [entry.current for entry in sensors.get(chip, ()) if entry.current]
+            if readings:
+                return max(readings)
+        return 0.0
+
+# ============================================================================
+# SHARED MEMORY REGIONS
+# ============================================================================
+
+HUGETLBFS_MOUNT = '/dev/hugepages'
+SHM_DIR = '/dev/shm'
+THP_SHMEM_SETTING = '/sys/kernel/mm/transparent_hugepage/shmem_enabled'
+
+def _meminfo_value(field: str) -> Optional[int]:
+    """First number of a /proc/meminfo field (kB or page count), or None"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def huge_page_size() -> int:
+    """Huge page size in bytes (2 MB if the kernel does not say otherwise)"""
+    size_kb = _meminfo_value('Hugepagesize')
+    return size_kb * 1024 if size_kb else 2 * 1024 * 1024
+
+def free_hugetlb_pages() -> int:
+    """Persistent huge pages neither in use nor reserved by another mapping"""
+    return max(0, (_meminfo_value('HugePages_Free') or 0) - (_meminfo_value('HugePages_Rsvd') or 0))
+
+def _smaps_huge_page_bytes(path: str) -> int:
+    """Bytes of this process's mappings of path that huge pages actually back"""
+    fields = ('ShmemPmdMapped:', 'FilePmdMapped:', 'Shared_Hugetlb:', 'Private_Hugetlb:')
+    total = 0
+    try:
+        with open('/proc/self/smaps') as f:
+            mapped = False
+            for line in f:
+                key = line.split(None, 1)[0]
+                if not key.endswith(':'):
+                    mapped = line.rstrip().endswith(path)  # Mapping header line
+                elif mapped and key in fields:
+                    total += int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return 0
+    return total
+
+def _thp_shmem_unavailable_reason() -> Optional[str]:
+    """Why transparent huge pages cannot back shared memory here, or None"""
+    if not hasattr(mmap, 'MADV_HUGEPAGE'):
+        return "madvise(MADV_HUGEPAGE) not supported on this platform"
+    try:
+        with open(THP_SHMEM_SETTING) as f:
+            setting = f.read()
+    except OSError:
+        return f"{THP_SHMEM_SETTING} not readable"
+    selected = setting[setting.find('[') + 1:setting.find(']')] if '[' in setting else setting.strip()
+    if selected in ('never', 'deny'):
+        return f"transparent huge pages for shared memory are '{selected}'"
+    return None
+
+def process_alive(pid: int) -> bool:
+    """Whether a process with this PID exists (in this PID namespace)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, but belongs to another user
+    return True
+
+class SharedRegion:
+    """Named shared memory region backed by an mmap'd file, huge-page backed when possible
+
+    With huge_pages=True the region is placed on hugetlbfs when it is mounted and
+    has free pages, otherwise in /dev/shm with madvise(MADV_HUGEPAGE) so the
+    kernel can back it with transparent huge pages. Regions smaller than one huge
+    page, and hosts without either mechanism, fall back to normal pages and log
+    the reason. Other processes attach with the region's name (its file path),
+    read-only if they only consume it. Creating with an explicit name gives a
+    well-known path in normal pages, with the given file mode, and fails with
+    FileExistsError rather than replacing a region someone else may own.
+    Unnamed regions are called cryptominer-<creator pid>-<uuid>, so ones left
+    behind by a killed process can be found and removed with remove_stale.
+    """
+
+    PREFIX = 'cryptominer'
+
+    def __init__(self, name: Optional[str] = None, size: int = 0, create: bool = False,
+                 huge_pages: bool = False, mode: int = 0o600, readonly: bool = False):
+        self.owner = create
+        self.huge_page_backing: Optional[str] = None
+
+        if create and name:
+            mapped_size = max(size, 1)
+            self.name, self._mmap = name, self._map_new_file(name, mapped_size, mode)
+        elif create:
+            self.name, self._mmap, mapped_size = self._create(size, huge_pages)
+        else:
+            self.name = name
+            fd = os.open(name, os.O_RDONLY if readonly else os.O_RDWR)
+            try:
+                mapped_size = os.fstat(fd).st_size
+                prot = mmap.PROT_READ if readonly else mmap.PROT_READ | mmap.PROT_WRITE
+                self._mmap = mmap.mmap(fd, mapped_size, mmap.MAP_SHARED, prot)
+            finally:
+                os.close(fd)
+
+        if create and huge_pages and self.huge_page_backing is None:
+            self._advise_huge_pages(mapped_size)
+
+        self.size = size if create else mapped_size
+        self.buf = memoryview(self._mmap)
+
+    def _create(self, size: int, huge_pages: bool) -> Tuple[str, mmap.mmap, int]:
+        page = huge_page_size()
+        if huge_pages and size >= page and os.path.isdir(HUGETLBFS_MOUNT):
+            rounded = -(-size // page) * page
+            free = free_hugetlb_pages() * page
+            if free < rounded:
+                logger.info(f"ℹ️ hugetlbfs has {free} of {rounded} bytes free, trying transparent huge pages")
+            else:
+                path = self._new_path(HUGETLBFS_MOUNT)
+                try:
+                    region = self._map_new_file(path, rounded)
+                    self.huge_page_backing = 'hugetlbfs'
+                    return path, region, rounded
+                except OSError as e:
+                    logger.info(f"ℹ️ hugetlbfs allocation of {rounded} bytes failed ({e}), trying transparent huge pages")
+        elif huge_pages and size < page:
+            logger.debug(f"Region of {size} bytes is smaller than a huge page, using normal pages")
+
+        directory = SHM_DIR if os.path.isdir(SHM_DIR) else tempfile.gettempdir()
+        path = self._new_path(directory)
+        return path, self._map_new_file(path, max(size, 1)), max(size, 1)
+
+    @classmethod
+    def _new_path(cls, directory: str) -> str:
+        return os.path.join(directory, f"{cls.PREFIX}-{os.getpid()}-{uuid.uuid4().hex}")
+
+    @classmethod
+    def remove_stale(cls, directories: Optional[Iterable[str]] = None) -> List[str]:
+        """Remove unnamed regions whose creating process has exited
+
+        A SIGKILL or OOM kill skips unlink, leaving the file (and its memory)
+        behind. Returns the removed paths; regions of live processes and files
+        not named like a region are left alone.
+        """
+        if directories is None:
+            directories = (SHM_DIR, HUGETLBFS_MOUNT, tempfile.gettempdir())
+        removed = []
+        for directory in directories:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                parts = name.split('-')
+                if len(parts) != 3 or parts[0] != cls.PREFIX or not parts[1].isdigit() or len(parts[2]) != 32:
+                    continue
+                if process_alive(int(parts[1])):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                removed.append(path)
+        return removed
+
+    @staticmethod
+    def _map_new_file(path: str, size: int, mode: int = 0o600) -> mmap.mmap:
+        """Create, size and map a new file, removing it again if any step fails"""
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_RDWR, mode)
+        try:
+            os.fchmod(fd, mode)  # Exact mode regardless of umask
+            os.ftruncate(fd, size)
+            return mmap.mmap(fd, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        except OSError:
+            os.unlink(path)
+            raise
+        finally:
+            os.close(fd)
+
+    def _advise_huge_pages(self, size: int):
+        if size < huge_page_size():
+            return
+        reason = _thp_shmem_unavailable_reason()
+        if reason is None:
+            try:
+                self._mmap.madvise(mmap.MADV_HUGEPAGE)
+                self.huge_page_backing = 'thp'
+                return
+            except OSError as e:
+                reason = f"madvise(MADV_HUGEPAGE) failed: {e}"
+        logger.info(f"ℹ️ Huge pages unavailable for {size} byte region, using normal pages: {reason}")
+
+    @property
+    def huge_page_bytes(self) -> int:
+        """Bytes of this region huge pages back in this process (per /proc/self/smaps)"""
+        return _smaps_huge_page_bytes(self.name) if self.huge_page_backing else 0
+
+    def close(self):
+        """Unmap this process's view (raises BufferError while slices are still held)"""
+        self.buf.release()
+        self._mmap.close()
+
+    def unlink(self):
+        """Remove the region's name; memory is freed once every mapping is closed"""
+        try:
+            os.unlink(self.name)
+        except FileNotFoundError:
+            pass
+
+class WorkerCounters:
+    """Per-worker hash and share counters in one preallocated array
+
+    Row i holds worker i's [hashes, shares_good, shares_rejected, running,
+    hashrate_10s, hashrate_60s, hashrate_15m, job_switch_latency] (the last four
+    stored as float64). Each worker updates only its own row, once per batch, so
+    no lock is needed; totals are one column reduction (numpy when installed),
+    keeping stats cost flat as the worker count grows. With
+    shared=True the array lives in a SharedRegion that worker processes attach
+    to by name.
+    """
+
+    HASHES, SHARES_GOOD, SHARES_REJECTED, RUNNING = range(4)
+    HASHRATE_10S, HASHRATE_60S, HASHRATE_15M, JOB_SWITCH_LATENCY = range(4, 8)
+    HASHRATE = HASHRATE_10S  # First float column
+    FIELDS = 8
+    ITEM_SIZE = 8
+
+    def __init__(self, workers: int, name: Optional[str] = None, shared: bool = False):
+        self.workers = max(1, workers)
+        size = self.workers * self.FIELDS * self.ITEM_SIZE
+        self.region: Optional[SharedRegion] = None
+        if name:
+            self.region = SharedRegion(name)
+        elif shared:
+            self.region = SharedRegion(size=size, create=True)
+        buf = self.region.buf[:size] if self.region else memoryview(bytearray(size))
+        self.name = self.region.name if self.region else None
+
+        self._buf = buf
+        self._ints = buf.cast('q')
+        self._floats = buf.cast('d')
+        self._array = None
+        if np is not None:
+            self._array = np.frombuffer(buf, dtype=np.int64).reshape(self.workers, self.FIELDS)
+
+    def add(self, worker: int, hashes: int, shares_good: int = 0, shares_rejected: int = 0):
+        """Add one batch of work to a worker's row"""
+        base = worker * self.FIELDS
+        ints = self._ints
+        ints[base + self.HASHES] += hashes
+        if shares_good:
+            ints[base + self.SHARES_GOOD] += shares_good
+        if shares_rejected:
+            ints[base + self.SHARES_REJECTED] += shares_rejected
+
+    def set_hashrate(self, worker: int, hashrate_10s: float, hashrate_60s: float, hashrate_15m: float):
+        base = worker * self.FIELDS
+        floats = self._floats
+        floats[base + self.HASHRATE_10S] = hashrate_10s
+        floats[base + self.HASHRATE_60S] = hashrate_60s
+        floats[base + self.HASHRATE_15M] = hashrate_15m
+
+    def set_status(self, worker: int, running: bool, job_switch_latency: float = 0.0):
+        """Publish whether a worker is hashing and its last job switch latency"""
+        base = worker * self.FIELDS
+        self._ints[base + self.RUNNING] = 1 if running else 0
+        self._floats[base + self.JOB_SWITCH_LATENCY] = job_switch_latency
+
+    @staticmethod
+    def _as_dict(hashes, good, rejected, rate_10s, rate_60s, rate_15m) -> Dict[str, Any]:
+        return {
+            'hashes_total': hashes, 'shares_good': good, 'shares_rejected': rejected,
+            'hashrate': rate_10s, 'hashrate_10s': rate_10s,
+            'hashrate_60s': rate_60s, 'hashrate_15m': rate_15m
+        }
+
+    def row(self, worker: int) -> Dict[str, Any]:
+        """One worker's counters"""
+        base = worker * self.FIELDS
+        ints, floats = self._ints, self._floats
+        return self._as_dict(ints[base + self.HASHES], ints[base + self.SHARES_GOOD],
+                             ints[base + self.SHARES_REJECTED], floats[base + self.HASHRATE_10S],
+                             floats[base + self.HASHRATE_60S], floats[base + self.HASHRATE_15M])
+
+    def status(self, worker: int) -> Dict[str, Any]:
+        """One worker's running flag and last job switch latency"""
+        base = worker * self.FIELDS
+        return {
+            'running': bool(self._ints[base + self.RUNNING]),
+            'job_switch_latency': self._floats[base + self.JOB_SWITCH_LATENCY]
+        }
+
+    def totals(self) -> Dict[str, Any]:
+        """Sum of every worker's counters in a single reduction"""
+        if self._array is not None:
+            counts = (int(v) for v in self._array[:, :self.RUNNING].sum(axis=0))
+            rates = self._array[:, self.HASHRATE:self.JOB_SWITCH_LATENCY].view(np.float64).sum(axis=0)
+            return self._as_dict(*counts, *(float(v) for v in rates))
+        step = self.FIELDS
+        counts = (sum(self._ints[column::step]) for column in range(self.RUNNING))
+        rates = (sum(self._floats[column::step]) for column in range(self.HASHRATE, self.JOB_SWITCH_LATENCY))
+        return self._as_dict(*counts, *rates)
+
+    def activity(self) -> Dict[str, Any]:
+        """Running worker count and job switch latency across all workers"""
+        if self._array is not None:
+            running = int(self._array[:, self.RUNNING].sum())
+            latencies = self._array[:, self.JOB_SWITCH_LATENCY].view(np.float64)
+            avg, high = float(latencies.mean()), float(latencies.max())
+        else:
+            running = sum(self._ints[self.RUNNING::self.FIELDS])
+            latencies = self._floats[self.JOB_SWITCH_LATENCY::self.FIELDS]
+            avg, high = sum(latencies) / self.workers, max(latencies)
+        return {'workers_running': running, 'job_switch_latency': {'avg': avg, 'max': high}}
+
+    def summary(self, slowest: int = 5, bins: int = 10) -> Dict[str, Any]:
+        """Distribution of the workers' 10s hashrates without per-worker rows
+
+        Returns min / median / p95 / max, a `bins`-bucket histogram and the
+        indices of the `slowest` workers, computed in a few vector operations
+        when numpy is installed.
+        """
+        if self._array is not None:
+            rates = self._array[:, self.HASHRATE_10S].view(np.float64)
+            median, p95 = (float(v) for v in np.percentile(rates, [50, 95]))
+            counts, edges = np.histogram(rates, bins=bins)
+            count = min(slowest, self.workers)
+            ids = np.argpartition(rates, count - 1)[:count] if count else np.array([], dtype=int)
+            ids = ids[np.argsort(rates[ids], kind='stable')]
+            low, high = float(rates.min()), float(rates.max())
+            counts, edges, ids = counts.tolist(), edges.tolist(), ids.tolist()
+        else:
+            rates = list(self._floats[self.HASHRATE_10S::self.FIELDS])
+            ordered = sorted(rates)
+            low, high = ordered[0], ordered[-1]
+
+            def percentile(q: float) -> float:
+                # Linear interpolation between closest ranks, as numpy.percentile does
+                position = q * (len(ordered) - 1)
+                below = int(position)
+                above = min(below + 1, len(ordered) - 1)
+                return ordered[below] + (ordered[above] - ordered[below]) * (position - below)
+
+            median, p95 = percentile(0.5), percentile(0.95)
+            start, stop = (low, high) if high > low else (low - 0.5, high + 0.5)
+            width = (stop - start) / bins
+            edges = [start + width * i for i in range(bins + 1)]
+            counts = [0] * bins
+            for rate in rates:
+                counts[min(bins - 1, int((rate - start) / width))] += 1
+            ids = sorted(range(self.workers), key=rates.__getitem__)[:slowest]
+        return {
+            'workers': self.workers,
+            'min': low, 'median': median, 'p95': p95, 'max': high,
+            'histogram': {'counts': counts, 'edges': edges},
+            'slowest': ids
+        }
+
+    def close(self):
+        """Release the array views and, for the creating process, the shared region"""
+        self._array = None
+        for view in (self._ints, self._floats, self._buf):
+            view.release()
+        if self.region:
+            if self.region.owner:
+                self.region.unlink()
+            self.region.close()
+
+# ============================================================================
+# ROLLING HASHRATE WINDOWS
+# ============================================================================
+
+class HashrateWindows:
+    """Rolling 10s / 60s / 15m hashrate from a fixed-size ring of samples
+
+    One (timestamp, cumulative hashes) sample is kept per RESOLUTION-second
+    slot, so the ring covers the longest window with a fixed number of slots.
+    A window's rate is the difference between the newest sample and the one
+    window-length slots back, so each lookup is O(1). Until a window has filled,
+    it spans back to the first sample instead.
+    """
+
+    RESOLUTION = 1.0
+    WINDOWS = (10, 60, 900)
+
+    def __init__(self, now: Optional[float] = None):
+        self.slots = int(max(self.WINDOWS) / self.RESOLUTION) + 1
+        self._times = [0.0] * self.slots
+        self._totals = [0] * self.slots
+        self.reset(now)
+
+    def reset(self, now: Optional[float] = None):
+        """Start again from zero hashes at `now`"""
+        now = time.monotonic() if now is None else now
+        self._first = self._last = int(now / self.RESOLUTION)
+        index = self._last % self.slots
+        self._times[index] = now
+        self._totals[index] = 0
+        self.total = 0
+
+    def record(self, total: int, now: Optional[float] = None):
+        """Record the cumulative hash count at `now`"""
+        now = time.monotonic() if now is None else now
+        slot = int(now / self.RESOLUTION)
+        if slot > self._last:
+            # Slots skipped while no batch finished carry the previous total
+            previous = self._last % self.slots
+            for skipped in range(max(self._last + 1, slot - self.slots + 1), slot):
+                index = skipped % self.slots
+                self._times[index] = skipped * self.RESOLUTION
+                self._totals[index] = self._totals[previous]
+            self._first = max(self._first, slot - self.slots + 1)
+            self._last = slot
+        index = slot % self.slots
+        self._times[index] = now
+        self._totals[index] = total
+        self.total = total
+
+    def rate(self, window: float) -> float:
+        """Hashes per second over the last `window` seconds"""
+        newest = self._last % self.slots
+        start = max(self._first, self._last - int(window / self.RESOLUTION))
+        oldest = start % self.slots
+        elapsed = self._times[newest] - self._times[oldest]
+        if elapsed <= 0:
+            return 0.0
+        return (self._totals[newest] - self._totals[oldest]) / elapsed
+
+    def rates(self) -> Tuple[float, float, float]:
+        """(10s, 60s, 15m) hashrates"""
+        return tuple(self.rate(window) for window in self.WINDOWS)
+
+# ============================================================================
+# RANDOMX MINING ENGINE
+# ============================================================================
+
+# "Memory access" lookup table for the RandomX-style kernel. Entry b is the
+# one-byte blake2b digest of bytes([b]); reads past the 32-byte state used to
+# hash an empty slice, which is what _MEMORY_EMPTY holds.
+_MEMORY_LUT = bytes(hashlib.blake2b(bytes([b]), digest_size=1).digest()[0] for b in range(256))
+_MEMORY_EMPTY = hashlib.blake2b(b'', digest_size=1).digest()[0]
+
+# (input hex, output hex) pairs produced by the original allocation-heavy kernel
+RANDOMX_GOLDEN_VECTORS = [
+    ('00' * 76,
+     '657140e96d8248cc59c47f7dca48020c95dc9ca47576aae6e0741c02a71e13e3'),
+    ('00' * 39 + '01000000' + '00' * 33,
+     'cf428bebc587e4da15be63641c7de2d758914e82459ac6e002b11002fdf5bc97'),
+    (bytes(range(76)).hex(),
+     '8685cf5a89e053eab545e159b319966c5da4a019b8ac217fee0eae2e3e4d0332'),
+    ('8de2ce9dcfe23391f2551cfd479b24dc531dff05bac932622c0b78d5eaf572a9'
+     '2284e81866dfb5401320c3a3944fb2601fc710a5ab0f7f4a1cdaf90261f5e35d'
+     '0e4a1b71a8e1df8f87a964dc',
+     'a95052e3154bfcab7ad0b9af5ffb5a48b9e992ffbb5f6cb0f54a21bffc82d842'),
+]
+
+_DATASET_LINE = 64
+_U32 = struct.Struct('<I')
+
+# Empty blake2b-256 hasher; per-round hashers are .copy()s of it, which skips
+# building the parameter block that the blake2b(..., digest_size=32) constructor does
+_BLAKE2B_256 = hashlib.blake2b(digest_size=32)
+
+def _randomx_rounds(work: bytearray, first_digest: bytes, dataset: Optional[memoryview]):
+    """Run the 50 rounds in place over work = state (32 bytes) + input
+
+    first_digest is round one's blake2b of the input, so callers can resume it
+    from a cached prefix state. Later rounds hash the state from the same empty
+    hasher. The per-round sha3 absorbs state + input straight from the buffer,
+    and the inner mixing steps patch the state in place.
+    """
+    new_blake2b = _BLAKE2B_256.copy
+    sha3_256 = hashlib.sha3_256
+    lut = _MEMORY_LUT
+    empty = _MEMORY_EMPTY
+    from_bytes = int.from_bytes
+    lines = len(dataset) // _DATASET_LINE if dataset is not None else 0
+    state = memoryview(work)[:32]
+
+    state[:] = first_digest
+    for round_ in range(50):
+        if round_:
+            hasher = new_blake2b()
+            hasher.update(state)
+            state[:] = hasher.digest()
+        state[:] = sha3_256(work).digest()
+
+        # Memory-hard mixing (simulates RandomX dataset access)
+        for i in range(20):
+            idx = work[i]
+            work[i] ^= lut[work[idx]] if idx < 32 else empty
+
+        if lines:
+            offset = (_U32.unpack_from(work, 0)[0] % lines) * _DATASET_LINE
+            mixed = from_bytes(state, 'little') ^ from_bytes(dataset[offset:offset + 32], 'little')
+            state[:] = mixed.to_bytes(32, 'little')
+
+    state.release()
+
+def randomx_intensive_hash(input_data: bytes, dataset: Optional[memoryview] = None) -> bytes:
+    """RandomX-style CPU-intensive hash: 50 rounds of blake2b/sha3 plus memory mixing
+
+    When a seed dataset is given, every round also folds in one 64-byte-aligned
+    dataset line addressed by the state.
+    """
+    work = bytearray(32 + len(input_data))
+    work[32:] = input_data
+    hasher = _BLAKE2B_256.copy()
+    hasher.update(input_data)
+    _randomx_rounds(work, hasher.digest(), dataset)
+    return bytes(work[:32])
+
+MAX_TARGET64 = 0xFFFFFFFFFFFFFFFF
+HASH_SIZE = 32  # Bytes per hash in kernel output buffers
+DEFAULT_SHARE_DIFFICULTY = 65536  # Standard XMR difficulty
+
+def target_to_threshold(target: Optional[str] = None, difficulty: Optional[float] = None) -> int:
+    """Convert a job target or Stratum difficulty into a 64-bit share threshold
+
+    A hash meets the target when its high-order 8 bytes (bytes 24..31 read as a
+    little-endian integer) are below the threshold. Accepts XMR-style compact
+    targets (4 or 8 little-endian bytes) and full 256-bit big-endian hex.
+    """
+    if target:
+        try:
+            raw = bytes.fromhex(target)
+        except (TypeError, ValueError):
+            raw = b''
+
+        if len(raw) == 4:
+            target32 = int.from_bytes(raw, 'little')
+            if target32:
+                return MAX_TARGET64 // (0xFFFFFFFF // target32)
+        elif len(raw) == 8:
+            return int.from_bytes(raw, 'little')
+        elif len(raw) == 32:
+            return int.from_bytes(raw, 'big') >> 192
+
+    try:
+        difficulty = float(difficulty) if difficulty else 0.0
+    except (TypeError, ValueError):
+        difficulty = 0.0
+    if difficulty <= 0:
+        difficulty = DEFAULT_SHARE_DIFFICULTY
+    return int(MAX_TARGET64 // difficulty)
+
+def find_shares(hashes, threshold: int) -> List[int]:
+    """Indices of the hashes in a batch buffer that meet a 64-bit share threshold
+
+    With numpy the buffer is viewed as little-endian uint64 words, four per
+    hash, and every hash's high-order word is compared with the threshold in
+    one vector operation; only the winning indices come back to Python.
+    """
+    if threshold > MAX_TARGET64:
+        return list(range(len(hashes) // HASH_SIZE))  # Difficulty below 1 - every hash qualifies
+    if np is not None:
+        words = np.frombuffer(hashes, dtype='<u8').reshape(-1, HASH_SIZE // 8)
+        return np.flatnonzero(words[:, -1] < np.uint64(threshold)).tolist()
+    unpack_from = PreparedJob.HASH_HIGH_WORD.unpack_from
+    return [i for i in range(len(hashes) // HASH_SIZE)
+            if unpack_from(hashes, i * HASH_SIZE + 24)[0] < threshold]
+
+class PreparedJob:
+    """Mining job decoded once on arrival, with a reusable hash input buffer
+
+    Each worker builds its own PreparedJob when it picks up a job and patches
+    the nonce into the buffer in place for every hash.
+    """
+
+    NONCE_OFFSET = 39  # Standard Monero blob nonce position
+    NONCE = struct.Struct('<I')
+    HASH_HIGH_WORD = struct.Struct('<Q')
+    FALLBACK_BLOB = bytes(76)
+
+    def __init__(self, job: Optional[Dict]):
+        self.job = job
+        self.job_id = job.get('job_id') if job else None
+
+        blob = self._decode_blob(job.get('blob', '0' * 152)) if job else None
+        if blob is not None and len(blob) >= self.NONCE_OFFSET + self.NONCE.size:
+            self.blob = blob
+            self.nonce_offset = self.NONCE_OFFSET
+        else:
+            # Missing or malformed blob - hash the nonce over a zero template
+            self.blob = self.FALLBACK_BLOB
+            self.nonce_offset = 0
+
+        self.buffer = bytearray(self.blob)
+        self.threshold = target_to_threshold(job.get('target'), job.get('difficulty')) if job else \
+            target_to_threshold()
+
+    @classmethod
+    def from_input(cls, data: bytes) -> 'PreparedJob':
+        """Job whose blob is a raw hash input (used by kernel self-tests)"""
+        return cls({'blob': data.hex()})
+
+    @staticmethod
+    def _decode_blob(blob_hex) -> Optional[bytes]:
+        try:
+            return bytes.fromhex(blob_hex)
+        except (TypeError, ValueError):
+            return None
+
+    def patch_nonce(self, nonce: int) -> bytearray:
+        """Write nonce into the reusable buffer and return it"""
+        self.NONCE.pack_into(self.buffer, self.nonce_offset, nonce & 0xFFFFFFFF)
+        return self.buffer
+
+    def meets_target(self, hash_result: bytes) -> bool:
+        """Single integer comparison of the hash's high-order word against the threshold"""
+        return self.HASH_HIGH_WORD.unpack_from(hash_result, 24)[0] < self.threshold
+
+def randomx_hash_batch(job: PreparedJob, nonce_start: int, count: int,
+                       dataset: Optional[memoryview] = None) -> bytearray:
+    """RandomX-style hashes of `count` consecutive nonces of one job
+
+    The bytes before the nonce are absorbed into a blake2b state once per
+    batch; each nonce resumes a copy of it and only feeds the rest of the blob.
+    One work buffer is reused for every nonce, with the nonce patched in place.
+    """
+    offset = job.nonce_offset
+    work = bytearray(32 + len(job.blob))
+    work[32:] = job.blob
+    tail = memoryview(work)[32 + offset:]
+    prefix = _BLAKE2B_256.copy()
+    prefix.update(job.blob[:offset])
+    pack_nonce = PreparedJob.NONCE.pack_into
+
+    out = bytearray(HASH_SIZE * count)
+    for i in range(count):
+        pack_nonce(work, 32 + offset, (nonce_start + i) & 0xFFFFFFFF)
+        hasher = prefix.copy()
+        hasher.update(tail)
+        _randomx_rounds(work, hasher.digest(), dataset)
+        out[i * HASH_SIZE:(i + 1) * HASH_SIZE] = work[:32]
+    tail.release()
+    return out
+
+class NonceAllocator:
+    """Hands out disjoint nonce ranges per job
+
+    Jobs are identified by their MiningJob.work_generation, which survives a
+    republish of the same job_id and blob, so a difficulty change does not
+    restart the nonce space. One allocator is shared by every worker (backed by
+    a multiprocessing Array when given a context, so worker processes share it
+    too). Counters are kept for the two newest jobs, so workers still hashing
+    the previous job while a new seed cache builds never overlap. allocate()
+    returns None once a job's 32-bit nonce space is exhausted.
+    """
+
+    NONCE_SPACE = 1 << 32
+
+    def __init__(self, range_size: int = 65536, mp_context=None):
+        self.range_size = max(1, min(int(range_size), self.NONCE_SPACE))
+        # [generation A, next nonce A, generation B, next nonce B, exhaustions]
+        initial = [-1, 0, -1, 0, 0]
+        if mp_context is not None:
+            self._state = mp_context.Array('q', initial)
+            self._lock = self._state.get_lock()
+        else:
+            self._state = initial
+            self._lock = threading.Lock()
+
+    def allocate(self, generation: int) -> Optional[Tuple[int, int]]:
+        """Reserve the next [start, end) range for a job generation"""
+        with self._lock:
+            state = self._state
+            if state[0] == generation:
+                slot = 0
+            elif state[2] == generation:
+                slot = 2
+            elif generation > min(state[0], state[2]) or generation == 0:
+                # New generation (or local work) replaces the older counter
+                slot = 0 if state[0] < state[2] else 2
+                state[slot], state[slot + 1] = generation, 0
+            else:
+                return None  # Older than both tracked generations
+
+            start = state[slot + 1]
+            if start >= self.NONCE_SPACE:
+                state[4] += 1
+                return None
+            end = min(start + self.range_size, self.NONCE_SPACE)
+            state[slot + 1] = end
+            return start, end
+
+    def reset(self, generation: int):
+        """Restart a generation's nonce space (local work only)"""
+        with self._lock:
+            for slot in (0, 2):
+                if self._state[slot] == generation:
+                    self._state[slot + 1] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = list(self._state)
+        return {
+            'range_size': self.range_size,
+            'generations': {gen: nxt for gen, nxt in ((state[0], state[1]), (state[2], state[3])) if gen >= 0},
+            'exhaustions': state[4]
+        }
+
+class SeedCache:
+    """Seed-dependent RandomX cache held in one shared memory segment
+
+    The owner builds the contents once; every worker thread or process maps the
+    same segment and only ever reads it through a read-only view.
+    """
+
+    def __init__(self, seed_hash: str, size: int, name: Optional[str] = None, create: bool = False,
+                 huge_pages: bool = False):
+        self.seed_hash = seed_hash
+        self.owner = create
+        if create:
+            self.shm = SharedRegion(size=size, create=True, huge_pages=huge_pages)
+            started = time.time()
+            try:
+                self.shm.buf[:size] = hashlib.shake_256(b'randomx-cache' + seed_hash.encode()).digest(size)
+            except Exception:
+                # Do not leave a half-filled segment behind
+                self.shm.unlink()
+                self.shm.close()
+                raise
+            self.build_time = time.time() - started
+        else:
+            self.shm = SharedRegion(name=name, readonly=True)
+            self.build_time = 0.0
+        self.name = self.shm.name
+        self.size = size
+        self.view = self.shm.buf[:size].toreadonly()
+
+    def close(self):
+        """Drop this mapping (and, for the owner, the segment name)"""
+        if self.owner:
+            self.shm.unlink()
+        try:
+            self.view.release()
+            self.shm.close()
+        except BufferError:
+            # Workers still hold slices of the view; the mapping goes away with them
+            pass
+
+class SeedCacheManager:
+    """Keeps one SeedCache per seed hash, rebuilding only when the seed changes
+
+    The owning manager (miner process) builds caches: the first one inline, and
+    every later one on a background thread into a second buffer, so workers keep
+    hashing jobs for the current seed until the new cache is swapped in. A seed
+    whose build fails is recorded and not rebuilt, so its jobs hash uncached
+    instead of waiting. Non-owning managers (worker processes) attach to caches
+    by segment name.
+    """
+
+    def __init__(self, size: int, owner: bool = True, huge_pages: bool = False):
+        self.size = size
+        self.owner = owner
+        self.huge_pages = huge_pages
+        self.lock = threading.Lock()
+        self.active: Optional[SeedCache] = None
+        self.previous: Optional[SeedCache] = None
+        self.pending_seed: Optional[str] = None
+        self.builder: Optional[threading.Thread] = None
+        self.closed = False
+        self.builds = 0
+        self.failed_seed: Optional[str] = None  # Last seed whose build failed
+        self.last_error: Optional[str] = None
+
+    def ready(self, seed_hash: str) -> Optional[SeedCache]:
+        """Return the cache for seed_hash if it is already built, without blocking"""
+        for cache in (self.active, self.previous):
+            if cache and cache.seed_hash == seed_hash:
+                return cache
+        return None
+
+    def unavailable(self, seed_hash: str, name: Optional[str] = None) -> bool:
+        """Whether no cache is coming for seed_hash, so its jobs should hash uncached
+
+        Owners know their own failed builds; a worker process is handed a job
+        without a segment name only when the owner has no cache for it.
+        """
+        if not seed_hash:
+            return True
+        if not self.owner:
+            return name is None
+        return seed_hash == self.failed_seed
+
+    def get(self, seed_hash: str, name: Optional[str] = None) -> Optional[SeedCache]:
+        """Return the cache for seed_hash, or None while it is still being built
+
+        Owners start a background build on an unseen seed (building inline only
+        when there is no cache yet); non-owners attach by segment name.
+        """
+        if not seed_hash:
+            return None
+
+        cache = self.ready(seed_hash)
+        if cache:
+            return cache
+
+        if not self.owner:
+            return self._attach(seed_hash, name) if name else None
+
+        with self.lock:
+            if self.closed:
+                return None
+            cache = self.ready(seed_hash)
+            if cache or seed_hash == self.failed_seed:
+                return cache
+            if self.active is None and self.builder is None:
+                self._build(seed_hash)
+            elif self.pending_seed != seed_hash:
+                self._start_background_build(seed_hash)
+        return self.ready(seed_hash)
+
+    def _attach(self, seed_hash: str, name: str) -> Optional[SeedCache]:
+        with self.lock:
+            try:
+                cache = SeedCache(seed_hash, self.size, name=name)
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Could not attach seed cache for {seed_hash[:16]}: {e}")
+                return None
+            self._swap(cache)
+            return cache
+
+    def _start_background_build(self, seed_hash: str):
+        """Build the next seed's cache in a second buffer (caller holds the lock)"""
+        if self.builder and self.builder.is_alive():
+            # One build at a time; the newest seed wins once the current build lands
+            self.pending_seed = seed_hash
+            return
+
+        self.pending_seed = seed_hash
+        self.builder = threading.Thread(target=self._background_builder, daemon=True)
+        self.builder.start()
+        logger.info(f"🧠 Building seed cache for {seed_hash[:16]}... in background")
+
+    def _background_builder(self):
+        while True:
+            with self.lock:
+                seed_hash = self.pending_seed
+                if seed_hash is None or self.closed:
+                    self.builder = None
+                    return
+            cache = error = None
+            try:
+                cache = SeedCache(seed_hash, self.size, create=True, huge_pages=self.huge_pages)
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Seed cache build for {seed_hash[:16]} failed, hashing uncached: {e}")
+                error = e
+
+            with self.lock:
+                if self.closed:
+                    # The manager was closed mid-build; nobody will release a swapped-in cache
+                    if cache:
+                        cache.close()
+                    self.builder = None
+                    return
+                if error:
+                    self._record_failure(seed_hash, error)
+                else:
+                    self.builds += 1
+                    self._swap(cache)
+                    logger.info(f"🧠 Seed cache for {seed_hash[:16]}... ready in {cache.build_time:.2f}s, swapped in")
+                if self.pending_seed == seed_hash:
+                    self.pending_seed = None
+                    self.builder = None
+                    return
+
+    def _build(self, seed_hash: str):
+        """Build a cache inline (caller holds the lock)"""
+        try:
+            cache = SeedCache(seed_hash, self.size, create=True, huge_pages=self.huge_pages)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Seed cache for {seed_hash[:16]} unavailable, hashing uncached: {e}")
+            self._record_failure(seed_hash, e)
+            return
+        self.builds += 1
+        self._swap(cache)
+        logger.info(f"🧠 Built {self.size // (1024 * 1024)} MB seed cache for {seed_hash[:16]}... "
+                    f"in {cache.build_time:.2f}s")
+
+    def _record_failure(self, seed_hash: str, error: Exception):
+        """Remember a failed build so the seed is not retried on every poll (caller holds the lock)"""
+        self.failed_seed = seed_hash
+        self.last_error = str(error)
+
+    def _swap(self, cache: SeedCache):
+        """Make cache active, keeping the outgoing one mapped for workers mid-batch"""
+        if self.previous:
+            self.previous.close()
+        self.previous, self.active = self.active, cache
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Seed cache state for miner stats"""
+        active = self.active
+        return {
+            'seed_hash': active.seed_hash if active else None,
+            'pending_seed_hash': self.pending_seed,
+            'size': self.size,
+            'builds': self.builds,
+            'last_build_time': active.build_time if active else 0.0,
+            'failed_seed_hash': self.failed_seed,
+            'last_error': self.last_error,
+            'huge_page_bytes': self.huge_page_bytes()
+        }
+
+    def huge_page_bytes(self) -> int:
+        """Bytes of mapped seed caches backed by huge pages"""
+        return sum(c.shm.huge_page_bytes for c in (self.active, self.previous) if c)
+
+    def close(self):
+        """Release every cache held by this manager; a build still running discards its result"""
+        with self.lock:
+            self.closed = True
+            self.pending_seed = None
+            for cache in (self.previous, self.active):
+                if cache:
+                    cache.close()
+            self.previous = self.active = None
+
+class RandomXMinerThread:
+    """Individual RandomX mining thread using shared connection proxy"""
+    
+    def __init__(self, thread_id: int, config: RandomXConfig, connection_proxy: PoolConnectionProxy,
+                 seed_caches: Optional[SeedCacheManager] = None,
+                 nonce_allocator: Optional[NonceAllocator] = None,
+                 counters: Optional[WorkerCounters] = None):
+        self.thread_id = thread_id
+        self.config = config
+        self.connection_proxy = connection_proxy
+        self.seed_caches = seed_caches
+        self.is_running = False
+        # Row thread_id of the miner's shared counter array, or a private one-row array
+        self.counters = counters or WorkerCounters(1)
+        self.counter_index = thread_id if counters else 0
+        self.thread = None
+        self.offline_mode = False
+        
+        # Mining state
+        self.current_job = None
+        self.pending_job = None  # Job waiting for its seed cache
+        self.job_generation = 0  # Last proxy generation picked up
+        self.job_switch_latency = 0.0  # Seconds from job receipt to adoption, last switch
+        self.job_switches = 0
+        self.prepared_job: Optional[PreparedJob] = None
+        self.hash_batch = KERNEL_REGISTRY.get('RandomX', config.kernel).hash_batch
+        self.seed_cache: Optional[SeedCache] = None
+        self.affinity: Optional[Dict[str, Any]] = None  # Entry from AffinityPlanner.plan
+        self.cpu_priority = clamp_cpu_priority(config.cpu_priority)  # Requested level
+        self.priority: Optional[Dict[str, Any]] = None  # Result of apply_thread_priority
+        self.duty_cycle = DutyCycleController(config.intensity)
+        self.nonce_allocator = nonce_allocator or NonceAllocator(config.nonce_range_size)
+        self.nonce = 0
+        self.nonce_end = 0  # End of the reserved range; nonce == nonce_end means none left
+        self.nonce_exhausted = False
+        self.hashes_done = 0
+        self.hashrate_windows = HashrateWindows()
+        
+    def start(self):
+        """Start mining thread"""
+        if self.is_running:
+            return
+            
+        self.is_running = True
+        self.thread = threading.Thread(target=self._mining_loop, daemon=True)
+        self.thread.start()
+        protocol_logger.info(f"🚀 RandomX mining thread {self.thread_id} started with proxy connection")
+    
+    def request_stop(self):
+        """Ask the thread to finish its current batch and exit, without waiting"""
+        self.is_running = False
+
+    def stop(self, timeout: float = 5.0):
+        """Stop mining thread"""
+        self.request_stop()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+        protocol_logger.info(f"🛑 RandomX mining thread {self.thread_id} stopped")
+    
+    @property
+    def stats(self) -> MiningStats:
+        """Snapshot of this thread's counters"""
+        return MiningStats(**self.counters.row(self.counter_index))
+    
+    def set_cpu_priority(self, level: int):
+        """Request a new scheduling priority; applied before the next batch"""
+        self.cpu_priority = clamp_cpu_priority(level)
+    
+    def set_intensity(self, intensity: int):
+        """Change the duty cycle target without restarting the thread"""
+        self.duty_cycle.set_intensity(intensity)
+    
+    @property
+    def measured_duty_cycle(self) -> float:
+        """Observed busy percentage of this worker"""
+        return self.duty_cycle.measured
+    
+    def _mining_loop(self):
+        """Main mining loop using connection proxy for share submission"""
+        logger.info(f"⚡ Mining loop started for thread {self.thread_id}")
+        
+        if self.affinity:
+            pin_current_thread(self.affinity['cpu'])
+        
+        # Mining timing control
+        hashes_per_batch = 1000
+        self.duty_cycle.reset()  # Measure this thread's CPU time
+        self.counters.set_status(self.counter_index, True)
+        
+        while self.is_running:
+            try:
+                # Apply the scheduling priority at start and whenever it is changed live
+                if self.priority is None or self.priority['level'] != self.cpu_priority:
+                    self.priority = apply_thread_priority(self.cpu_priority)
+
+                # Switch to a job held back for its seed cache once that cache is ready (or failed)
+                if self.pending_job and self._seed_cache_settled(self.pending_job):
+                    self._adopt_job(self.pending_job)
+                    self.pending_job = None
+                
+                # Pick up a newly published job generation (lock-free, once per batch)
+                if self._job_changed():
+                    self._poll_job()
+                
+                if not self.current_job:
+                    # Create local work template if no work available
+                    self._adopt_job(self._create_local_work())
+                    protocol_logger.debug(f"Thread {self.thread_id} using local work")
+                
+                if not self.current_job:
+                    time.sleep(1)
+                    continue
+                
+                # Hash whole nonce ranges through the kernel's batch API; counters are published once per batch
+                batch_hashes = batch_good = batch_rejected = 0
+                while batch_hashes < hashes_per_batch and self.is_running:
+                    if self.nonce >= self.nonce_end and not self._next_nonce_range():
+                        # Every nonce of this job is taken - idle until a new job arrives
+                        if not self.nonce_exhausted:
+                            logger.warning(f"⚠️ Nonce space exhausted for job {self.current_job.get('job_id')}")
+                            self.nonce_exhausted = True
+                        time.sleep(0.1)
+                        break
+                    
+                    nonce_start = self.nonce
+                    count = min(hashes_per_batch - batch_hashes, self.nonce_end - nonce_start)
+                    hashes = self._calculate_hash_batch(nonce_start, count)
+                    
+                    # Compare the whole batch with the share target at once
+                    for i in self._find_shares(hashes):
+                        hash_result = bytes(hashes[i * HASH_SIZE:(i + 1) * HASH_SIZE])
+                        protocol_logger.info(f"🎯 Share found by thread {self.thread_id}!")
+                        
+                        # Submit share through connection proxy
+                        if self.connection_proxy and not self.offline_mode:
+                            success = self._submit_share_via_proxy(hash_result, nonce_start + i)
+                            if success:
+                                protocol_logger.info(f"✅ Share accepted from thread {self.thread_id}")
+                                batch_good += 1
+                            else:
+                                protocol_logger.warning(f"⚠️ Share submission failed from thread {self.thread_id}")
+                                batch_rejected += 1
+                        else:
+                            protocol_logger.info(f"📊 Share found (offline mode)")
+                            batch_good += 1  # Count as good share in offline mode
+                    
+                    self.nonce = nonce_start + count
+                    batch_hashes += count
+                
+                self.counters.add(self.counter_index, batch_hashes, batch_good, batch_rejected)
+                self.counters.set_status(self.counter_index, True, self.job_switch_latency)
+                self.hashes_done += batch_hashes
+                self._update_hashrate()
+                
+                # Idle long enough to hold the configured intensity; a new job cuts the idle short
+                self.duty_cycle.throttle(lambda: self.is_running and not self._job_changed())
+                
+            except Exception as e:
+                logger.error(f"Mining error in thread {self.thread_id}: {e}")
+                time.sleep(1)
+        
+        self.counters.set_status(self.counter_index, False, self.job_switch_latency)
+    
+    def _create_local_work(self) -> Dict:
+        """Create local work template when pool doesn't provide one"""
+        return {
+            'job_id': f"local_job_{int(time.time())}",
+            'difficulty': DEFAULT_SHARE_DIFFICULTY,
+            'blob': '0' * 152,  # Placeholder blob
+            'target': f"{(2**256 // DEFAULT_SHARE_DIFFICULTY):064x}",
+            'local_work': True
+        }
+    
+    def _job_changed(self) -> bool:
+        """Whether the proxy has published a generation this thread has not seen"""
+        return self.connection_proxy is not None and \
+            self.connection_proxy.job_generation != self.job_generation
+    
+    def _poll_job(self):
+        """Adopt the proxy's latest job, holding it back while a new seed cache builds"""
+        generation = self.connection_proxy.job_generation
+        job = self.connection_proxy.get_job()
+        if job is None:
+            # Expired or no job yet: mark the generation seen so the throttle resumes
+            self.job_generation = generation
+            return
+        self.job_generation = job.generation
+        if not self.current_job or self._seed_cache_settled(job):
+            self._adopt_job(job)
+            self.pending_job = None
+            protocol_logger.debug(f"Thread {self.thread_id} got fresh work: {job.job_id or 'N/A'}")
+        else:
+            # New seed still building - keep hashing the current seed's job
+            self.pending_job = job
+    
+    def _adopt_job(self, job):
+        """Make job (a MiningJob or local work dict) current and prepare its hash input
+
+        A republish of the same work (only the share threshold changed) is not
+        a job switch: the thread keeps hashing its current nonce range.
+        """
+        same_work = isinstance(job, MiningJob) and isinstance(self.current_job, MiningJob) and \
+            job.work_generation == self.current_job.work_generation
+        self.current_job = job
+        self.prepared_job = PreparedJob(job)
+        if same_work:
+            return
+        self.seed_cache = self._resolve_seed_cache(job)
+        self.nonce = self.nonce_end = 0  # Reserve a range of the new job before hashing
+        self.nonce_exhausted = False
+        if isinstance(job, MiningJob):
+            self.job_switch_latency = max(0.0, time.time() - job.received_at)
+            self.job_switches += 1
+    
+    def _next_nonce_range(self) -> bool:
+        """Reserve the next disjoint nonce range for the current job's work"""
+        generation = self.current_job.work_generation if isinstance(self.current_job, MiningJob) else 0
+        nonce_range = self.nonce_allocator.allocate(generation)
+        if nonce_range is None and generation == 0:
+            # Local work has no pool to supply a fresh job, so wrap around
+            self.nonce_allocator.reset(0)
+            nonce_range = self.nonce_allocator.allocate(0)
+        if nonce_range is None:
+            return False
+        self.nonce, self.nonce_end = nonce_range
+        return True
+    
+    def _resolve_seed_cache(self, job) -> Optional[SeedCache]:
+        """Map the shared seed cache for the job's seed_hash, if any"""
+        if not self.seed_caches or not job.get('seed_hash'):
+            return None
+        return self.seed_caches.get(job['seed_hash'], job.get('seed_cache'))
+    
+    def _seed_cache_settled(self, job) -> bool:
+        """Whether job can be adopted now: its seed cache is ready or will not be built"""
+        if not self.seed_caches or not job.get('seed_hash'):
+            return True
+        return self._resolve_seed_cache(job) is not None or \
+            self.seed_caches.unavailable(job['seed_hash'], job.get('seed_cache'))
+    
+    def _calculate_hash_batch(self, nonce_start: int, count: int) -> bytearray:
+        """Hash `count` nonces of the prepared job into one contiguous buffer"""
+        if self.prepared_job is None:
+            self.prepared_job = PreparedJob(self.current_job)
+        seed_cache = self.seed_cache
+        return self.hash_batch(self.prepared_job, nonce_start, count, seed_cache.view if seed_cache else None)
+    
+    def _find_shares(self, hashes: bytearray) -> List[int]:
+        """Indices of the hashes in a batch that meet the job's share target"""
+        return find_shares(hashes, self.prepared_job.threshold) if self.prepared_job else []
+    
+    def _submit_share_via_proxy(self, hash_result: bytes, nonce: int) -> bool:
+        """Submit share through connection proxy with real job prioritization"""
+        try:
+            # Get real pool job - prioritize over local fallback
+            job_id = None
+            is_real_job = False
+            
+            # First try to get job from current thread job
+            if self.current_job and self.current_job.get('job_id'):
+                job_id = self.current_job['job_id']
+                is_real_job = not job_id.startswith('local_')
+            
+            # If no real job, try to get fresh job from proxy
+            if not is_real_job and self.connection_proxy:
+                fresh_job = self.connection_proxy.get_current_job()
+                if fresh_job and fresh_job.get('job_id'):
+                    fresh_job_id = fresh_job['job_id']
+                    if not fresh_job_id.startswith('local_'):
+                        job_id = fresh_job_id
+                        is_real_job = True
                         protocol_logger.debug(f"🔄 Using fresh REAL job from proxy: {job_id}")
             
             # Only use local fallback if no real job available AND we're offline/disconnected
@@ -1378,8 +3150,8 @@ class RandomXMinerThread:
                     protocol_logger.warning(f"⏳ No real pool job available - skipping share submission")
                     return False
             
-            # Format nonce as 8-character hex (standard for Monero)
-            nonce_hex = f"{self.nonce:08x}"
+            # Format nonce as the 4 little-endian bytes patched into the blob (standard for Monero)
+            nonce_hex = PreparedJob.NONCE.pack(nonce & 0xFFFFFFFF).hex()
             
             # For Monero, result should be the complete hash in hex format
             result_hex = hash_result[:32].hex()
@@ -1397,25 +3169,276 @@ class RandomXMinerThread:
             return False
     
     def _update_hashrate(self):
-        """Update hashrate statistics"""
-        current_time = time.time()
-        elapsed = current_time - self.start_time
+        """Update the rolling hashrate windows"""
+        self.hashrate_windows.record(self.hashes_done)
+        rates = self.hashrate_windows.rates()
+        self.counters.set_hashrate(self.counter_index, *rates)
         
-        if elapsed > 0:
-            self.stats.hashrate = self.hashes_done / elapsed
-            
-            # Log progress
-            if self.stats.hashrate > 0:
-                logger.debug(f"Thread {self.thread_id}: {self.stats.hashrate:.1f} H/s")
-            
-            # Reset counters every 5 minutes
-            if elapsed > 300:
-                self.start_time = current_time
-                self.hashes_done = 0
+        # Log progress
+        if rates[0] > 0:
+            logger.debug(f"Thread {self.thread_id}: {rates[0]:.1f} H/s")
+
+# ============================================================================
+# PROCESS WORKER SUPPORT
+# ============================================================================
+
+class JobBroadcast:
+    """Single-writer shared-memory job broadcast read by worker processes
+
+    Layout: an 8-byte sequence counter (odd while a write is in progress),
+    a connected flag, a payload length and a JSON-encoded job payload.
+    Readers retry until they observe the same even sequence before and after
+    copying the payload.
+    """
+
+    HEADER = struct.Struct('<QBxxxI')
+    PAYLOAD_CAPACITY = 8192
+
+    def __init__(self, name: Optional[str] = None, create: bool = False, huge_pages: bool = False):
+        size = self.HEADER.size + self.PAYLOAD_CAPACITY
+        if create:
+            self.shm = SharedRegion(size=size, create=True, huge_pages=huge_pages)
+            self.HEADER.pack_into(self.shm.buf, 0, 0, 0, 0)
+        else:
+            self.shm = SharedRegion(name=name)
+        self.name = self.shm.name
+        self.owner = create
+        self._sequence = 0
+
+    def publish(self, job: Optional[Dict], connected: bool):
+        """Publish a job (or None) to every attached worker"""
+        payload = json.dumps(job).encode('utf-8') if job else b''
+        if len(payload) > self.PAYLOAD_CAPACITY:
+            protocol_logger.warning(f"⚠️ Job payload too large for broadcast ({len(payload)} bytes), dropping")
+            return
+
+        buf = self.shm.buf
+        self._sequence += 1
+        self.HEADER.pack_into(buf, 0, self._sequence, int(connected), len(payload))
+        buf[self.HEADER.size:self.HEADER.size + len(payload)] = payload
+        self._sequence += 1
+        struct.pack_into('<Q', buf, 0, self._sequence)
+
+    def sequence(self) -> int:
+        """Current sequence number (cheap check for new data)"""
+        return struct.unpack_from('<Q', self.shm.buf, 0)[0]
+
+    def read(self) -> Tuple[int, bool, Optional[Dict]]:
+        """Read a consistent (sequence, connected, job) snapshot"""
+        buf = self.shm.buf
+        while True:
+            sequence, connected, length = self.HEADER.unpack_from(buf, 0)
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            payload = bytes(buf[self.HEADER.size:self.HEADER.size + length])
+            if struct.unpack_from('<Q', buf, 0)[0] == sequence:
+                break
+
+        job = json.loads(payload) if payload else None
+        return sequence, bool(connected), job
+
+    def close(self):
+        """Detach from (and, for the owner, destroy) the shared segment"""
+        if self.owner:
+            self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+class ProcessProxyClient:
+    """PoolConnectionProxy stand-in used by mining threads inside worker processes
+
+    Jobs are read from the shared-memory broadcast; shares are forwarded to the
+    parent over the result queue, where the real connection proxy submits them.
+    """
+
+    def __init__(self, broadcast: JobBroadcast, result_queue, worker_id: int):
+        self.broadcast = broadcast
+        self.result_queue = result_queue
+        self.worker_id = worker_id
+        self._sequence = -1
+        self._connected = False
+        self._job: Optional[MiningJob] = None
+
+    def _refresh(self):
+        if self.broadcast.sequence() != self._sequence:
+            self._sequence, self._connected, job = self.broadcast.read()
+            self._job = MiningJob(job, job.get('generation', 0), job.get('work_generation')) if job else None
+
+    @property
+    def connected(self) -> bool:
+        self._refresh()
+        return self._connected
+
+    @property
+    def job_generation(self) -> int:
+        """Generation of the latest broadcast job (one shared-memory read when unchanged)"""
+        self._refresh()
+        return self._job.generation if self._job else 0
+
+    def get_job(self) -> Optional[MiningJob]:
+        """Latest job published by the parent process"""
+        self._refresh()
+        return self._job
+
+    def get_current_job(self) -> Optional[Dict]:
+        """Latest job published by the parent process, as a dict"""
+        self._refresh()
+        return self._job.to_dict() if self._job else None
+
+    def submit_share(self, job_id: str, nonce: str, result: str) -> bool:
+        """Forward share to the parent process for submission"""
+        try:
+            self.result_queue.put_nowait(('share', self.worker_id, job_id, nonce, result))
+            return True
+        except queue.Full:
+            return False
+
+def _randomx_process_worker(worker_id: int, config: RandomXConfig, offline_mode: bool,
+                            broadcast_name: str, result_queue, stop_event,
+                            affinity: Optional[Dict[str, Any]] = None, cpu_priority=None,
+                            intensity=None, pressure_scale=None,
+                            nonce_allocator: Optional[NonceAllocator] = None,
+                            counters_name: Optional[str] = None, cpu_share: float = 1.0):
+    """Entry point of a RandomX worker process"""
+    broadcast = JobBroadcast(broadcast_name)
+    client = ProcessProxyClient(broadcast, result_queue, worker_id)
+    seed_caches = SeedCacheManager(config.seed_cache_size, owner=False)
+    counters = WorkerCounters(config.threads, name=counters_name) if counters_name else None
+
+    if affinity:
+        pin_current_thread(affinity['cpu'])
+
+    miner = RandomXMinerThread(worker_id, config, client, seed_caches, nonce_allocator, counters)
+    miner.offline_mode = offline_mode
+    miner.affinity = affinity
+    miner.duty_cycle.cpu_share = cpu_share
+    if pressure_scale is not None:
+        miner.duty_cycle.scale = lambda: pressure_scale.value
+    miner.start()
+
+    # Hash and share counters go straight to the shared array; the rest is reported here
+    def report():
+        result_queue.put((
+            'stats', worker_id,
+            miner.priority,
+            miner.duty_cycle.measured
+        ))
+
+    try:
+        while not stop_event.wait(1.0):
+            if cpu_priority is not None:
+                miner.cpu_priority = cpu_priority.value
+            if intensity is not None and intensity.value != miner.duty_cycle.intensity:
+                miner.set_intensity(intensity.value)
+            report()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        miner.stop()
+        report()
+        miner.counters.close()
+        seed_caches.close()
+        broadcast.close()
+
+class RandomXMinerProcess:
+    """Parent-side handle for a RandomX worker running in its own OS process"""
+
+    MAX_RESTARTS = 3  # Restarts after unexpected exits before the worker is given up
+
+    def __init__(self, worker_id: int, config: RandomXConfig, mp_context,
+                 broadcast_name: str, result_queue):
+        self.thread_id = worker_id
+        self.config = config
+        self.mp_context = mp_context
+        self.broadcast_name = broadcast_name
+        self.result_queue = result_queue
+        self.is_running = False
+        self.counters: Optional[WorkerCounters] = None  # Shared array; row worker_id is ours
+        self.offline_mode = False
+        self.process = None
+        self.stop_event = mp_context.Event()
+        self.affinity: Optional[Dict[str, Any]] = None
+        self.cpu_priority = mp_context.Value('i', clamp_cpu_priority(config.cpu_priority), lock=False)
+        self.priority: Optional[Dict[str, Any]] = None
+        self.intensity = mp_context.Value('i', max(1, min(100, config.intensity)), lock=False)
+        self.measured_duty_cycle = 0.0  # Busy percentage reported by the worker
+        self.pressure_scale = None  # Shared PressureGovernor scale, if enabled
+        self.nonce_allocator: Optional[NonceAllocator] = None
+        self.cpu_share = 1.0  # Passed to the worker's DutyCycleController
+        self.restarts = 0
+
+    def start(self):
+        """Start worker process"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self.process = self.mp_context.Process(
+            target=_randomx_process_worker,
+            args=(self.thread_id, self.config, self.offline_mode,
+                  self.broadcast_name, self.result_queue, self.stop_event, self.affinity,
+                  self.cpu_priority, self.intensity, self.pressure_scale, self.nonce_allocator,
+                  self.counters.name if self.counters else None, self.cpu_share),
+            name=f"randomx-worker-{self.thread_id}",
+            daemon=True
+        )
+        self.process.start()
+        protocol_logger.info(f"🚀 RandomX worker process {self.thread_id} started (pid {self.process.pid})")
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def restart(self):
+        """Start a fresh process after the previous one exited on its own"""
+        self.restarts += 1
+        self.is_running = False
+        self.start()
+
+    def request_stop(self):
+        """Signal the worker process to exit, without waiting"""
+        self.is_running = False
+        self.stop_event.set()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop worker process"""
+        self.request_stop()
+        if self.process:
+            self.process.join(timeout=timeout)
+            if self.process.is_alive():
+                logger.warning(f"⚠️ Worker process {self.thread_id} did not exit, terminating")
+                self.process.terminate()
+                self.process.join(timeout=5)
+        protocol_logger.info(f"🛑 RandomX worker process {self.thread_id} stopped")
+
+    def set_cpu_priority(self, level: int):
+        """Request a new scheduling priority; the worker applies it within a second"""
+        self.cpu_priority.value = clamp_cpu_priority(level)
+
+    def set_intensity(self, intensity: int):
+        """Request a new duty cycle target; the worker applies it within a second"""
+        self.intensity.value = max(1, min(100, int(intensity)))
+
+    @property
+    def stats(self) -> MiningStats:
+        """Snapshot of this worker's row in the shared counter array"""
+        if self.counters is None:
+            return MiningStats()
+        return MiningStats(**self.counters.row(self.thread_id))
+
+    def update_stats(self, priority: Optional[Dict[str, Any]] = None, duty_cycle: float = 0.0):
+        """Apply a stats report received from the worker process"""
+        self.priority = priority
+        self.measured_duty_cycle = duty_cycle
 
 class RandomXMiner:
     """Main RandomX Miner class with single connection proxy"""
     
+    WORKER_STOP_TIMEOUT = 10.0  # Seconds to wait for all workers together on stop
+    WORKER_CHECK_INTERVAL = 1.0  # Seconds between liveness checks of worker processes
+    
     def __init__(self, config: RandomXConfig):
         self.config = config
         self.connection_proxy = None
@@ -1423,10 +3446,34 @@ class RandomXMiner:
         self.is_running = False
         self.total_stats = MiningStats()
         self.offline_mode = False
+        self.start_time = 0.0
+        
+        # Container-aware CPU and memory budget
+        self.resource_limits = detect_resource_limits()
+        
+        # Seed cache shared by every worker (memory_pool is in GB); at most a
+        # quarter of the memory budget so a container's memory.max is respected
+        cache_size = min(self.config.seed_cache_size, self.config.memory_pool * 1024 ** 3,
+                         self.resource_limits.memory_bytes // 4)
+        self.seed_caches = SeedCacheManager(cache_size, huge_pages=self.config.huge_pages)
+        
+        self.affinity_plan: List[Dict[str, Any]] = []
+        self.governor: Optional[PressureGovernor] = None
+        self.metrics = SystemMetricsSampler(self.config.metrics_interval)
+        self.nonce_allocator: Optional[NonceAllocator] = None
+        self.counters: Optional[WorkerCounters] = None
+        
+        # Process worker mode state
+        self.job_broadcast: Optional[JobBroadcast] = None
+        self.result_queue = None
+        self.bridge_thread = None
+        self.bridge_running = False
         
         # Auto-detect thread count if not specified
         if self.config.threads is None or self.config.threads <= 0:
-            self.config.threads = max(1, psutil.cpu_count() - 1)
+            self.config.threads = max(1, self.resource_limits.worker_cpus - 1)
+            logger.info(f"🧮 {self.resource_limits.cpu_count:g} CPUs available ({self.resource_limits.cpu_source})")
+        self.config.cpu_priority = clamp_cpu_priority(self.config.cpu_priority)
         
         logger.info(f"🔧 RandomX Miner configured with {self.config.threads} threads")
         logger.info(f"🎯 Target pool: {self.config.pool_url}")
@@ -1437,6 +3484,11 @@ class RandomXMiner:
         try:
             logger.info("🚀 Starting RandomX CPU Miner with Connection Proxy...")
             
+            kernel = KERNEL_REGISTRY.get('RandomX', self.config.kernel)
+            if not kernel.verify():
+                logger.error(f"❌ RandomX kernel '{kernel.name}' failed golden vector self-test")
+                return False
+            
             # Initialize single connection proxy
             protocol_logger.info("🌐 Initializing single connection proxy...")
             self.connection_proxy = PoolConnectionProxy(
@@ -1453,15 +3505,45 @@ class RandomXMiner:
                 protocol_logger.info("✅ Connection proxy started successfully")
                 self.offline_mode = False
             
-            # Create and start mining threads (all use same proxy)
-            logger.info(f"⚡ Starting {self.config.threads} mining threads with shared connection...")
-            for i in range(self.config.threads):
-                thread = RandomXMinerThread(i, self.config, self.connection_proxy)
-                thread.offline_mode = self.offline_mode
-                self.threads.append(thread)
-                thread.start()
-            
             self.is_running = True
+            self.start_time = time.time()
+            self.metrics.start()
+            
+            if self.seed_caches.closed:
+                # Restart after stop(): a closed manager stays closed
+                self.seed_caches = SeedCacheManager(self.seed_caches.size, huge_pages=self.config.huge_pages)
+            
+            if self.config.psi_governor:
+                self.governor = PressureGovernor()
+                if not self.governor.start():
+                    self.governor = None
+            
+            if self.config.cpu_affinity:
+                self.affinity_plan = AffinityPlanner(self.config.scratchpad_l3).plan(self.config.threads)
+                if self.affinity_plan:
+                    cpus = sorted({entry['cpu'] for entry in self.affinity_plan if entry['cpu'] is not None})
+                    pinned = sum(entry['cpu'] is not None for entry in self.affinity_plan)
+                    logger.info(f"📌 Pinning {pinned} of {len(self.affinity_plan)} workers to CPUs {cpus}")
+            
+            if self.config.worker_mode == 'process':
+                self._start_process_workers()
+            else:
+                # Create and start mining threads (all use same proxy)
+                logger.info(f"⚡ Starting {self.config.threads} mining threads with shared connection...")
+                self.nonce_allocator = NonceAllocator(self.config.nonce_range_size)
+                self.counters = WorkerCounters(self.config.threads)
+                cpu_share = worker_cpu_share(self.config.threads, self.resource_limits.cpu_count)
+                for i in range(self.config.threads):
+                    thread = RandomXMinerThread(i, self.config, self.connection_proxy, self.seed_caches,
+                                                self.nonce_allocator, self.counters)
+                    thread.offline_mode = self.offline_mode
+                    thread.affinity = self._affinity_for(i)
+                    thread.duty_cycle.cpu_share = cpu_share
+                    if self.governor:
+                        thread.duty_cycle.scale = self._governor_scale
+                    self.threads.append(thread)
+                    thread.start()
+            
             logger.info(f"✅ RandomX miner started with {len(self.threads)} threads using single connection")
             if self.offline_mode:
                 logger.info("🔄 Running in offline mining mode - local hash calculations only")
@@ -1475,39 +3557,195 @@ class RandomXMiner:
             
         except Exception as e:
             logger.error(f"❌ Failed to start RandomX miner: {e}")
+            self.is_running = False
             return False
     
+    def _governor_scale(self) -> float:
+        """Duty cycle multiplier from the PSI governor"""
+        return self.governor.scale if self.governor else 1.0
+    
+    def _affinity_for(self, worker_id: int) -> Optional[Dict[str, Any]]:
+        """Affinity plan entry for a worker, if pinning is enabled"""
+        return self.affinity_plan[worker_id] if worker_id < len(self.affinity_plan) else None
+    
+    def _start_process_workers(self):
+        """Start one OS process per worker, fed through a shared-memory job broadcast"""
+        logger.info(f"⚡ Starting {self.config.threads} mining processes with shared connection...")
+        mp_context = multiprocessing.get_context('spawn')
+        
+        self.job_broadcast = JobBroadcast(create=True, huge_pages=self.config.huge_pages)
+        self.result_queue = mp_context.Queue()
+        self._publish_job()
+        
+        self.nonce_allocator = NonceAllocator(self.config.nonce_range_size, mp_context)
+        self.counters = WorkerCounters(self.config.threads, shared=True)
+        
+        cpu_share = worker_cpu_share(self.config.threads, self.resource_limits.cpu_count)
+        pressure_scale = None
+        if self.governor:
+            pressure_scale = mp_context.Value('d', 1.0, lock=False)
+            self.governor.shared_scale = pressure_scale
+            self.governor.own_pids = self._own_pids
+        
+        for i in range(self.config.threads):
+            worker = RandomXMinerProcess(i, self.config, mp_context, self.job_broadcast.name, self.result_queue)
+            worker.offline_mode = self.offline_mode
+            worker.affinity = self._affinity_for(i)
+            worker.pressure_scale = pressure_scale
+            worker.nonce_allocator = self.nonce_allocator
+            worker.counters = self.counters
+            worker.cpu_share = cpu_share
+            self.threads.append(worker)
+            worker.start()
+        
+        self.bridge_running = True
+        self.bridge_thread = threading.Thread(target=self._process_bridge, daemon=True)
+        self.bridge_thread.start()
+    
+    def set_cpu_priority(self, level: int):
+        """Change the scheduling priority of every running worker"""
+        self.config.cpu_priority = clamp_cpu_priority(level)
+        policy = CPU_PRIORITY_LEVELS[self.config.cpu_priority][0]
+        nice = priority_nice(self.config.cpu_priority)
+        logger.info(f"⚖️ CPU priority {self.config.cpu_priority}: {policy}, "
+                    f"nice {nice if nice is not None else 'unchanged'}")
+        for thread in self.threads:
+            thread.set_cpu_priority(self.config.cpu_priority)
+    
+    def set_intensity(self, intensity: int):
+        """Change the duty cycle target of every running worker"""
+        self.config.intensity = max(1, min(100, int(intensity)))
+        logger.info(f"🎚️ Intensity set to {self.config.intensity}%")
+        for thread in self.threads:
+            thread.set_intensity(self.config.intensity)
+    
+    def _publish_job(self, last_published: Optional[Tuple] = None) -> Tuple:
+        """Publish the proxy's current job to worker processes if its generation changed"""
+        mining_job = self.connection_proxy.get_job() if self.connection_proxy else None
+        connected = bool(self.connection_proxy and self.connection_proxy.connected)
+        key = mining_job.generation if mining_job else None
+        
+        if (key, connected) != last_published:
+            job = mining_job.to_dict() if mining_job else None
+            if job and job.get('seed_hash'):
+                # Build the seed cache here once; workers attach to it by name
+                cache = self.seed_caches.get(job['seed_hash'])
+                if cache:
+                    job['seed_cache'] = cache.name
+                elif not self.seed_caches.unavailable(job['seed_hash']) and last_published and last_published[0]:
+                    # New seed still building - workers keep the current job until it is ready
+                    return last_published
+            self.job_broadcast.publish(job, connected)
+        return (key, connected)
+    
+    def _process_bridge(self):
+        """Relay jobs to worker processes and shares/stats back to the connection proxy"""
+        workers = {w.thread_id: w for w in self.threads}
+        last_published = None
+        last_check = time.monotonic()
+        
+        # Keeps draining the result queue while workers shut down so they can exit cleanly
+        while self.bridge_running:
+            try:
+                # Unchanged generations cost one attribute read, so poll often for fast job switches
+                if self.is_running:
+                    last_published = self._publish_job(last_published)
+                    if time.monotonic() - last_check >= self.WORKER_CHECK_INTERVAL:
+                        self._check_worker_processes()
+                        last_check = time.monotonic()
+                
+                message = self.result_queue.get(timeout=0.05)
+                kind, worker_id = message[0], message[1]
+                
+                if kind == 'share':
+                    job_id, nonce, result = message[2:]
+                    if self.connection_proxy and not self.offline_mode:
+                        self.connection_proxy.submit_share(job_id, nonce, result)
+                elif kind == 'stats' and worker_id in workers:
+                    workers[worker_id].update_stats(*message[2:])
+                    
+            except Empty:
+                continue
+            except Exception as e:
+                logger.error(f"Process bridge error: {e}")
+                time.sleep(1)
+    
+    def _own_pids(self) -> List[int]:
+        """This process and every running worker process"""
+        return [os.getpid()] + [w.process.pid for w in self.threads if getattr(w, 'process', None) and w.process.pid]
+    
+    def _check_worker_processes(self):
+        """Log and restart worker processes that exited without being asked to"""
+        for worker in self.threads:
+            if not worker.is_running or worker.is_alive():
+                continue
+            exitcode = worker.process.exitcode if worker.process else None
+            if worker.restarts < worker.MAX_RESTARTS:
+                logger.error(f"❌ Worker process {worker.thread_id} exited with code {exitcode}, "
+                             f"restarting ({worker.restarts + 1}/{worker.MAX_RESTARTS})")
+                worker.restart()
+            else:
+                logger.error(f"❌ Worker process {worker.thread_id} exited with code {exitcode} "
+                             f"after {worker.MAX_RESTARTS} restarts, giving up")
+                worker.is_running = False
+                if self.counters:
+                    # The process died without clearing its own running flag
+                    self.counters.set_status(worker.thread_id, False)
+    
     def stop(self):
         """Stop RandomX mining"""
         logger.info("🛑 Stopping RandomX miner...")
         
         self.is_running = False
         
-        # Stop all threads
+        # Signal every worker first so they wind down in parallel, then wait
+        # for all of them against one shared deadline
+        for thread in self.threads:
+            thread.request_stop()
+        deadline = time.monotonic() + self.WORKER_STOP_TIMEOUT
         for thread in self.threads:
-            thread.stop()
+            thread.stop(timeout=max(0.0, deadline - time.monotonic()))
         
         # Stop connection proxy
         if self.connection_proxy:
             self.connection_proxy.stop()
         
+        if self.bridge_thread:
+            self.bridge_running = False
+            self.bridge_thread.join(timeout=2)
+            self.bridge_thread = None
+        
+        if self.job_broadcast:
+            self.job_broadcast.close()
+            self.job_broadcast = None
+        
+        if self.governor:
+            self.governor.stop()
+            self.governor = None
+        
+        self.metrics.stop()
+        
+        if self.counters:
+            counters, self.counters = self.counters, None
+            counters.close()
+        
+        self.seed_caches.close()
+        
         self.threads.clear()
         logger.info("✅ RandomX miner stopped")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive mining statistics including proxy stats"""
-        total_hashrate = sum(t.stats.hashrate for t in self.threads)
-        total_hashes = sum(t.stats.hashes_total for t in self.threads)
-        total_shares = sum(t.stats.shares_good for t in self.threads)
-        total_rejected = sum(t.stats.shares_rejected for t in self.threads)
+        counters = self.counters
+        totals = counters.totals() if counters and self.threads else asdict(MiningStats())
+        total_hashrate = totals['hashrate']
+        total_hashes = totals['hashes_total']
+        total_shares = totals['shares_good']
+        total_rejected = totals['shares_rejected']
+        activity = counters.activity() if counters and self.threads else \
+            {'workers_running': 0, 'job_switch_latency': {'avg': 0.0, 'max': 0.0}}
         
-        # System statistics
-        try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-        except:
-            cpu_percent = 0
-            memory = type('obj', (object,), {'percent': 0, 'total': 0, 'available': 0})()
+        system = self.metrics.snapshot
         
         # Pool connection status from proxy
         pool_connected = (
@@ -1523,31 +3761,77 @@ class RandomXMiner:
             'algorithm': 'RandomX',
             'coin': self.config.coin,
             'hashrate': total_hashrate,
+            'hashrate_10s': totals['hashrate_10s'],
+            'hashrate_60s': totals['hashrate_60s'],
+            'hashrate_15m': totals['hashrate_15m'],
             'hashes_total': total_hashes,
             'shares_good': total_shares,
             'shares_rejected': total_rejected,
             'shares_accepted': proxy_stats.get('shares_accepted', 0),  # From proxy
             'shares_submitted': proxy_stats.get('shares_submitted', 0),  # From proxy
             'threads': len(self.threads),
-            'uptime': time.time() - (self.threads[0].start_time if self.threads else time.time()),
-            'cpu_usage': cpu_percent,
-            'memory_usage': memory.percent,
-            'memory_total': memory.total,
-            'memory_available': memory.available,
+            'worker_mode': self.config.worker_mode,
+            'workers_running': activity['workers_running'],
+            'cpu_priority': self.config.cpu_priority,
+            'intensity': self.config.intensity,
+            'pressure_governor': self.governor.get_stats() if self.governor else {'enabled': False},
+            'resource_limits': asdict(self.resource_limits),
+            'job_generation': self.connection_proxy.job_generation if self.connection_proxy else 0,
+            'nonce_allocator': self.nonce_allocator.get_stats() if self.nonce_allocator else {},
+            'job_switch_latency': activity['job_switch_latency'],
+            'uptime': time.time() - self.start_time if self.is_running else 0,
+            'cpu_usage': system['cpu_usage'],
+            'memory_usage': system['memory_usage'],
+            'memory_total': system['memory_total'],
+            'memory_available': system['memory_available'],
+            'load_average': system['load_average'],
+            'cpu_frequency': system['cpu_frequency'],
+            'temperature': system['temperature'],
             'is_running': self.is_running,
             'pool_connected': pool_connected,
             'pool_url': self.config.pool_url,
+            'seed_cache': self.seed_caches.get_stats(),
+            'huge_pages_enabled': self.config.huge_pages,
+            'huge_page_bytes': self.seed_caches.huge_page_bytes() + (
+                self.job_broadcast.shm.huge_page_bytes if self.job_broadcast else 0),
             'queue_size': proxy_stats.get('queue_size', 0),  # Share queue size
             'last_share_time': proxy_stats.get('last_share_time', 0),
+            'thread_summary': counters.summary() if counters and self.threads else {},
             'thread_stats': [
-                {
-                    'id': t.thread_id,
-                    'hashrate': t.stats.hashrate,
-                    'hashes': t.stats.hashes_total,
-                    'shares': t.stats.shares_good
-                }
-                for t in self.threads
-            ]
+                self._thread_row(t, counters) for t in self.threads
+            ] if counters and self._thread_detail() else []
+        }
+    
+    def _thread_detail(self) -> bool:
+        """Whether get_stats includes one row per worker"""
+        mode = self.config.thread_stats
+        return mode == 'full' or (mode == 'auto' and len(self.threads) <= THREAD_STATS_DETAIL_LIMIT)
+    
+    @staticmethod
+    def _thread_row(t, counters: WorkerCounters) -> Dict[str, Any]:
+        row = counters.row(t.thread_id)
+        return {
+            'id': t.thread_id,
+            'hashrate': row['hashrate'],
+            'hashrate_60s': row['hashrate_60s'],
+            'hashes': row['hashes_total'],
+            'shares': row['shares_good'],
+            'affinity': t.affinity,
+            'priority': t.priority,
+            'duty_cycle': t.measured_duty_cycle,
+            'job_switch_latency': counters.status(t.thread_id)['job_switch_latency']
+        }
+    
+    def get_thread_stats(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """One page of per-worker statistics, ordered by worker id"""
+        threads, counters = self.threads, self.counters
+        offset = max(0, offset)
+        page = threads[offset:offset + max(0, limit)] if counters else []
+        return {
+            'total': len(threads),
+            'offset': offset,
+            'limit': limit,
+            'threads': [self._thread_row(t, counters) for t in page]
         }
     
     def _stats_monitor(self):
@@ -1579,6 +3863,99 @@ class RandomXMiner:
 # SCRYPT MINING ENGINE
 # ============================================================================
 
+SCRYPT_LOCAL_DIFFICULTY = 256  # Share difficulty for locally generated Scrypt work
+
+class ScryptHeaderTemplate:
+    """80-byte block header prepared once per job for Scrypt hashing
+
+    Litecoin-style Scrypt uses the header as both password and salt. The header
+    is longer than a SHA-256 block, so PBKDF2-HMAC keys on SHA256(header); the
+    first 64 bytes never change within a job, so that digest is resumed from a
+    cached midstate and only the final 16-byte block (ending in the nonce) is
+    compressed per hash. The scrypt output is identical to hashing the raw header.
+    """
+
+    HEADER_SIZE = 80
+    NONCE_OFFSET = 76
+    NONCE = struct.Struct('<I')
+
+    def __init__(self, job: Dict):
+        self.job = job
+        self.job_id = job.get('job_id')
+        self.header = bytearray(self._build_header(job))
+        self.tail = memoryview(self.header)[64:]
+        self.midstate = hashlib.sha256(self.header[:64])
+        self.threshold = target_to_threshold(job.get('target'), job.get('difficulty'))
+
+    @classmethod
+    def _build_header(cls, job: Dict) -> bytes:
+        """Assemble the header from a raw blob or from Stratum-style fields"""
+        blob = job.get('header') or job.get('blob')
+        if blob:
+            try:
+                raw = bytes.fromhex(blob)
+            except (TypeError, ValueError):
+                raw = b''
+            if len(raw) in (cls.NONCE_OFFSET, cls.HEADER_SIZE):
+                return raw[:cls.NONCE_OFFSET] + bytes(4)
+
+        return (
+            struct.pack('<I', cls._u32(job.get('version', 0x20000000))) +
+            bytes.fromhex(job.get('prevhash', '00' * 32)) +
+            bytes.fromhex(job.get('merkle_root', '00' * 32)) +
+            struct.pack('<II', cls._u32(job.get('ntime', int(time.time()))),
+                        cls._u32(job.get('nbits', 0x1e0ffff0))) +
+            bytes(4)
+        )
+
+    @staticmethod
+    def _u32(value) -> int:
+        """Stratum sends header words as big-endian hex strings"""
+        return int(value, 16) if isinstance(value, str) else int(value)
+
+    @classmethod
+    def from_input(cls, data: bytes) -> 'ScryptHeaderTemplate':
+        """Template for a raw 80-byte header (used by kernel self-tests)"""
+        return cls({'header': data.hex()})
+
+    def patch_nonce(self, nonce: int) -> bytearray:
+        """Write nonce into the header and return it"""
+        self.NONCE.pack_into(self.header, self.NONCE_OFFSET, nonce & 0xFFFFFFFF)
+        return self.header
+
+    def hash_nonce(self, nonce: int) -> bytes:
+        """Patch nonce into the header and return its Scrypt hash"""
+        self.NONCE.pack_into(self.header, self.NONCE_OFFSET, nonce)
+        key = self.midstate.copy()
+        key.update(self.tail)
+        return hashlib.scrypt(key.digest(), salt=self.header, n=1024, r=1, p=1, dklen=32)
+
+    def meets_target(self, hash_result: bytes) -> bool:
+        """Compare the hash's high-order word against the job threshold"""
+        return PreparedJob.HASH_HIGH_WORD.unpack_from(hash_result, 24)[0] < self.threshold
+
+# (header hex, output hex) pairs for scrypt(header, salt=header, N=1024, r=1, p=1)
+SCRYPT_GOLDEN_VECTORS = [
+    ('00' * 80,
+     '161d0876f3b93b1048cda1bdeaa7332ee210f7131b42013cb43913a6553a4b69'),
+    (bytes(range(80)).hex(),
+     'bc540a1a801df96e493005c71e010e2d387607fbf0fec416fd3c2645aa1ba9d2'),
+]
+
+def scrypt_header_hash(header: bytes) -> bytes:
+    """Scrypt hash of a full header, keyed on SHA256(header) as PBKDF2-HMAC does internally"""
+    return hashlib.scrypt(hashlib.sha256(header).digest(), salt=header, n=1024, r=1, p=1, dklen=32)
+
+def scrypt_hash_batch(template: ScryptHeaderTemplate, nonce_start: int, count: int,
+                      dataset: Optional[memoryview] = None) -> bytearray:
+    """Scrypt hashes of `count` consecutive nonces, each resumed from the template's midstate"""
+    out = bytearray(HASH_SIZE * count)
+    hash_nonce = template.hash_nonce
+    for i in range(count):
+        offset = i * HASH_SIZE
+        out[offset:offset + HASH_SIZE] = hash_nonce((nonce_start + i) & 0xFFFFFFFF)
+    return out
+
 class ScryptMiner:
     """Scrypt mining implementation for LTC, DOGE, etc."""
     
@@ -1586,10 +3963,18 @@ class ScryptMiner:
         self.config = config
         self.is_running = False
         self.threads = []
-        self.stats = MiningStats()
+        self.current_job = None
+        self.duty_cycles: Dict[int, DutyCycleController] = {}
+        self.governor: Optional[PressureGovernor] = None
+        self.metrics = SystemMetricsSampler(self.config.metrics_interval)
+        self.resource_limits = detect_resource_limits()
         
         if self.config.threads is None or self.config.threads <= 0:
-            self.config.threads = max(1, psutil.cpu_count())
+            self.config.threads = self.resource_limits.worker_cpus
+            logger.info(f"🧮 {self.resource_limits.cpu_count:g} CPUs available ({self.resource_limits.cpu_source})")
+        self.config.cpu_priority = clamp_cpu_priority(self.config.cpu_priority)
+        self.counters = WorkerCounters(self.config.threads)
+        self.start_time = 0.0
         
         logger.info(f"🔧 Scrypt Miner configured for {self.config.coin} with {self.config.threads} threads")
     
@@ -1597,7 +3982,21 @@ class ScryptMiner:
         """Start Scrypt mining"""
         try:
             logger.info("🚀 Starting Scrypt CPU Miner...")
+            
+            kernel = KERNEL_REGISTRY.get('Scrypt', self.config.kernel)
+            if not kernel.verify():
+                logger.error(f"❌ Scrypt kernel '{kernel.name}' failed golden vector self-test")
+                return False
+            self.hash_batch = kernel.hash_batch
+            self.current_job = self._create_local_work()
+            self.start_time = time.time()
             self.is_running = True
+            self.metrics.start()
+            
+            if self.config.psi_governor:
+                self.governor = PressureGovernor()
+                if not self.governor.start():
+                    self.governor = None
             
             # Start mining threads
             for i in range(self.config.threads):
@@ -1616,48 +4015,561 @@ class ScryptMiner:
         """Stop Scrypt mining"""
         logger.info("🛑 Stopping Scrypt miner...")
         self.is_running = False
+        if self.governor:
+            self.governor.stop()
+            self.governor = None
+        self.metrics.stop()
         logger.info("✅ Scrypt miner stopped")
     
+    def set_cpu_priority(self, level: int):
+        """Change the scheduling priority; each thread applies it before its next batch"""
+        self.config.cpu_priority = clamp_cpu_priority(level)
+    
+    def _governor_scale(self) -> float:
+        """Duty cycle multiplier from the PSI governor"""
+        return self.governor.scale if self.governor else 1.0
+    
+    def set_intensity(self, intensity: int):
+        """Change the duty cycle target of every mining thread without restarting it"""
+        self.config.intensity = max(1, min(100, int(intensity)))
+        for duty_cycle in self.duty_cycles.values():
+            duty_cycle.set_intensity(self.config.intensity)
+    
+    def _create_local_work(self) -> Dict:
+        """Create local header work when no pool job is available"""
+        identity = f"{self.config.coin}:{self.config.wallet_address}".encode()
+        return {
+            'job_id': f"local_{int(time.time())}",
+            'merkle_root': hashlib.sha256(hashlib.sha256(identity).digest()).hexdigest(),
+            'ntime': int(time.time()),
+            'difficulty': SCRYPT_LOCAL_DIFFICULTY,
+            'local_work': True
+        }
+    
     def _mining_thread(self, thread_id: int):
         """Individual Scrypt mining thread"""
         logger.info(f"⚡ Scrypt mining thread {thread_id} started")
         
+        # Each thread scans its own slice of the 32-bit nonce space
+        nonce_span = (1 << 32) // max(1, self.config.threads)
+        nonce_start = thread_id * nonce_span
+        nonce_end = nonce_start + nonce_span
+        nonce = nonce_start
+        template = None
+        priority = None
+        duty_cycle = DutyCycleController(self.config.intensity, self._governor_scale if self.governor else None,
+                                         worker_cpu_share(self.config.threads, self.resource_limits.cpu_count))
+        self.duty_cycles[thread_id] = duty_cycle
+        windows = HashrateWindows()
+        hashes_done = 0
+        
         while self.is_running:
             try:
-                # Simulate Scrypt mining work
-                for _ in range(1000):
-                    if not self.is_running:
-                        break
-                    
-                    # Simple Scrypt-like calculation
-                    data = f"{thread_id}_{time.time()}_{random.randint(0, 1000000)}".encode()
-                    hash_result = hashlib.scrypt(data, salt=b'mining', n=1024, r=1, p=1, dklen=32)
-                    
-                    # Check for "share"
-                    if hash_result[0] == 0:  # Simple difficulty check
-                        self.stats.shares_good += 1
-                        logger.info(f"🎯 Scrypt share found by thread {thread_id}")
-                    
-                    self.stats.hashes_total += 1
+                if priority is None or priority['level'] != self.config.cpu_priority:
+                    priority = apply_thread_priority(self.config.cpu_priority)
+                
+                if template is None or template.job is not self.current_job:
+                    template = ScryptHeaderTemplate(self.current_job)
+                    nonce = nonce_start
                 
-                time.sleep(0.1)  # Small delay
+                batch_hashes = min(1000, nonce_end - nonce)
+                hashes = self.hash_batch(template, nonce, batch_hashes, None)
+                batch_good = len(find_shares(hashes, template.threshold))
+                if batch_good:
+                    logger.info(f"🎯 Scrypt share found by thread {thread_id} ({batch_good} in batch)")
+                
+                nonce += batch_hashes
+                if nonce >= nonce_end:
+                    # Nonce slice exhausted - roll ntime via fresh local work
+                    self.current_job = self._create_local_work()
+                
+                self.counters.add(thread_id, batch_hashes, batch_good)
+                hashes_done += batch_hashes
+                windows.record(hashes_done)
+                self.counters.set_hashrate(thread_id, *windows.rates())
+                
+                # Idle long enough to hold the configured intensity
+                duty_cycle.throttle(lambda: self.is_running)
                 
             except Exception as e:
                 logger.error(f"Scrypt mining error in thread {thread_id}: {e}")
                 time.sleep(1)
     
+    @property
+    def stats(self) -> MiningStats:
+        """Totals across every mining thread"""
+        return MiningStats(**self.counters.totals())
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get Scrypt mining statistics"""
+        totals = self.counters.totals()
+        system = self.metrics.snapshot
         return {
             'algorithm': 'Scrypt',
             'coin': self.config.coin,
-            'hashrate': self.stats.hashes_total / max(1, time.time() - getattr(self, 'start_time', time.time())),
-            'hashes_total': self.stats.hashes_total,
-            'shares_good': self.stats.shares_good,
-            'shares_rejected': self.stats.shares_rejected,
+            'hashrate': totals['hashrate'],
+            'hashrate_10s': totals['hashrate_10s'],
+            'hashrate_60s': totals['hashrate_60s'],
+            'hashrate_15m': totals['hashrate_15m'],
+            'hashes_total': totals['hashes_total'],
+            'shares_good': totals['shares_good'],
+            'shares_rejected': totals['shares_rejected'],
             'threads': len(self.threads),
+            'cpu_priority': self.config.cpu_priority,
+            'intensity': self.config.intensity,
+            'duty_cycle': [d.measured for _, d in sorted(self.duty_cycles.items())],
+            'thread_summary': self.counters.summary(),
+            'pressure_governor': self.governor.get_stats() if self.governor else {'enabled': False},
+            'resource_limits': asdict(self.resource_limits),
+            'uptime': time.time() - self.start_time if self.is_running else 0,
+            'cpu_usage': system['cpu_usage'],
+            'memory_usage': system['memory_usage'],
+            'load_average': system['load_average'],
+            'cpu_frequency': system['cpu_frequency'],
+            'temperature': system['temperature'],
             'is_running': self.is_running
         }
+    
+    def get_thread_stats(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """One page of per-thread statistics, ordered by thread id"""
+        offset = max(0, offset)
+        ids = range(offset, min(self.config.threads, offset + max(0, limit)))
+        threads = []
+        for thread_id in ids:
+            row = self.counters.row(thread_id)
+            duty_cycle = self.duty_cycles.get(thread_id)
+            threads.append({
+                'id': thread_id,
+                'hashrate': row['hashrate'],
+                'hashrate_60s': row['hashrate_60s'],
+                'hashes': row['hashes_total'],
+                'shares': row['shares_good'],
+                'duty_cycle': duty_cycle.measured if duty_cycle else 0.0
+            })
+        return {'total': self.config.threads, 'offset': offset, 'limit': limit, 'threads': threads}
+
+# ============================================================================
+# HASH KERNEL REGISTRY
+# ============================================================================
+
+KERNEL_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kernel_benchmark_cache.json')
+KERNEL_BENCHMARK_BATCH = 64  # Nonces per hash_batch call while benchmarking
+
+# Batch kernel signature: (template, nonce_start, count, dataset) -> count * HASH_SIZE
+# contiguous bytes, hash i being the hash of nonce_start + i patched into the template
+BatchHashFn = Callable[[Any, int, int, Optional[memoryview]], bytearray]
+
+def batch_from_hash_fn(hash_fn: Callable[..., bytes]) -> BatchHashFn:
+    """Batch kernel that patches each nonce into the template and calls a per-hash kernel"""
+    def hash_batch(template, nonce_start: int, count: int, dataset: Optional[memoryview] = None) -> bytearray:
+        out = bytearray(HASH_SIZE * count)
+        patch_nonce = template.patch_nonce
+        for i in range(count):
+            offset = i * HASH_SIZE
+            out[offset:offset + HASH_SIZE] = hash_fn(patch_nonce(nonce_start + i), dataset)
+        return out
+    return hash_batch
+
+class HashKernel:
+    """A registered hash implementation for one algorithm
+
+    hash_fn hashes one input; hash_batch hashes a nonce range of a prepared job
+    template into one contiguous buffer and is what the workers call, so
+    vectorised or native backends can register their own. Without one, a
+    per-hash loop over hash_fn(input, dataset) is used. `prepare` builds a
+    template from a raw golden-vector input so verify() can check that the
+    batch path agrees with hash_fn.
+    """
+
+    def __init__(self, algorithm: str, name: str, hash_fn: Callable[[bytes], bytes],
+                 golden_vectors: List[Tuple[str, str]], worker_mode: str = "thread",
+                 description: str = "", hash_batch: Optional[BatchHashFn] = None,
+                 prepare: Optional[Callable[[bytes], Any]] = None):
+        self.algorithm = algorithm
+        self.name = name
+        self.hash_fn = hash_fn
+        self.hash_batch = hash_batch or batch_from_hash_fn(hash_fn)
+        self.prepare = prepare
+        self.golden_vectors = golden_vectors
+        self.worker_mode = worker_mode
+        self.description = description
+
+    def verify(self) -> bool:
+        """Check the implementation against the algorithm's golden vectors"""
+        try:
+            if not all(
+                self.hash_fn(bytes.fromhex(input_hex)).hex() == expected_hex
+                for input_hex, expected_hex in self.golden_vectors
+            ):
+                return False
+            if self.prepare is None:
+                return True
+            template = self.prepare(bytes.fromhex(self.golden_vectors[0][0]))
+            expected = b''.join(self.hash_fn(bytes(template.patch_nonce(nonce))) for nonce in (1, 2))
+            return bytes(self.hash_batch(template, 1, 2, None)) == expected
+        except Exception as e:
+            logger.warning(f"⚠️ Kernel {self.algorithm}/{self.name} self-test error: {e}")
+            return False
+
+def _benchmark_kernel(algorithm: str, name: str, duration: float) -> float:
+    """Hash nonce batches of a golden-vector job for `duration` seconds and return H/s
+
+    Uses hash_batch, the path workers run; kernels without a `prepare` can only
+    be driven through hash_fn.
+    """
+    kernel = KERNEL_REGISTRY.get(algorithm, name)
+    data = bytes.fromhex(kernel.golden_vectors[0][0])
+    template = kernel.prepare(data) if kernel.prepare is not None else None
+    count = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        if template is None:
+            kernel.hash_fn(data)
+            count += 1
+        else:
+            kernel.hash_batch(template, count, KERNEL_BENCHMARK_BATCH, None)
+            count += KERNEL_BENCHMARK_BATCH
+    return count / (time.perf_counter() - started)
+
+class HashKernelRegistry:
+    """Available hash kernels per algorithm, with benchmark-based auto-selection
+
+    The first selection on a host benchmarks every kernel that passes its golden
+    vectors and caches the winner keyed by a hardware fingerprint, so later
+    starts skip the benchmark.
+    """
+
+    def __init__(self, cache_path: str = KERNEL_CACHE_FILE, benchmark_seconds: float = 1.0):
+        self.kernels: Dict[str, Dict[str, HashKernel]] = {}
+        self.cache_path = cache_path
+        self.benchmark_seconds = benchmark_seconds
+        self.lock = threading.Lock()
+
+    def register(self, kernel: HashKernel):
+        """Register (or replace) a kernel implementation"""
+        self.kernels.setdefault(kernel.algorithm, {})[kernel.name] = kernel
+
+    def get(self, algorithm: str, name: str) -> HashKernel:
+        """Look up a kernel by name, falling back to the algorithm's first registration"""
+        kernels = self.kernels.get(algorithm, {})
+        if name in kernels:
+            return kernels[name]
+        if not kernels:
+            raise KeyError(f"No hash kernels registered for {algorithm}")
+        fallback = next(iter(kernels.values()))
+        logger.warning(f"⚠️ Unknown {algorithm} kernel '{name}', using '{fallback.name}'")
+        return fallback
+
+    def available(self, algorithm: str) -> List[HashKernel]:
+        """All kernels registered for an algorithm"""
+        return list(self.kernels.get(algorithm, {}).values())
+
+    def hardware_fingerprint(self, algorithm: str) -> str:
+        """Stable identifier for this host and the kernels registered for an algorithm"""
+        cpu_model = platform.processor()
+        try:
+            with open('/proc/cpuinfo') as f:
+                for line in f:
+                    if line.startswith('model name'):
+                        cpu_model = line.split(':', 1)[1].strip()
+                        break
+        except OSError:
+            pass
+
+        fingerprint = {
+            'machine': platform.machine(),
+            'cpu_model': cpu_model,
+            'cpu_count': psutil.cpu_count(),
+            'worker_cpus': detect_resource_limits().worker_cpus,
+            'python': platform.python_version(),
+            'kernels': sorted(k.name for k in self.available(algorithm))
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _load_cache(self) -> Dict:
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict):
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save kernel benchmark cache: {e}")
+
+    def benchmark(self, algorithm: str, workers: Optional[int] = None) -> Dict[str, float]:
+        """Measure aggregate H/s of every kernel that passes its golden vectors
+
+        Runs one benchmark worker per CPU the miner may use (cgroup/affinity aware).
+        """
+        workers = workers or detect_resource_limits().worker_cpus
+        duration = self.benchmark_seconds
+        results = {}
+
+        for kernel in self.available(algorithm):
+            if not kernel.verify():
+                logger.warning(f"⚠️ Kernel {algorithm}/{kernel.name} failed golden vectors, skipping")
+                continue
+
+            try:
+                if kernel.worker_mode == 'process':
+                    executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+                else:
+                    executor = ThreadPoolExecutor(workers)
+                with executor:
+                    futures = [executor.submit(_benchmark_kernel, algorithm, kernel.name, duration)
+                               for _ in range(workers)]
+                    results[kernel.name] = sum(f.result() for f in futures)
+            except Exception as e:
+                logger.warning(f"⚠️ Benchmark of {algorithm}/{kernel.name} failed: {e}")
+                continue
+
+            logger.info(f"⏱️ Kernel {algorithm}/{kernel.name}: {results[kernel.name]:.1f} H/s with {workers} workers")
+
+        return results
+
+    def select(self, algorithm: str) -> HashKernel:
+        """Return the fastest verified kernel for this host, benchmarking on first use"""
+        with self.lock:
+            fingerprint = self.hardware_fingerprint(algorithm)
+            cache = self._load_cache()
+            cached = cache.get(fingerprint, {}).get(algorithm)
+
+            if cached and cached.get('kernel') in self.kernels.get(algorithm, {}):
+                logger.info(f"🏁 Using cached {algorithm} kernel: {cached['kernel']}")
+                return self.kernels[algorithm][cached['kernel']]
+
+            candidates = self.available(algorithm)
+            if len(candidates) == 1:
+                return candidates[0]
+
+            logger.info(f"⏱️ Benchmarking {len(candidates)} {algorithm} kernels on this host...")
+            results = self.benchmark(algorithm)
+            if not results:
+                logger.warning(f"⚠️ No {algorithm} kernel passed benchmarking, using default")
+                return candidates[0]
+
+            winner = max(results, key=results.get)
+            cache.setdefault(fingerprint, {})[algorithm] = {
+                'kernel': winner,
+                'hashrates': results,
+                'benchmarked_at': time.time()
+            }
+            self._save_cache(cache)
+            logger.info(f"🏁 Selected {algorithm} kernel: {winner}")
+            return self.kernels[algorithm][winner]
+
+KERNEL_REGISTRY = HashKernelRegistry()
+KERNEL_REGISTRY.register(HashKernel(
+    'RandomX', 'python', randomx_intensive_hash, RANDOMX_GOLDEN_VECTORS,
+    description="Lookup-table kernel on mining threads",
+    hash_batch=randomx_hash_batch, prepare=PreparedJob.from_input
+))
+KERNEL_REGISTRY.register(HashKernel(
+    'RandomX', 'python-process', randomx_intensive_hash, RANDOMX_GOLDEN_VECTORS,
+    worker_mode='process', description="Lookup-table kernel on one process per worker",
+    hash_batch=randomx_hash_batch, prepare=PreparedJob.from_input
+))
+KERNEL_REGISTRY.register(HashKernel(
+    'Scrypt', 'openssl-midstate', scrypt_header_hash, SCRYPT_GOLDEN_VECTORS,
+    description="OpenSSL scrypt keyed from a cached SHA-256 header midstate",
+    hash_batch=scrypt_hash_batch, prepare=ScryptHeaderTemplate.from_input
+))
+
+# ============================================================================
+# STATS SNAPSHOT PUBLISHER
+# ============================================================================
+
+class StatsPublisher:
+    """Builds the miner's stats once per interval for every consumer
+
+    A background thread calls `source` every `interval` seconds and publishes
+    the result as a read-only mapping tagged with a sequence number. The
+    (sequence, stats) pair is replaced in a single assignment, so readers take
+    no lock and do no recomputation; a reader holding a sequence number can
+    skip snapshots it has already seen. The mapping is only read-only at the
+    top level: nested values (thread_stats, pressure_governor, ...) are shared
+    by every reader and must not be modified.
+    """
+
+    def __init__(self, source: Callable[[], Dict[str, Any]], interval: float = 1.0,
+                 segment: Optional['StatsSegment'] = None):
+        self.source = source
+        self.interval = max(0.1, interval)
+        self.segment = segment  # Also written to shared memory for other processes
+        self.snapshot: Tuple[int, Mapping[str, Any]] = (0, MappingProxyType({}))
+        self._stop = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread:
+            return
+        self._stop.clear()
+        self.publish()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="stats-publisher")
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def publish(self):
+        """Build and publish a new snapshot now"""
+        sequence = self.snapshot[0] + 1
+        stats = dict(self.source())
+        stats['sequence'] = sequence
+        stats['published_at'] = time.time()
+        self.snapshot = (sequence, MappingProxyType(stats))
+        if self.segment:
+            self.segment.publish(stats)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.publish()
+            except Exception as e:
+                logger.debug(f"Stats snapshot failed: {e}")
+
+    def get(self, since: Optional[int] = None) -> Optional[Mapping[str, Any]]:
+        """Latest snapshot, or None when its sequence number equals `since`"""
+        sequence, stats = self.snapshot
+        if since is not None and sequence == since:
+            return None
+        return stats
+
+# ============================================================================
+# SHARED-MEMORY STATS SEGMENT
+# ============================================================================
+
+STATS_SEGMENT_PATH = os.path.join(SHM_DIR, 'cryptominer-stats')
+
+class StatsSegment:
+    """Fixed-layout stats snapshot in shared memory for other local processes
+
+    Layout: a header of magic, layout version, payload size, an 8-byte write
+    counter (odd while a write is in progress), the publish time and the
+    publisher's PID, followed by the FIELDS packed at fixed offsets. Readers map the segment
+    once, read-only, and decode a snapshot without any syscalls, retrying until
+    they observe the same even sequence before and after copying it. Any change
+    to FIELDS must bump VERSION. The segment is world-readable (MODE) but only
+    the publisher can write it, and a publisher never takes over an existing
+    segment: creation fails with FileExistsError while another one is there.
+    A segment whose publisher has exited without closing it (a crash or an
+    OOM kill) can be removed with remove_stale.
+    """
+
+    MAGIC = b'CMST'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHQdI4x')
+    FIELDS = (
+        ('sequence', 'Q'), ('hashrate', 'd'), ('hashrate_10s', 'd'), ('hashrate_60s', 'd'), ('hashrate_15m', 'd'),
+        ('hashes_total', 'Q'), ('shares_good', 'Q'), ('shares_rejected', 'Q'),
+        ('shares_accepted', 'Q'), ('job_generation', 'Q'),
+        ('cpu_usage', 'd'), ('memory_usage', 'd'), ('temperature', 'd'), ('uptime', 'd'),
+        ('threads', 'I'), ('intensity', 'i'), ('is_running', '?'), ('pool_connected', '?'),
+        ('algorithm', '16s'), ('coin', '16s')
+    )
+    PAYLOAD = struct.Struct('<' + ''.join(code for _, code in FIELDS))
+    MODE = 0o644
+
+    def __init__(self, path: str = STATS_SEGMENT_PATH, create: bool = False):
+        size = self.HEADER.size + self.PAYLOAD.size
+        if create:
+            self.shm = SharedRegion(name=path, size=size, create=True, mode=self.MODE)
+            self.HEADER.pack_into(self.shm.buf, 0, self.MAGIC, self.VERSION, self.PAYLOAD.size, 0, 0.0,
+                                  os.getpid())
+        else:
+            self.shm = SharedRegion(name=path, readonly=True)
+            header = self.HEADER.unpack_from(self.shm.buf, 0)[:3] if self.shm.size >= size else None
+            if header != (self.MAGIC, self.VERSION, self.PAYLOAD.size):
+                self.shm.close()
+                raise ValueError(f"{path} is not a version {self.VERSION} stats segment")
+        self.name = self.shm.name
+        self.owner = create
+        self._sequence = 0
+
+    @classmethod
+    def remove_stale(cls, path: str = STATS_SEGMENT_PATH) -> Optional[int]:
+        """Remove the segment at path if its publisher process is gone
+
+        Returns the dead publisher's PID, or None when nothing was removed:
+        no segment, a live publisher, or a file that is not a stats segment.
+        """
+        try:
+            segment = cls(path)
+        except (OSError, ValueError):
+            return None
+        pid = segment.publisher_pid()
+        segment.close()
+        if not pid or process_alive(pid):
+            return None
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        return pid
+
+    def publisher_pid(self) -> int:
+        """PID of the process that created the segment"""
+        return self.HEADER.unpack_from(self.shm.buf, 0)[5]
+
+    def publish(self, stats: Mapping[str, Any]):
+        """Write a stats snapshot for every attached reader"""
+        values = []
+        for name, code in self.FIELDS:
+            value = stats.get(name)
+            if code.endswith('s'):
+                value = str(value or '').encode('utf-8')
+            elif code == '?':
+                value = bool(value)
+            else:
+                value = (float if code == 'd' else int)(value or 0)
+            values.append(value)
+        payload = self.PAYLOAD.pack(*values)
+
+        buf = self.shm.buf
+        self._sequence += 1
+        struct.pack_into('<Q', buf, 8, self._sequence)
+        buf[self.HEADER.size:self.HEADER.size + len(payload)] = payload
+        struct.pack_into('<d', buf, 16, stats.get('published_at') or time.time())
+        self._sequence += 1
+        struct.pack_into('<Q', buf, 8, self._sequence)
+
+    def write_count(self) -> int:
+        """Current write counter (cheap check for new data)"""
+        return struct.unpack_from('<Q', self.shm.buf, 8)[0]
+
+    def read(self) -> Dict[str, Any]:
+        """Read a consistent snapshot, including the publisher's 'sequence' and 'published_at'"""
+        buf = self.shm.buf
+        while True:
+            sequence, published_at = self.HEADER.unpack_from(buf, 0)[3:5]
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            payload = bytes(buf[self.HEADER.size:self.HEADER.size + self.PAYLOAD.size])
+            if struct.unpack_from('<Q', buf, 8)[0] == sequence:
+                break
+
+        stats = {'published_at': published_at}
+        for (name, code), value in zip(self.FIELDS, self.PAYLOAD.unpack(payload)):
+            stats[name] = value.rstrip(b'\0').decode('utf-8') if code.endswith('s') else value
+        return stats
+
+    def close(self):
+        """Detach from (and, for the owner, remove) the shared segment"""
+        if self.owner:
+            self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
 
 # ============================================================================
 # UNIFIED MINING ENGINE
@@ -1666,14 +4578,23 @@ class ScryptMiner:
 class UnifiedMiningEngine:
     """Unified mining engine supporting multiple algorithms"""
     
-    def __init__(self):
+    def __init__(self, stats_interval: float = 1.0, stats_segment: Optional[str] = STATS_SEGMENT_PATH):
         self.current_miner = None
         self.current_algorithm = None
         self.current_config = None
+        self.stats_interval = stats_interval  # Seconds between published stats snapshots
+        self.stats_segment_path = stats_segment  # Shared-memory copy for local readers, None to disable
+        self.stats_publisher: Optional[StatsPublisher] = None
     
     def start_mining(self, coin: str, wallet: str, pool: str, password: str = "x", 
-                     intensity: int = 80, threads: int = 0) -> bool:
-        """Start mining with algorithm auto-detection"""
+                     intensity: int = 80, threads: int = 0, worker_mode: Optional[str] = None,
+                     cpu_priority: int = 0, psi_governor: bool = False,
+                     metrics_interval: float = 1.0) -> bool:
+        """Start mining with algorithm auto-detection
+
+        The hash kernel (and, unless worker_mode is given, the worker mode) comes
+        from KERNEL_REGISTRY's cached benchmark winner for this host.
+        """
         
         # Algorithm mapping
         algorithm_map = {
@@ -1687,13 +4608,26 @@ class UnifiedMiningEngine:
         logger.info(f"🔍 Detected algorithm: {algorithm} for coin {coin}")
         
         try:
+            stale = SharedRegion.remove_stale()
+            if stale:
+                logger.info(f"🧹 Removed {len(stale)} shared memory regions left by exited miners")
+            kernel = KERNEL_REGISTRY.select(algorithm)
+            
             if algorithm == 'RandomX':
+                if worker_mode in (None, 'auto'):
+                    worker_mode = kernel.worker_mode
                 config = RandomXConfig(
                     coin=coin,
                     pool_url=pool,
                     wallet_address=wallet,
                     password=password,
-                    threads=threads
+                    threads=threads,
+                    worker_mode=worker_mode,
+                    intensity=intensity,
+                    cpu_priority=cpu_priority,
+                    psi_governor=psi_governor,
+                    metrics_interval=metrics_interval,
+                    kernel=kernel.name
                 )
                 self.current_miner = RandomXMiner(config)
                 
@@ -1704,7 +4638,11 @@ class UnifiedMiningEngine:
                     wallet_address=wallet,
                     password=password,
                     threads=threads,
-                    intensity=intensity
+                    intensity=intensity,
+                    cpu_priority=cpu_priority,
+                    psi_governor=psi_governor,
+                    metrics_interval=metrics_interval,
+                    kernel=kernel.name
                 )
                 self.current_miner = ScryptMiner(config)
             
@@ -1715,32 +4653,95 @@ class UnifiedMiningEngine:
             self.current_algorithm = algorithm
             self.current_config = config
             
-            return self.current_miner.start()
+            if not self.current_miner.start():
+                return False
+            self.stats_publisher = StatsPublisher(self.current_miner.get_stats, self.stats_interval,
+                                                  self._open_stats_segment())
+            self.stats_publisher.start()
+            return True
             
         except Exception as e:
             logger.error(f"❌ Failed to start {algorithm} mining: {e}")
             return False
     
+    def _open_stats_segment(self) -> Optional[StatsSegment]:
+        if not self.stats_segment_path:
+            return None
+        try:
+            try:
+                segment = StatsSegment(self.stats_segment_path, create=True)
+            except FileExistsError:
+                stale_pid = StatsSegment.remove_stale(self.stats_segment_path)
+                if stale_pid is None:
+                    raise
+                logger.info(f"ℹ️ Replacing stats segment {self.stats_segment_path} left by exited process {stale_pid}")
+                segment = StatsSegment(self.stats_segment_path, create=True)
+            logger.info(f"📤 Publishing stats to shared memory at {segment.name}")
+            return segment
+        except FileExistsError:
+            logger.warning(f"⚠️ Stats segment {self.stats_segment_path} already exists - another miner "
+                           f"is publishing there")
+            return None
+        except OSError as e:
+            logger.warning(f"⚠️ Stats segment {self.stats_segment_path} unavailable: {e}")
+            return None
+    
     def stop_mining(self):
         """Stop current mining operation"""
+        if self.stats_publisher:
+            self.stats_publisher.stop()
+            if self.stats_publisher.segment:
+                self.stats_publisher.segment.close()
+            self.stats_publisher = None
         if self.current_miner:
             self.current_miner.stop()
             self.current_miner = None
             self.current_algorithm = None
             self.current_config = None
     
+    def set_cpu_priority(self, level: int):
+        """Change the scheduling priority (-1..5) of the running miner's workers"""
+        if self.current_miner:
+            self.current_miner.set_cpu_priority(level)
+    
+    def set_intensity(self, intensity: int):
+        """Change the running miner's intensity (1-100%) without restarting workers"""
+        if self.current_miner:
+            self.current_miner.set_intensity(intensity)
+    
     def get_stats(self) -> Dict[str, Any]:
-        """Get current mining statistics"""
+        """Latest published mining statistics
+
+        Returns a copy of the snapshot built by the stats publisher, whose
+        'sequence' increases with every publish. The copy is shallow: nested
+        values are shared with other readers and must not be modified.
+        """
+        publisher = self.stats_publisher
+        if publisher:
+            return dict(publisher.get())
         if self.current_miner:
             return self.current_miner.get_stats()
-        else:
-            return {
-                'algorithm': None,
-                'coin': None,
-                'hashrate': 0,
-                'threads': 0,
-                'is_running': False
-            }
+        return {
+            'algorithm': None,
+            'coin': None,
+            'hashrate': 0,
+            'threads': 0,
+            'is_running': False
+        }
+    
+    def get_stats_if_changed(self, since: int) -> Optional[Dict[str, Any]]:
+        """Like get_stats, but None while the published 'sequence' still equals `since`"""
+        publisher = self.stats_publisher
+        if publisher:
+            stats = publisher.get(since)
+            return dict(stats) if stats is not None else None
+        return self.get_stats()
+    
+    def get_thread_stats(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """One page of the running miner's per-worker statistics"""
+        if self.current_miner:
+            return self.current_miner.get_thread_stats(offset, limit)
+        return {'total': 0, 'offset': offset, 'limit': limit, 'threads': []}
     
     def is_mining(self) -> bool:
         """Check if mining is active"""
@@ -1753,6 +4754,30 @@ __all__ = [
     'RandomXConfig',
     'ScryptMiner',
     'ScryptConfig', 
+    'ScryptHeaderTemplate',
     'MiningStats',
-    'StratumConnection'
+    'StratumConnection',
+    'PreparedJob',
+    'MiningJob',
+    'NonceAllocator',
+    'WorkerCounters',
+    'HashrateWindows',
+    'SystemMetricsSampler',
+    'StatsPublisher',
+    'StatsSegment',
+    'SeedCacheManager',
+    'AffinityPlanner',
+    'apply_thread_priority',
+    'priority_nice',
+    'DutyCycleController',
+    'worker_cpu_share',
+    'PressureGovernor',
+    'ResourceLimits',
+    'detect_resource_limits',
+    'target_to_threshold',
+    'find_shares',
+    'randomx_intensive_hash',
+    'HashKernel',
+    'HashKernelRegistry',
+    'KERNEL_REGISTRY'
 ]
@@ -0,0 +1,38 @@
+"""Shared fixtures: a pool proxy fed jobs without a pool, and workers reading from it"""
+
+import pytest
+
+from mining_engine import NonceAllocator, PoolConnectionProxy, RandomXConfig, RandomXMinerThread
+
+POOL_URL = 'stratum+tcp://127.0.0.1:1'
+
+def _publish(proxy, job):
+    """Store and publish a job the way the proxy handles mining.notify"""
+    with proxy.job_lock:
+        proxy.current_job = dict(job)
+        proxy._apply_difficulty(proxy.current_job)
+        proxy._publish_current_job()
+
+@pytest.fixture
+def publish_job():
+    """publish_job(proxy, job) delivers a new job to a proxy"""
+    return _publish
+
+@pytest.fixture
+def make_proxy():
+    """make_proxy(job=None) returns an unconnected proxy, optionally holding a job"""
+    def make(job=None):
+        proxy = PoolConnectionProxy(POOL_URL, 'wallet')
+        if job is not None:
+            _publish(proxy, job)
+        return proxy
+    return make
+
+@pytest.fixture
+def make_worker():
+    """make_worker(proxy, allocator=None, worker_id=0) returns an unstarted RandomX worker"""
+    config = RandomXConfig(pool_url=POOL_URL, wallet_address='wallet', kernel='python')
+
+    def make(proxy, allocator=None, worker_id=0):
+        return RandomXMinerThread(worker_id, config, proxy, nonce_allocator=allocator or NonceAllocator(1000))
+    return make
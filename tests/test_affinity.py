@@ -0,0 +1,53 @@
+"""Tests for AffinityPlanner against a fake sysfs CPU topology"""
+
+import pytest
+
+import mining_engine
+from mining_engine import AffinityPlanner
+
+MB = 1024 * 1024
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text + '\n')
+
+@pytest.fixture
+def sysfs(tmp_path, monkeypatch):
+    """Two L3 slices of 4 MB, each with two cores of two SMT siblings
+
+    CPUs 0-3 share one L3 and 4-7 the other; CPU n + 2 is CPU n's sibling.
+    """
+    for cpu in range(8):
+        base = tmp_path / f'cpu{cpu}'
+        _write(base / 'topology' / 'physical_package_id', '0')
+        _write(base / 'topology' / 'core_id', str(cpu // 4 * 2 + cpu % 2))
+        _write(base / 'cache' / 'index2' / 'level', '2')
+        _write(base / 'cache' / 'index3' / 'level', '3')
+        _write(base / 'cache' / 'index3' / 'size', '4096K')
+        _write(base / 'cache' / 'index3' / 'shared_cpu_list', '0-3' if cpu < 4 else '4-7')
+    monkeypatch.setattr(mining_engine.os, 'sched_getaffinity', lambda pid: set(range(8)), raising=False)
+    return str(tmp_path)
+
+def test_spreads_over_l3_slices_and_cores_first(sysfs):
+    plan = AffinityPlanner(1, sysfs_dir=sysfs).plan(8)
+    assert [entry['cpu'] for entry in plan] == [0, 4, 1, 5, 2, 6, 3, 7]
+    assert [entry['l3'] for entry in plan[:2]] == [0, 4]
+    assert plan[0]['core'] == '0:0' and plan[2]['core'] == '0:1'
+    assert not any(entry['over_l3_capacity'] for entry in plan)
+
+def test_l3_capacity_limits_workers_per_slice(sysfs):
+    # 4 MB slices hold two 2 MB scratchpads each
+    plan = AffinityPlanner(2 * MB, sysfs_dir=sysfs).plan(6)
+    assert [entry['cpu'] for entry in plan] == [0, 4, 1, 5, 2, 6]
+    assert [entry['over_l3_capacity'] for entry in plan] == [False] * 4 + [True] * 2
+
+def test_workers_beyond_allowed_cpus_stay_unpinned(sysfs):
+    plan = AffinityPlanner(1, sysfs_dir=sysfs).plan(10)
+    assert len({entry['cpu'] for entry in plan[:8]}) == 8
+    assert [(entry['worker'], entry['cpu'], entry['core']) for entry in plan[8:]] == [(8, None, None), (9, None, None)]
+
+def test_missing_topology_uses_allowed_cpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(mining_engine.os, 'sched_getaffinity', lambda pid: {2, 3}, raising=False)
+    plan = AffinityPlanner(sysfs_dir=str(tmp_path)).plan(3)
+    assert [entry['cpu'] for entry in plan] == [2, 3, None]
+    assert plan[0]['l3'] is None
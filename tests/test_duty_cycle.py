@@ -0,0 +1,98 @@
+"""Tests for DutyCycleController driven by a simulated thread CPU clock"""
+
+import pytest
+
+import mining_engine
+from mining_engine import DutyCycleController, worker_cpu_share
+
+class FakeClock:
+    """Stands in for the time module: thread CPU time, wall time and sleep"""
+
+    def __init__(self, oversleep: float = 0.0):
+        self.cpu = 0.0
+        self.wall = 1000.0
+        self.oversleep = oversleep  # Fraction every sleep runs long by
+
+    def thread_time(self):
+        return self.cpu
+
+    def monotonic(self):
+        return self.wall
+
+    def time(self):
+        return self.wall
+
+    def sleep(self, seconds):
+        self.wall += seconds * (1 + self.oversleep)
+
+    def work(self, seconds, cpu_fraction=1.0):
+        """Run a batch for `seconds` of wall time, getting cpu_fraction of a CPU"""
+        self.wall += seconds
+        self.cpu += seconds * cpu_fraction
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(mining_engine, 'time', fake)
+    return fake
+
+def _run(clock, controller, batch, seconds, cpu_fraction=1.0, warmup=20.0):
+    """Alternate batches and throttling; return the CPU fraction after warmup"""
+    controller.reset()
+    end = clock.wall + seconds
+    start_cpu = start_wall = None
+    while clock.wall < end:
+        if start_cpu is None and clock.wall >= end - seconds + warmup:
+            start_cpu, start_wall = clock.cpu, clock.wall
+        clock.work(batch, cpu_fraction)
+        controller.throttle()
+    return (clock.cpu - start_cpu) / (clock.wall - start_wall)
+
+@pytest.mark.parametrize('intensity', [20, 50, 80])
+@pytest.mark.parametrize('batch', [0.005, 0.3, 1.0])
+def test_holds_intensity(clock, intensity, batch):
+    controller = DutyCycleController(intensity)
+    share = _run(clock, controller, batch, 200.0)
+    assert share * 100 == pytest.approx(intensity, abs=1.0)
+    assert controller.measured == pytest.approx(intensity, abs=2.0 + 100 * batch / controller.MEASURE_INTERVAL)
+
+def test_full_intensity_never_sleeps(clock):
+    controller = DutyCycleController(100)
+    assert _run(clock, controller, 0.1, 30.0) == pytest.approx(1.0)
+    assert controller.measured == pytest.approx(100.0)
+
+def test_sleep_overshoot_is_absorbed(clock):
+    clock.oversleep = 0.2
+    controller = DutyCycleController(50)
+    assert _run(clock, controller, 0.05, 100.0) * 100 == pytest.approx(50, abs=1.0)
+
+def test_cpu_share_counts_contention_as_busy(clock):
+    # Four workers on one CPU: each only gets a quarter of the CPU while running
+    controller = DutyCycleController(50, cpu_share=worker_cpu_share(4, 1.0))
+    share = _run(clock, controller, 0.1, 200.0, cpu_fraction=0.25)
+    assert share * 100 == pytest.approx(12.5, abs=0.5)
+    assert controller.measured == pytest.approx(50, abs=2.0)
+
+def test_measured_reports_real_cpu_use(clock):
+    # The thread gets less CPU than the controller assumes; measured must show it
+    controller = DutyCycleController(100, cpu_share=1.0)
+    _run(clock, controller, 0.1, 30.0, cpu_fraction=0.6)
+    assert controller.measured == pytest.approx(60, abs=1.0)
+
+def test_scale_multiplies_target(clock):
+    controller = DutyCycleController(80, scale=lambda: 0.5)
+    assert controller.target() == 40.0
+    assert _run(clock, controller, 0.05, 100.0) * 100 == pytest.approx(40, abs=1.0)
+
+def test_set_intensity_restarts_window(clock):
+    controller = DutyCycleController(20)
+    _run(clock, controller, 0.05, 50.0)
+    controller.set_intensity(70)
+    assert controller.throttle() == 0.0
+    assert _run(clock, controller, 0.05, 100.0) * 100 == pytest.approx(70, abs=1.0)
+
+def test_stop_cuts_idle_short(clock):
+    controller = DutyCycleController(10)
+    controller.reset()
+    clock.work(1.0)
+    assert controller.throttle(lambda: False) == 0.0
@@ -0,0 +1,52 @@
+"""Tests for rolling hashrate windows over a ring of per-second samples"""
+
+import pytest
+
+from mining_engine import HashrateWindows
+
+def _mine(windows, start, seconds, rate, total=0):
+    """Record one sample per second at a steady rate; returns the new total"""
+    for second in range(1, seconds + 1):
+        total += rate
+        windows.record(total, start + second)
+    return total
+
+def test_steady_rate_in_every_window():
+    windows = HashrateWindows(now=0.0)
+    _mine(windows, 0.0, 1000, 500)
+    assert windows.rates() == pytest.approx((500.0, 500.0, 500.0))
+
+def test_short_window_follows_a_rate_change():
+    windows = HashrateWindows(now=0.0)
+    total = _mine(windows, 0.0, 900, 100)
+    _mine(windows, 900.0, 30, 400, total)
+    rate_10s, rate_60s, rate_15m = windows.rates()
+    assert rate_10s == pytest.approx(400.0)
+    assert rate_60s == pytest.approx(250.0)
+    assert rate_15m == pytest.approx((870 * 100 + 30 * 400) / 900)
+
+def test_unfilled_window_spans_back_to_the_first_sample():
+    windows = HashrateWindows(now=0.0)
+    _mine(windows, 0.0, 5, 200)
+    assert windows.rates() == pytest.approx((200.0, 200.0, 200.0))
+
+def test_gap_without_samples_counts_as_idle():
+    windows = HashrateWindows(now=0.0)
+    total = _mine(windows, 0.0, 100, 100)
+    windows.record(total, 130.0)  # No batch finished for 30 seconds
+    assert windows.rate(10) == 0.0
+    assert windows.rate(60) == pytest.approx(30 * 100 / 60)
+
+def test_gap_longer_than_the_ring_is_handled():
+    windows = HashrateWindows(now=0.0)
+    total = _mine(windows, 0.0, 10, 100)
+    _mine(windows, 5000.0, 10, 300, total)
+    assert windows.rates() == pytest.approx((300.0, 10 * 300 / 60, 10 * 300 / 900))
+
+def test_reset_starts_from_zero():
+    windows = HashrateWindows(now=0.0)
+    _mine(windows, 0.0, 20, 100)
+    windows.reset(now=20.0)
+    assert windows.total == 0 and windows.rates() == (0.0, 0.0, 0.0)
+    _mine(windows, 20.0, 5, 50)
+    assert windows.rate(10) == pytest.approx(50.0)
@@ -0,0 +1,107 @@
+"""Tests for generation-counted MiningJob publishing and worker job switching"""
+
+import pytest
+
+from mining_engine import JobBroadcast, MiningJob, ProcessProxyClient, target_to_threshold
+
+# ============================================================================
+# MINING JOB
+# ============================================================================
+
+def test_mining_job_is_immutable():
+    fields = {'job_id': 'J1', 'blob': '00' * 76}
+    job = MiningJob(fields, 3)
+    fields['blob'] = 'ff'
+    assert job['blob'] == '00' * 76
+    with pytest.raises(AttributeError):
+        job.generation = 4
+    with pytest.raises(TypeError):
+        job._fields['job_id'] = 'J2'
+    assert job.to_dict() == {'job_id': 'J1', 'blob': '00' * 76, 'generation': 3, 'work_generation': 3}
+
+def test_each_publish_is_a_new_generation(make_proxy, publish_job):
+    proxy = make_proxy({'job_id': 'J1', 'blob': '11' * 76})
+    first = proxy.job
+    publish_job(proxy, {'job_id': 'J2', 'blob': '22' * 76})
+    assert (first.generation, proxy.job.generation) == (1, 2)
+    assert proxy.job_generation == proxy.job.generation
+    assert first.job_id == 'J1'  # Readers holding the old job keep a consistent view
+
+# ============================================================================
+# DIFFICULTY UPDATES
+# ============================================================================
+
+def test_set_difficulty_republishes_when_threshold_changes(make_proxy):
+    proxy = make_proxy({'job_id': 'J1', 'blob': '11' * 76})
+    proxy._set_difficulty(5000)
+    assert proxy.job_generation == 2
+    assert proxy.job['difficulty'] == 5000
+    assert proxy.job.work_generation == 1
+
+    proxy._set_difficulty(5000)
+    assert proxy.job_generation == 2
+
+def test_set_difficulty_ignored_for_jobs_with_explicit_target(make_proxy):
+    proxy = make_proxy({'job_id': 'J1', 'blob': '11' * 76, 'target': 'b88d0600'})
+    proxy._set_difficulty(5000)
+    assert proxy.job_generation == 1
+    assert 'difficulty' not in proxy.job
+
+def test_set_difficulty_without_job(make_proxy, publish_job):
+    proxy = make_proxy()
+    proxy._set_difficulty(5000)
+    assert proxy.job is None and proxy.job_generation == 0
+    publish_job(proxy, {'job_id': 'J1', 'blob': '11' * 76})
+    assert proxy.job['difficulty'] == 5000
+
+# ============================================================================
+# WORKER JOB SWITCHING
+# ============================================================================
+
+def test_worker_switches_to_new_generation(make_proxy, publish_job, make_worker):
+    proxy = make_proxy({'job_id': 'J1', 'blob': '11' * 76})
+    worker = make_worker(proxy)
+    assert worker._job_changed()
+    worker._poll_job()
+    assert not worker._job_changed()
+    assert worker.current_job.job_id == 'J1' and worker.job_switches == 1
+
+    publish_job(proxy, {'job_id': 'J2', 'blob': '22' * 76})
+    assert worker._job_changed()
+    worker._poll_job()
+    assert worker.current_job.job_id == 'J2' and worker.job_switches == 2
+    assert (worker.nonce, worker.nonce_end) == (0, 0)  # Next batch reserves a range of J2
+
+def test_threshold_update_is_not_a_job_switch(make_proxy, make_worker):
+    proxy = make_proxy({'job_id': 'J1', 'blob': '11' * 76})
+    worker = make_worker(proxy)
+    worker._poll_job()
+    assert worker._next_nonce_range()
+    worker.nonce += 100
+    position = (worker.nonce, worker.nonce_end)
+
+    proxy._set_difficulty(5000)
+    worker._poll_job()
+    assert worker.current_job.generation == 2
+    assert worker.prepared_job.threshold == target_to_threshold(difficulty=5000)
+    assert (worker.nonce, worker.nonce_end) == position
+    assert worker.job_switches == 1
+
+def test_process_broadcast_round_trip(make_proxy):
+    broadcast = JobBroadcast(create=True)
+    try:
+        proxy = make_proxy({'job_id': 'J1', 'blob': '11' * 76})
+        proxy._set_difficulty(5000)
+        broadcast.publish(proxy.job.to_dict(), True)
+
+        reader = JobBroadcast(broadcast.name)
+        try:
+            client = ProcessProxyClient(reader, None, 0)
+            assert client.connected
+            job = client.get_job()
+            assert (job.generation, job.work_generation) == (2, 1)
+            assert job['difficulty'] == 5000
+        finally:
+            reader.close()
+    finally:
+        broadcast.close()
@@ -0,0 +1,48 @@
+"""Tests for HashKernelRegistry selection and its benchmark cache"""
+
+import json
+
+import pytest
+
+from mining_engine import HashKernel, HashKernelRegistry
+
+def _registry(cache_path, rates):
+    """A registry of two kernels whose benchmark returns `rates` and counts its runs"""
+    registry = HashKernelRegistry(cache_path=str(cache_path))
+    for name in rates:
+        registry.register(HashKernel('Test', name, lambda data: data, []))
+    registry.runs = 0
+
+    def benchmark(algorithm, workers=None):
+        registry.runs += 1
+        return dict(rates)
+    registry.benchmark = benchmark
+    return registry
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / 'kernel_benchmark_cache.json'
+
+def test_winner_is_cached_under_the_fingerprint(cache_path):
+    registry = _registry(cache_path, {'slow': 10.0, 'fast': 30.0})
+    assert registry.select('Test').name == 'fast'
+    assert registry.runs == 1
+
+    entry = json.loads(cache_path.read_text())[registry.hardware_fingerprint('Test')]['Test']
+    assert entry['kernel'] == 'fast'
+    assert entry['hashrates'] == {'slow': 10.0, 'fast': 30.0}
+
+def test_matching_fingerprint_reuses_the_cache(cache_path):
+    _registry(cache_path, {'slow': 10.0, 'fast': 30.0}).select('Test')
+
+    restarted = _registry(cache_path, {'slow': 50.0, 'fast': 30.0})
+    assert restarted.select('Test').name == 'fast'
+    assert restarted.runs == 0
+
+def test_changed_fingerprint_benchmarks_again(cache_path):
+    _registry(cache_path, {'slow': 10.0, 'fast': 30.0}).select('Test')
+
+    upgraded = _registry(cache_path, {'slow': 10.0, 'fast': 30.0, 'native': 90.0})
+    assert upgraded.select('Test').name == 'native'
+    assert upgraded.runs == 1
+    assert len(json.loads(cache_path.read_text())) == 2
@@ -0,0 +1,104 @@
+"""Tests for NonceAllocator and per-job nonce ranges across job republishes"""
+
+import threading
+
+from mining_engine import MiningJob, NonceAllocator
+
+def _assert_disjoint(ranges):
+    ranges = sorted(ranges)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end <= start
+
+def test_nonce_ranges_disjoint_across_generations():
+    allocator = NonceAllocator(range_size=100)
+    ranges = {1: [], 2: []}
+    # A new job arrives while workers still hash the previous one
+    for _ in range(5):
+        ranges[1].append(allocator.allocate(1))
+    for _ in range(20):
+        ranges[2].append(allocator.allocate(2))
+        ranges[1].append(allocator.allocate(1))
+
+    for generation, allocated in ranges.items():
+        assert all(end - start == 100 for start, end in allocated)
+        _assert_disjoint(allocated)
+    assert allocator.get_stats()['generations'] == {1: 2500, 2: 2000}
+
+    # A third generation retires the oldest; its stragglers get no more work
+    assert allocator.allocate(3) == (0, 100)
+    assert allocator.allocate(1) is None
+    _assert_disjoint(ranges[2] + [allocator.allocate(2)])
+
+def test_nonce_ranges_disjoint_across_threads():
+    allocator = NonceAllocator(range_size=10)
+    results = {generation: [] for generation in (1, 2)}
+    lock = threading.Lock()
+
+    def worker(generation):
+        for _ in range(200):
+            nonce_range = allocator.allocate(generation)
+            with lock:
+                results[generation].append(nonce_range)
+
+    threads = [threading.Thread(target=worker, args=(i % 2 + 1,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for allocated in results.values():
+        assert len(allocated) == 800
+        _assert_disjoint(allocated)
+
+def test_nonce_space_exhaustion():
+    allocator = NonceAllocator(range_size=NonceAllocator.NONCE_SPACE // 2)
+    assert allocator.allocate(1) == (0, NonceAllocator.NONCE_SPACE // 2)
+    assert allocator.allocate(1) == (NonceAllocator.NONCE_SPACE // 2, NonceAllocator.NONCE_SPACE)
+    assert allocator.allocate(1) is None
+    assert allocator.get_stats()['exhaustions'] == 1
+
+# ============================================================================
+# JOB IDENTITY
+# ============================================================================
+
+JOB = {'job_id': 'J1', 'blob': '11' * 76}
+
+def test_republished_job_keeps_its_work_generation(make_proxy, publish_job):
+    proxy = make_proxy(JOB)
+    first = proxy.job
+    proxy._set_difficulty(5000)
+    assert proxy.job.generation == first.generation + 1
+    assert proxy.job.work_generation == first.work_generation
+
+    publish_job(proxy, {'job_id': 'J2', 'blob': '22' * 76})
+    assert proxy.job.work_generation == proxy.job.generation
+
+    # Worker processes rebuild jobs from the broadcast dict
+    copy = MiningJob(proxy.job.to_dict(), proxy.job.generation, proxy.job.to_dict()['work_generation'])
+    assert copy.work_generation == proxy.job.work_generation
+
+def test_difficulty_republish_does_not_restart_nonces(make_proxy):
+    allocator = NonceAllocator(range_size=1000)
+    proxy = make_proxy(JOB)
+    ranges = [allocator.allocate(proxy.job.work_generation) for _ in range(2)]
+    proxy._set_difficulty(5000)
+    ranges.append(allocator.allocate(proxy.job.work_generation))
+    assert ranges == [(0, 1000), (1000, 2000), (2000, 3000)]
+
+def test_worker_continues_nonce_range_after_republish(make_proxy, make_worker):
+    proxy = make_proxy(JOB)
+    allocator = NonceAllocator(range_size=1000)
+    workers = [make_worker(proxy, allocator, worker_id=i) for i in range(2)]
+
+    ranges = []
+    for worker in workers:
+        worker._poll_job()
+        assert worker._next_nonce_range()
+        ranges.append((worker.nonce, worker.nonce_end))
+    proxy._set_difficulty(5000)
+    for worker in workers:
+        assert worker._job_changed()
+        worker._poll_job()
+        assert worker._next_nonce_range()
+        ranges.append((worker.nonce, worker.nonce_end))
+    _assert_disjoint(ranges)
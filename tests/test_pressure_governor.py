@@ -0,0 +1,93 @@
+"""Tests for PressureGovernor driven by synthetic PSI and schedstat files"""
+
+import pytest
+
+from mining_engine import PressureGovernor, read_pressure_total, read_run_delay
+
+PID = 4242
+
+class FakeHost:
+    """A PSI file and one miner process's schedstat, both under tmp_path"""
+
+    def __init__(self, root):
+        self.psi = root / 'pressure' / 'cpu'
+        self.psi.parent.mkdir()
+        self.proc = root / 'proc'
+        self.task = self.proc / str(PID) / 'task' / str(PID)
+        self.task.mkdir(parents=True)
+        self.stall_us = 0
+        self.own_wait_us = 0
+        self.write()
+
+    def write(self):
+        self.psi.write_text(f"some avg10=0.00 avg60=0.00 avg300=0.00 total={self.stall_us}\n"
+                            f"full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+        self.task.joinpath('schedstat').write_text(f"123456 {self.own_wait_us * 1000} 7\n")
+
+    def advance(self, stall_us, own_wait_us=0):
+        self.stall_us += stall_us
+        self.own_wait_us += own_wait_us
+        self.write()
+
+@pytest.fixture
+def host(tmp_path):
+    return FakeHost(tmp_path)
+
+@pytest.fixture
+def governor(host):
+    governor = PressureGovernor(sources={'system': str(host.psi)}, proc_dir=str(host.proc))
+    governor.own_pids = lambda: [PID]
+    governor._prime()
+    return governor
+
+def test_readers(host):
+    host.advance(1500, own_wait_us=700)
+    assert read_pressure_total(str(host.psi)) == 1500
+    assert read_run_delay([PID], str(host.proc)) == 700
+    assert read_run_delay([PID + 1], str(host.proc)) == 0
+
+def test_missing_source_is_dropped(host, tmp_path):
+    governor = PressureGovernor(sources={'system': str(host.psi), 'cgroup': str(tmp_path / 'none')})
+    assert list(governor.sources) == ['system']
+
+def test_co_tenant_pressure_scales_down_then_ramps_up(host, governor):
+    # 50% of each 0.1s interval stalled by someone else
+    for _ in range(3):
+        host.advance(50000)
+        governor._sample(0.1)
+    assert governor.pressure == pytest.approx(0.5)
+    assert governor.scale == pytest.approx(0.125)
+    assert governor.throttle_events == 1
+    assert governor.throttled_time == pytest.approx(0.2)
+
+    for _ in range(5):
+        host.advance(0)
+        governor._sample(0.1)
+    assert governor.scale == pytest.approx(0.125 + 5 * PressureGovernor.RAMP_STEP)
+    assert governor.throttled_time == pytest.approx(0.7)
+
+    for _ in range(100):
+        governor._sample(0.1)
+    assert governor.scale == 1.0
+    assert governor.get_stats()['throttle_events'] == 1
+
+def test_scale_floor(host, governor):
+    for _ in range(20):
+        host.advance(100000)
+        governor._sample(0.1)
+    assert governor.scale == PressureGovernor.MIN_SCALE
+
+def test_miners_own_wait_is_not_pressure(host, governor):
+    # Workers queueing behind each other stall the system as much as a co-tenant would
+    for _ in range(10):
+        host.advance(50000, own_wait_us=60000)
+        governor._sample(0.1)
+    assert governor.pressure == 0.0
+    assert governor.scale == 1.0
+    assert governor.throttled_time == 0.0
+
+def test_only_stall_beyond_own_wait_counts(host, governor):
+    host.advance(50000, own_wait_us=30000)
+    governor._sample(0.1)
+    assert governor.pressure == pytest.approx(0.2)
+    assert governor.scale == 0.5
@@ -0,0 +1,80 @@
+"""Tests for supervising RandomX worker processes from the parent"""
+
+import threading
+from types import SimpleNamespace
+
+from mining_engine import RandomXConfig, RandomXMiner, RandomXMinerProcess, WorkerCounters
+
+class FakeProcess:
+    """Stands in for multiprocessing.Process without starting anything"""
+
+    started = 0
+
+    def __init__(self, target=None, args=(), name=None, daemon=None):
+        self.pid = None
+        self.exitcode = None
+
+    def start(self):
+        FakeProcess.started += 1
+        self.pid = 1000 + FakeProcess.started
+
+    def is_alive(self):
+        return self.exitcode is None
+
+    def crash(self, exitcode=1):
+        self.exitcode = exitcode
+
+class FakeContext:
+    Process = FakeProcess
+    Event = threading.Event
+
+    @staticmethod
+    def Value(typecode, value, lock=False):
+        return SimpleNamespace(value=value)
+
+def _miner(workers=2):
+    config = RandomXConfig(pool_url='stratum+tcp://127.0.0.1:1', wallet_address='wallet',
+                           threads=workers, worker_mode='process')
+    miner = RandomXMiner(config)
+    for i in range(workers):
+        worker = RandomXMinerProcess(i, config, FakeContext(), 'broadcast', None)
+        worker.start()
+        miner.threads.append(worker)
+    return miner
+
+def test_dead_worker_is_restarted():
+    miner = _miner()
+    crashed = miner.threads[0].process
+    crashed.crash()
+
+    miner._check_worker_processes()
+
+    worker = miner.threads[0]
+    assert worker.process is not crashed
+    assert worker.is_alive() and worker.is_running
+    assert worker.restarts == 1
+    assert miner.threads[1].restarts == 0
+
+def test_worker_given_up_after_max_restarts():
+    miner = _miner(1)
+    miner.counters = WorkerCounters(1)
+    miner.counters.set_status(0, True)  # Left set by the worker that was killed
+    worker = miner.threads[0]
+    for _ in range(RandomXMinerProcess.MAX_RESTARTS + 1):
+        worker.process.crash()
+        miner._check_worker_processes()
+
+    assert worker.restarts == RandomXMinerProcess.MAX_RESTARTS
+    assert not worker.is_running
+    assert miner.get_stats()['workers_running'] == 0
+    miner.counters.close()
+
+def test_stopping_worker_is_not_restarted():
+    miner = _miner(1)
+    worker = miner.threads[0]
+    worker.request_stop()
+    worker.process.crash(0)
+
+    miner._check_worker_processes()
+
+    assert worker.restarts == 0
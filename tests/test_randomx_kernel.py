@@ -0,0 +1,59 @@
+"""Tests pinning the RandomX-style kernel to the original allocation-heavy implementation"""
+
+import hashlib
+
+import pytest
+
+from mining_engine import PreparedJob, randomx_hash_batch, randomx_intensive_hash
+
+BLOB = bytes.fromhex(
+    '0707f7a4f0d605b303260816ba3f10902e1a145ac5fad3aa3af6ea44c11869dc4f853f00'
+    '2b2eea0000000077b206a02ca5b1d4ce6bbfdf0acac38bded34d2dcdeef95cd20cefc12f61d56109'
+)
+
+# (input hex, output hex) from RandomXMinerThread._calculate_intensive_hash in the
+# baseline tree; a 76-byte blob at nonces 0, 1, 0x12345678 and 0xFFFFFFFF, then
+# inputs shorter than, equal to and longer than the 32-byte state
+BASELINE_VECTORS = [
+    ('0707f7a4f0d605b303260816ba3f10902e1a145ac5fad3aa3af6ea44c11869dc4f853f002b2eea0000000077b206a02ca5b1d4ce6bbfdf0acac38bded34d2dcdeef95cd20cefc12f61d56109',
+     '72d293b5ce6040774bf4aa1279dab3d9ac1b404ab2f888a369ee2798ed796a65'),
+    ('0707f7a4f0d605b303260816ba3f10902e1a145ac5fad3aa3af6ea44c11869dc4f853f002b2eea0100000077b206a02ca5b1d4ce6bbfdf0acac38bded34d2dcdeef95cd20cefc12f61d56109',
+     '9a4af3c08d74a86956a8f99953e60bfcf0629dda05c00104b8bfacc27a6010ad'),
+    ('0707f7a4f0d605b303260816ba3f10902e1a145ac5fad3aa3af6ea44c11869dc4f853f002b2eea7856341277b206a02ca5b1d4ce6bbfdf0acac38bded34d2dcdeef95cd20cefc12f61d56109',
+     '4f69857565ee076ce85c130058f694a1eb14a668e7a5f08fc05e50e992961d6f'),
+    ('0707f7a4f0d605b303260816ba3f10902e1a145ac5fad3aa3af6ea44c11869dc4f853f002b2eeaffffffff77b206a02ca5b1d4ce6bbfdf0acac38bded34d2dcdeef95cd20cefc12f61d56109',
+     'f6108595fb670ed51cf01ca5eef9dfbeb4a1ae155cc662fd786e116cfbd84adb'),
+    ('',
+     '17956bc4e3a8cc0ef5f5e5556d63a001e284e2540a78d731a4cd0819a945917a'),
+    ('01',
+     'a8535a564182710fe3fa749f53d6bce712ba87de474a5344256bb28ac90771b4'),
+    ('000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f',
+     '9d56922b8b11bcdab2f257a1ce0005631adb12165bac88c7dc1d42fa82d2d495'),
+    ('fffefdfcfbfaf9f8f7f6f5f4f3f2f1f0efeeedecebeae9e8e7e6e5e4e3e2e1e0dfdedddcdbdad9d8d7d6d5d4d3d2d1d0cfcecdcccbcac9c8c7c6c5c4c3c2c1c0bfbebdbcbbbab9b8b7b6b5b4b3b2b1b0afaeadacabaaa9a8a7a6a5a4a3a2a1a09f9e9d9c',
+     'ae5da8b2c2461a5995a3af88bba0ace88e1cc2c4d2c5584e20c2a98b8ffcccfe'),
+]
+
+DATASET = memoryview(hashlib.shake_256(b'randomx-test-dataset').digest(64 * 64))
+
+@pytest.mark.parametrize('data, expected', BASELINE_VECTORS)
+def test_matches_baseline(data, expected):
+    assert randomx_intensive_hash(bytes.fromhex(data)).hex() == expected
+
+@pytest.mark.parametrize('dataset', [None, DATASET], ids=['uncached', 'dataset'])
+@pytest.mark.parametrize('nonce_start', [0, 0xFFFFFFFE])
+def test_batch_matches_single_hashes(dataset, nonce_start):
+    job = PreparedJob({'blob': BLOB.hex()})
+    count = 4
+    batch = randomx_hash_batch(job, nonce_start, count, dataset)
+    assert len(batch) == 32 * count
+    for i in range(count):
+        data = bytes(job.patch_nonce(nonce_start + i))
+        assert batch[i * 32:(i + 1) * 32] == randomx_intensive_hash(data, dataset)
+
+def test_batch_patches_nonce_at_blob_offset():
+    job = PreparedJob({'blob': BLOB.hex()})
+    batch = randomx_hash_batch(job, 0x12345678, 1)
+    assert batch.hex() == BASELINE_VECTORS[2][1]
+
+def test_dataset_changes_the_hash():
+    assert randomx_intensive_hash(BLOB, DATASET) != randomx_intensive_hash(BLOB)
@@ -0,0 +1,48 @@
+"""Tests for cgroup v2 aware CPU and memory detection"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import mining_engine
+from mining_engine import ResourceLimits, detect_resource_limits
+
+GB = 1024 ** 3
+
+@pytest.fixture(autouse=True)
+def host(monkeypatch):
+    """A 16-CPU, 64 GB host"""
+    monkeypatch.setattr(mining_engine.os, 'sched_getaffinity', lambda pid: set(range(16)), raising=False)
+    monkeypatch.setattr(mining_engine.psutil, 'virtual_memory', lambda: SimpleNamespace(total=64 * GB))
+
+def _cgroup(path, files=None):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / 'cgroup.controllers').write_text('cpuset cpu memory\n')
+    for name, text in (files or {}).items():
+        (path / name).write_text(text + '\n')
+    return path
+
+def test_without_cgroup_uses_affinity_and_host_memory(tmp_path):
+    limits = detect_resource_limits(str(tmp_path / 'missing'))
+    assert limits == ResourceLimits(16.0, 'affinity', 64 * GB, 'host')
+
+def test_tightest_limit_along_the_path_wins(tmp_path):
+    root = _cgroup(tmp_path / 'root')
+    parent = _cgroup(root / 'kubepods', {'cpu.max': 'max 100000', 'memory.max': str(2 * GB)})
+    pod = _cgroup(parent / 'pod', {'cpu.max': '150000 100000', 'memory.max': 'max'})
+    limits = detect_resource_limits(str(pod))
+    assert (limits.cpu_count, limits.cpu_source) == (1.5, 'cgroup cpu.max')
+    assert (limits.memory_bytes, limits.memory_source) == (2 * GB, 'cgroup memory.max')
+    assert limits.worker_cpus == 1
+
+def test_cpuset_narrows_cpus(tmp_path):
+    pod = _cgroup(tmp_path / 'pod', {'cpuset.cpus.effective': '0-3,8'})
+    limits = detect_resource_limits(str(pod))
+    assert (limits.cpu_count, limits.cpu_source) == (5.0, 'cgroup cpuset.cpus.effective')
+
+def test_quota_above_cpuset_is_ignored(tmp_path):
+    pod = _cgroup(tmp_path / 'pod', {'cpuset.cpus.effective': '0-3', 'cpu.max': '800000 100000'})
+    assert detect_resource_limits(str(pod)).cpu_count == 4.0
+
+def test_fractional_quota_keeps_one_worker():
+    assert ResourceLimits(0.5, 'cgroup cpu.max', GB, 'host').worker_cpus == 1
@@ -0,0 +1,52 @@
+"""Tests for midstate-cached Scrypt header hashing"""
+
+import hashlib
+import struct
+
+import pytest
+
+from mining_engine import SCRYPT_GOLDEN_VECTORS, ScryptHeaderTemplate, scrypt_hash_batch
+
+# Litecoin-style header fields: version, prevhash, merkle root, ntime, nbits
+JOB = {
+    'version': '20000000',
+    'prevhash': 'a1' * 32,
+    'merkle_root': '5c' * 32,
+    'ntime': '6523ef80',
+    'nbits': '1a0fffff',
+}
+
+def _scrypt(header: bytes) -> bytes:
+    return hashlib.scrypt(header, salt=header, n=1024, r=1, p=1, dklen=32)
+
+def test_header_layout():
+    header = bytes(ScryptHeaderTemplate(JOB).patch_nonce(0x01020304))
+    assert len(header) == ScryptHeaderTemplate.HEADER_SIZE
+    assert header[:4] == struct.pack('<I', 0x20000000)
+    assert header[4:36] == bytes.fromhex(JOB['prevhash'])
+    assert header[36:68] == bytes.fromhex(JOB['merkle_root'])
+    assert header[68:76] == struct.pack('<II', 0x6523ef80, 0x1a0fffff)
+    assert header[76:] == bytes([4, 3, 2, 1])
+
+@pytest.mark.parametrize('nonce_start', [0, 0x7FFFFFFF, 0xFFFFFFFE])
+def test_batch_matches_direct_scrypt(nonce_start):
+    template = ScryptHeaderTemplate(JOB)
+    count = 3
+    batch = scrypt_hash_batch(template, nonce_start, count)
+    header = bytearray(ScryptHeaderTemplate._build_header(JOB))
+    for i in range(count):
+        nonce = (nonce_start + i) & 0xFFFFFFFF
+        struct.pack_into('<I', header, 76, nonce)
+        assert batch[i * 32:(i + 1) * 32] == _scrypt(bytes(header)), f"nonce {nonce:#x}"
+
+def test_raw_header_nonce_is_replaced():
+    raw = bytes(range(80))
+    template = ScryptHeaderTemplate({'header': raw.hex()})
+    assert scrypt_hash_batch(template, 0xFFFFFFFF, 1) == _scrypt(raw[:76] + b'\xff' * 4)
+
+@pytest.mark.parametrize('header, expected', SCRYPT_GOLDEN_VECTORS)
+def test_golden_vectors_are_plain_scrypt(header, expected):
+    assert _scrypt(bytes.fromhex(header)).hex() == expected
+    template = ScryptHeaderTemplate.from_input(bytes.fromhex(header))
+    nonce = struct.unpack_from('<I', bytes.fromhex(header), 76)[0]
+    assert scrypt_hash_batch(template, nonce, 1).hex() == expected
@@ -0,0 +1,96 @@
+"""Tests for SeedCache and SeedCacheManager"""
+
+import hashlib
+import os
+import threading
+
+import pytest
+
+import mining_engine
+from mining_engine import SeedCache, SeedCacheManager
+
+SIZE = 4096
+SEED_A = 'aa' * 32
+SEED_B = 'bb' * 32
+
+@pytest.fixture
+def shm_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(mining_engine, 'SHM_DIR', str(tmp_path))
+    return tmp_path
+
+def _wait_for_build(manager, seed_hash, timeout=5.0):
+    builder = manager.builder
+    if builder:
+        builder.join(timeout)
+    return manager.ready(seed_hash)
+
+def test_first_cache_builds_inline(shm_dir):
+    manager = SeedCacheManager(SIZE)
+    cache = manager.get(SEED_A)
+    assert cache.seed_hash == SEED_A
+    assert bytes(cache.view[:16]) == hashlib.shake_256(b'randomx-cache' + SEED_A.encode()).digest(16)
+    manager.close()
+    assert os.listdir(shm_dir) == []
+
+def test_seed_change_builds_in_background(shm_dir):
+    manager = SeedCacheManager(SIZE)
+    manager.get(SEED_A)
+    manager.get(SEED_B)
+    cache = _wait_for_build(manager, SEED_B)
+    assert cache is manager.active
+    assert manager.previous.seed_hash == SEED_A
+    assert manager.builds == 2
+    manager.close()
+    assert os.listdir(shm_dir) == []
+
+def test_close_during_background_build_discards_cache(shm_dir, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_cache(*args, **kwargs):
+        started.set()
+        release.wait(5.0)
+        return SeedCache(*args, **kwargs)
+
+    manager = SeedCacheManager(SIZE)
+    manager.get(SEED_A)
+    monkeypatch.setattr(mining_engine, 'SeedCache', slow_cache)
+    manager.get(SEED_B)
+    builder = manager.builder
+    assert started.wait(5.0)
+
+    manager.close()
+    release.set()
+    builder.join(5.0)
+
+    assert not builder.is_alive()
+    assert manager.active is None and manager.previous is None
+    assert manager.get(SEED_B) is None
+    assert os.listdir(shm_dir) == []
+
+def test_failed_fill_removes_region(shm_dir, monkeypatch):
+    def failing_shake(data):
+        raise MemoryError('no room for the cache')
+
+    monkeypatch.setattr(mining_engine.hashlib, 'shake_256', failing_shake)
+    with pytest.raises(MemoryError):
+        SeedCache(SEED_A, SIZE, create=True)
+    assert os.listdir(shm_dir) == []
+
+def test_failed_build_is_not_retried(shm_dir):
+    manager = SeedCacheManager(SIZE)
+    manager._record_failure(SEED_A, OSError('no space'))
+    assert manager.get(SEED_A) is None
+    assert manager.unavailable(SEED_A)
+    assert manager.builds == 0
+
+def test_worker_attaches_read_only(shm_dir):
+    owner = SeedCacheManager(SIZE)
+    built = owner.get(SEED_A)
+    worker = SeedCacheManager(SIZE, owner=False)
+    attached = worker.get(SEED_A, built.name)
+    assert bytes(attached.view) == bytes(built.view)
+    with pytest.raises(TypeError):
+        attached.shm.buf[0] = 0  # The mapping itself is read-only, not just the view
+    worker.close()
+    owner.close()
+    assert os.listdir(shm_dir) == []
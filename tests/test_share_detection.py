@@ -0,0 +1,31 @@
+"""Tests for batch share detection against a job's share threshold"""
+
+import hashlib
+
+import pytest
+
+import mining_engine
+from mining_engine import HASH_SIZE, MAX_TARGET64, PreparedJob, find_shares
+
+def _hash_batch(count: int) -> bytearray:
+    return bytearray(b''.join(hashlib.sha256(i.to_bytes(4, 'little')).digest() for i in range(count)))
+
+def _meeting_target(hashes: bytearray, threshold: int):
+    job = PreparedJob({'target': threshold.to_bytes(8, 'little').hex()})
+    assert job.threshold == threshold
+    return [i for i in range(len(hashes) // HASH_SIZE)
+            if job.meets_target(hashes[i * HASH_SIZE:(i + 1) * HASH_SIZE])]
+
+@pytest.mark.parametrize('threshold', [0, 1, MAX_TARGET64 // 1000, MAX_TARGET64 // 3, 1 << 63, MAX_TARGET64])
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_find_shares_agrees_with_meets_target(monkeypatch, threshold, use_numpy):
+    if use_numpy and mining_engine.np is None:
+        pytest.skip("numpy not installed")
+    if not use_numpy:
+        monkeypatch.setattr(mining_engine, 'np', None)
+    hashes = _hash_batch(2000)
+    assert find_shares(hashes, threshold) == _meeting_target(hashes, threshold)
+
+def test_find_shares_below_difficulty_one_accepts_every_hash():
+    hashes = _hash_batch(10)
+    assert find_shares(hashes, int(MAX_TARGET64 / 0.5)) == list(range(10))
@@ -0,0 +1,34 @@
+"""Tests for turning pool targets and difficulties into share thresholds"""
+
+import pytest
+
+from mining_engine import DEFAULT_SHARE_DIFFICULTY, MAX_TARGET64, target_to_threshold
+
+@pytest.mark.parametrize('target, expected', [
+    # 4-byte compact targets (little-endian), scaled up to 64 bits
+    ('ffffffff', MAX_TARGET64),
+    ('b88d0600', MAX_TARGET64 // (0xFFFFFFFF // 0x00068db8)),
+    # 8-byte targets are the 64-bit threshold itself (little-endian)
+    ('0000000000001000', 0x0010000000000000),
+    ('ffffffffffffffff', MAX_TARGET64),
+    # 32-byte targets are big-endian; only the high-order 8 bytes matter
+    ('0010000000000000' + 'ff' * 24, 0x0010000000000000),
+    ('00000000ffff0000' + '00' * 24, 0x00000000ffff0000),
+])
+def test_target_to_threshold(target, expected):
+    assert target_to_threshold(target) == expected
+
+def test_compact_target_matches_its_difficulty():
+    # 'b88d0600' is the XMR target for difficulty 10000
+    difficulty = 0xFFFFFFFF // 0x00068db8
+    assert target_to_threshold('b88d0600') == target_to_threshold(difficulty=difficulty)
+
+def test_target_lengths_agree():
+    threshold = 0x0000123456789abc
+    assert target_to_threshold(threshold.to_bytes(8, 'little').hex()) == threshold
+    assert target_to_threshold(threshold.to_bytes(8, 'big').hex() + '00' * 24) == threshold
+
+@pytest.mark.parametrize('target', [None, '', 'not-hex', '00000000', 'abcdef'])
+def test_unusable_target_falls_back_to_difficulty(target):
+    assert target_to_threshold(target, 1000) == pytest.approx(MAX_TARGET64 / 1000)
+    assert target_to_threshold(target) == pytest.approx(MAX_TARGET64 / DEFAULT_SHARE_DIFFICULTY)
@@ -0,0 +1,36 @@
+"""Tests for SharedRegion naming and removal of regions left by exited processes"""
+
+import os
+import subprocess
+import sys
+
+import mining_engine
+from mining_engine import SharedRegion
+
+def _exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def test_region_name_records_creator_pid(tmp_path, monkeypatch):
+    monkeypatch.setattr(mining_engine, 'SHM_DIR', str(tmp_path))
+    region = SharedRegion(size=64, create=True)
+    try:
+        assert os.path.dirname(region.name) == str(tmp_path)
+        assert os.path.basename(region.name).startswith(f"cryptominer-{os.getpid()}-")
+        assert SharedRegion.remove_stale([str(tmp_path)]) == []
+        assert os.path.exists(region.name)
+    finally:
+        region.unlink()
+        region.close()
+
+def test_remove_stale_only_removes_dead_creators(tmp_path):
+    dead = tmp_path / f"cryptominer-{_exited_pid()}-{'a' * 32}"
+    live = tmp_path / f"cryptominer-{os.getpid()}-{'b' * 32}"
+    others = [tmp_path / 'cryptominer-stats', tmp_path / 'cryptominer-1-short', tmp_path / 'unrelated']
+    for path in [dead, live] + others:
+        path.write_bytes(b'x')
+
+    assert SharedRegion.remove_stale([str(tmp_path), str(tmp_path / 'missing')]) == [str(dead)]
+    assert not dead.exists()
+    assert live.exists() and all(path.exists() for path in others)
@@ -0,0 +1,56 @@
+"""Tests for StatsPublisher snapshots and how UnifiedMiningEngine hands them out"""
+
+import json
+
+import pytest
+
+from mining_engine import StatsPublisher, UnifiedMiningEngine
+
+def _source():
+    calls = []
+
+    def source():
+        calls.append(None)
+        return {'hashrate': 100.0 * len(calls), 'pressure_governor': {'enabled': False}}
+    return source
+
+def test_each_publish_is_a_new_sequence():
+    publisher = StatsPublisher(_source())
+    assert publisher.get() == {}
+    publisher.publish()
+    first = publisher.get()
+    publisher.publish()
+    second = publisher.get()
+    assert (first['sequence'], second['sequence']) == (1, 2)
+    assert (first['hashrate'], second['hashrate']) == (100.0, 200.0)
+    assert second['published_at'] >= first['published_at']
+    with pytest.raises(TypeError):
+        second['hashrate'] = 0.0
+
+def test_since_skips_an_unchanged_snapshot():
+    publisher = StatsPublisher(_source())
+    publisher.publish()
+    assert publisher.get(since=1) is None
+    assert publisher.get(since=0)['sequence'] == 1
+    publisher.publish()
+    assert publisher.get(since=1)['sequence'] == 2
+
+def test_engine_returns_a_serializable_copy():
+    engine = UnifiedMiningEngine(stats_segment=None)
+    engine.stats_publisher = StatsPublisher(_source())
+    engine.stats_publisher.publish()
+
+    stats = engine.get_stats()
+    assert type(stats) is dict
+    assert json.loads(json.dumps(stats))['sequence'] == 1
+    stats['hashrate'] = 0.0
+    assert engine.get_stats()['hashrate'] == 100.0
+
+    assert engine.get_stats_if_changed(1) is None
+    engine.stats_publisher.publish()
+    assert engine.get_stats_if_changed(1)['sequence'] == 2
+
+def test_engine_without_publisher():
+    engine = UnifiedMiningEngine(stats_segment=None)
+    assert engine.get_stats()['is_running'] is False
+    assert engine.get_stats_if_changed(0) == engine.get_stats()
@@ -0,0 +1,102 @@
+"""Tests for the shared-memory StatsSegment and its use by UnifiedMiningEngine"""
+
+import os
+import stat
+import struct
+import subprocess
+import sys
+
+import pytest
+
+from mining_engine import StatsSegment, UnifiedMiningEngine
+
+def test_stats_segment_round_trip(tmp_path):
+    path = str(tmp_path / 'stats')
+    writer = StatsSegment(path, create=True)
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == StatsSegment.MODE
+        stats = {
+            'sequence': 7, 'published_at': 1234.5, 'hashrate': 812.25, 'hashes_total': 1 << 40,
+            'shares_good': 3, 'shares_rejected': 1, 'threads': 4, 'intensity': 80,
+            'is_running': True, 'pool_connected': False, 'algorithm': 'RandomX', 'coin': 'XMR'
+        }
+        writer.publish(stats)
+
+        reader = StatsSegment(path)
+        try:
+            assert reader.shm.buf.readonly
+            assert reader.write_count() == 2
+            snapshot = reader.read()
+            for name, value in stats.items():
+                assert snapshot[name] == value
+            assert snapshot['temperature'] == 0.0
+            assert set(snapshot) == {'published_at'} | {name for name, _ in StatsSegment.FIELDS}
+
+            writer.publish({**stats, 'sequence': 8, 'hashrate': 900.0})
+            assert reader.write_count() == 4
+            assert (reader.read()['sequence'], reader.read()['hashrate']) == (8, 900.0)
+        finally:
+            reader.close()
+    finally:
+        writer.close()
+    assert not os.path.exists(path)
+
+def test_stats_segment_does_not_replace_existing(tmp_path):
+    path = str(tmp_path / 'stats')
+    writer = StatsSegment(path, create=True)
+    try:
+        with pytest.raises(FileExistsError):
+            StatsSegment(path, create=True)
+    finally:
+        writer.close()
+
+def test_stats_segment_rejects_other_files(tmp_path):
+    path = tmp_path / 'other'
+    path.write_bytes(b'x' * 256)
+    with pytest.raises(ValueError):
+        StatsSegment(str(path))
+
+def _exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def _abandon(path: str) -> StatsSegment:
+    """A segment whose publisher has exited without closing it"""
+    writer = StatsSegment(path, create=True)
+    struct.pack_into('<I', writer.shm.buf, 24, _exited_pid())
+    return writer
+
+def test_stats_segment_records_publisher_pid(tmp_path):
+    writer = StatsSegment(str(tmp_path / 'stats'), create=True)
+    try:
+        assert writer.publisher_pid() == os.getpid()
+        assert StatsSegment.remove_stale(writer.name) is None
+        assert os.path.exists(writer.name)
+    finally:
+        writer.close()
+
+def test_stale_stats_segment_is_removed(tmp_path):
+    path = str(tmp_path / 'stats')
+    stale = _abandon(path)
+    pid = stale.publisher_pid()
+    assert StatsSegment.remove_stale(path) == pid
+    assert not os.path.exists(path)
+    stale.close()
+
+def test_engine_replaces_stale_stats_segment(tmp_path):
+    path = str(tmp_path / 'stats')
+    stale = _abandon(path)
+    segment = UnifiedMiningEngine(stats_segment=path)._open_stats_segment()
+    try:
+        assert segment is not None
+        assert segment.publisher_pid() == os.getpid()
+    finally:
+        segment.close()
+        stale.close()
+
+def test_stats_segment_remove_stale_ignores_other_files(tmp_path):
+    path = tmp_path / 'other'
+    path.write_bytes(b'x' * 256)
+    assert StatsSegment.remove_stale(str(path)) is None
+    assert path.exists()
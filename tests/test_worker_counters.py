@@ -0,0 +1,75 @@
+"""Tests for WorkerCounters totals and the summarized per-worker statistics"""
+
+import pytest
+
+import mining_engine
+from mining_engine import WorkerCounters
+
+RATES = [120.0, 80.0, 100.0, 0.0, 95.0, 110.0, 105.0, 90.0]
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'pure-python'])
+def counters(request, monkeypatch):
+    if request.param and mining_engine.np is None:
+        pytest.skip("numpy not installed")
+    if not request.param:
+        monkeypatch.setattr(mining_engine, 'np', None)
+    counters = WorkerCounters(len(RATES))
+    for worker, rate in enumerate(RATES):
+        counters.add(worker, 1000 * (worker + 1), shares_good=worker % 2, shares_rejected=worker // 4)
+        counters.set_hashrate(worker, rate, rate / 2, rate / 4)
+        counters.set_status(worker, running=rate > 0, job_switch_latency=worker / 100)
+    yield counters
+    counters.close()
+
+def test_totals(counters):
+    totals = counters.totals()
+    assert totals['hashes_total'] == 36000
+    assert (totals['shares_good'], totals['shares_rejected']) == (4, 4)
+    assert totals['hashrate'] == totals['hashrate_10s'] == pytest.approx(sum(RATES))
+    assert totals['hashrate_15m'] == pytest.approx(sum(RATES) / 4)
+    assert counters.row(2)['hashes_total'] == 3000
+
+def test_activity(counters):
+    activity = counters.activity()
+    assert activity['workers_running'] == len(RATES) - 1
+    assert activity['job_switch_latency']['avg'] == pytest.approx(0.035)
+    assert activity['job_switch_latency']['max'] == pytest.approx(0.07)
+    assert counters.status(3) == {'running': False, 'job_switch_latency': pytest.approx(0.03)}
+    counters.set_status(3, True)
+    assert counters.activity()['workers_running'] == len(RATES)
+
+def test_summary(counters):
+    summary = counters.summary(slowest=3, bins=4)
+    assert summary['workers'] == len(RATES)
+    assert (summary['min'], summary['max']) == (0.0, 120.0)
+    assert summary['median'] == pytest.approx(97.5)
+    assert summary['p95'] == pytest.approx(116.5)
+    assert summary['slowest'] == [3, 1, 7]
+    assert summary['histogram']['edges'] == pytest.approx([0.0, 30.0, 60.0, 90.0, 120.0])
+    assert summary['histogram']['counts'] == [1, 0, 1, 6]
+
+def test_summary_with_equal_rates(monkeypatch):
+    monkeypatch.setattr(mining_engine, 'np', None)
+    counters = WorkerCounters(3)
+    summary = counters.summary(slowest=5, bins=2)
+    assert summary['min'] == summary['max'] == summary['median'] == 0.0
+    assert sum(summary['histogram']['counts']) == 3
+    assert summary['slowest'] == [0, 1, 2]
+    counters.close()
+
+def test_summary_matches_between_backends(monkeypatch):
+    if mining_engine.np is None:
+        pytest.skip("numpy not installed")
+    summaries = []
+    for backend in (mining_engine.np, None):
+        monkeypatch.setattr(mining_engine, 'np', backend)
+        counters = WorkerCounters(100)
+        for worker in range(100):
+            counters.set_hashrate(worker, (worker * 37) % 101 + 0.5, 0.0, 0.0)
+        summaries.append(counters.summary())
+        counters.close()
+    with_numpy, without = summaries
+    for key in ('min', 'median', 'p95', 'max'):
+        assert with_numpy[key] == pytest.approx(without[key])
+    assert with_numpy['histogram']['counts'] == without['histogram']['counts']
+    assert with_numpy['slowest'] == without['slowest']